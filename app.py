@@ -4,14 +4,25 @@ import os
 import subprocess
 import sys
 import threading
-from datetime import datetime, timezone
+from datetime import datetime
 
+import requests
 import rumps
 from PyObjCTools.AppHelper import callAfter
 
+from async_engine import EngineThread
+from checker import NEGATIVE_LABELS, RepoChecker, add_error, error_message as describe_error, new_cycle
 from config_loader import load_config, ConfigError
-from github_client import GitHubClient, RateLimitError, GitHubAPIError
+from event_filter import EventFeedFilter
+from events import EventLog, EventServer
+from git_refs import GitRefsClient
+from github_client import GitHubAPIError, GitHubClient
+from history_store import HistoryStore
 from notifier import request_permission, send_notification
+from profiling import CycleProfiler
+from release_details import ReleaseDetailsCache, summarize
+from scheduler import Scheduler
+from sharding import Supervisor
 from state_store import StateStore
 from token_resolver import resolve_token
 
@@ -19,6 +30,7 @@ from token_resolver import resolve_token
 _DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_PATH = os.path.join(_DIR, "config.json")
 STATE_PATH = os.path.join(_DIR, "state.json")
+HISTORY_PATH = os.path.join(_DIR, "history.log")
 ICON_GRAY = os.path.join(_DIR, "icons", "icon-gray.png")
 ICON_HIGHLIGHT = os.path.join(_DIR, "icons", "icon-highlight.png")
 ICON_RED = os.path.join(_DIR, "icons", "icon-red.png")
@@ -38,8 +50,61 @@ class ReleaseWatcherApp(rumps.App):
 
         # State and client
         self.state = StateStore(STATE_PATH)
+        self.history = HistoryStore(HISTORY_PATH)
+        history_cfg = self.config["history"]
+        # A rewrite of a large log must not hold up the menubar
+        threading.Thread(
+            target=self.history.compact_if_needed,
+            args=(history_cfg["retention_days"], history_cfg["rollup_after_days"]),
+            daemon=True,
+        ).start()
         token = resolve_token()
-        self.client = GitHubClient(token=token)
+        self.client = GitHubClient(
+            token=token, base_url=self.config.get("api_base_url"),
+            max_response_bytes=self.config["max_response_bytes"],
+        )
+        self.git_client = GitRefsClient(token=token)
+        self.events = None
+        self._event_server = None
+        events_cfg = self.config.get("events")
+        if events_cfg:
+            self.events = EventLog(os.path.join(_DIR, events_cfg["log"]))
+            if events_cfg["socket"]:
+                self._event_server = EventServer(
+                    self.events, os.path.join(_DIR, events_cfg["socket"]),
+                ).start()
+        prefilter = None
+        if self.config.get("event_prefilter"):
+            prefilter = EventFeedFilter(
+                self.client, self.state, self.config["event_prefilter"]["orgs"],
+                self.config["event_prefilter"]["full_sweep_hours"],
+            )
+        self.checker = RepoChecker(
+            self.client, self.git_client, self.state, self.history, self.events,
+            prefilter=prefilter,
+        )
+        self.profiler = CycleProfiler.from_config(self.config, _DIR)
+        self.release_details = ReleaseDetailsCache(self.client)
+        if self.config.get("sharding"):
+            shard_dir = os.path.join(_DIR, self.config["sharding"]["dir"])
+            self.supervisor = Supervisor(
+                self.config, shard_dir, token=token,
+                base_url=self.config.get("api_base_url"), history=self.history,
+                events=self.events,
+                # A hung shard must not hold the check lock forever
+                timeout=self.config["check_interval_minutes"] * 60,
+            )
+            known_state = self.supervisor.load_state()
+        else:
+            self.supervisor = None
+            known_state = self.state.data
+        self._engine = None
+        if self.supervisor is None and self.config["engine"] == "asyncio":
+            self._engine = EngineThread(
+                self.checker, token=token, base_url=self.config.get("api_base_url"),
+                concurrency=self.config["max_concurrency"],
+                max_response_bytes=self.config["max_response_bytes"],
+            )
         self.has_new = False
         self._error_message = None
         self._check_lock = threading.Lock()
@@ -50,7 +115,7 @@ class ReleaseWatcherApp(rumps.App):
         for repo_cfg in self.config["repos"]:
             key = f"{repo_cfg['owner']}/{repo_cfg['repo']}"
             label = repo_cfg["label"]
-            state = self.state.get(key)
+            state = known_state.get(key)
             version = self._version_display(state, repo_cfg["watch"])
             item = rumps.MenuItem(f"{label}: {version}", callback=self._copy_version)
             self._repo_items[key] = {"item": item, "label": label, "config": repo_cfg}
@@ -64,6 +129,18 @@ class ReleaseWatcherApp(rumps.App):
             self._status_item = rumps.MenuItem("Last check: OK", callback=None)
         self.menu.add(self._status_item)
 
+        self._recent_menu = rumps.MenuItem("Recent Changes (24h)")
+        self._refresh_recent_menu()
+        self.menu.add(self._recent_menu)
+
+        # Details are fetched only when asked for, off the main thread
+        details_menu = rumps.MenuItem("Release Details")
+        for key, info in self._repo_items.items():
+            item = rumps.MenuItem(info["label"], callback=self._show_release_details)
+            item.repo_key = key
+            details_menu.add(item)
+        self.menu.add(details_menu)
+
         self.menu.add(rumps.separator)
         self.menu.add(rumps.MenuItem("Check Now", callback=self._check_now))
         self.menu.add(rumps.MenuItem("Open Config", callback=self._open_config))
@@ -76,25 +153,21 @@ class ReleaseWatcherApp(rumps.App):
         # Initial check in background
         self._run_check_async()
 
-        # Set up periodic check timer using config interval
+        # All timed events (checks, flashes) run on one sleep/wake-aware scheduler
         interval = self.config.get("check_interval_minutes", 60) * 60
         self._interval_seconds = interval
-        self._timer = rumps.Timer(self._hourly_check, interval)
-        self._timer.start()
-
-        # Pre-check flash timer: fires 2 min before each hourly check
-        if interval > 120:
-            self._pre_check_timer = rumps.Timer(self._pre_check_flash, interval)
-            # rumps.Timer doesn't support initial delay, so use threading.Timer
-            # for the offset, then start the recurring rumps.Timer
-            threading.Timer(
-                interval - 120,
-                lambda: callAfter(self._start_pre_check_timer),
-            ).start()
+        self.scheduler = Scheduler()
+        self._check_event = self.scheduler.call_every(
+            interval, self._on_check_due, name="check",
+        )
+        self._schedule_pre_check_flash()
+        self.scheduler.start()
 
     def _version_display(self, state: dict | None, watch_type: str) -> str:
         if state is None:
             return "checking..."
+        if state.get("negative"):
+            return NEGATIVE_LABELS[state["negative"]["kind"]]
         if watch_type == "tags":
             return state.get("last_tag_name", "unknown")
         return state.get("last_tag_name", "unknown")
@@ -102,100 +175,94 @@ class ReleaseWatcherApp(rumps.App):
     def _hourly_check(self, _):
         self._run_check_async()
 
+    def _on_check_due(self):
+        """Scheduler thread: queue the next flash, run the check on the main thread."""
+        self._schedule_pre_check_flash()
+        callAfter(self._hourly_check, None)
+
+    def _schedule_pre_check_flash(self):
+        """Flash 2 min before the next scheduled check. Dropped if missed during sleep."""
+        if self._interval_seconds <= 120:
+            return
+        self.scheduler.call_at(
+            self._check_event.due - 120,
+            lambda: callAfter(self._pre_check_flash, None),
+            name="flash", skip_if_late=True,
+        )
+
     def _run_check_async(self):
         if not self._check_lock.acquire(blocking=False):
             return  # Already checking, skip this cycle
+        if self._engine is not None:
+            repos = [info["config"] for info in self._repo_items.values()]
+            self._engine.submit(repos).add_done_callback(self._engine_cycle_done)
+            return
         thread = threading.Thread(target=self._check_all_worker, daemon=True)
         thread.start()
 
+    def _engine_cycle_done(self, future):
+        """Called on the engine's loop thread when an asyncio cycle finishes."""
+        try:
+            try:
+                cycle = future.result()
+            except Exception as e:
+                # A failed cycle shows as an error, like a failed repo check
+                cycle = new_cycle()
+                add_error(cycle, e)
+            callAfter(
+                self._apply_check_results,
+                cycle["updates"], cycle["notifications"],
+                cycle["any_error"], cycle["error_message"],
+            )
+        finally:
+            self._check_lock.release()
+
     def _check_all_worker(self):
         """Run API checks in background thread, dispatch UI updates to main thread."""
         try:
-            ui_updates = []
-            notifications = []
-            any_error = False
-            error_message = None
-
-            for key, info in self._repo_items.items():
-                cfg = info["config"]
-                try:
-                    result = self._check_repo(key, cfg)
-                    ui_updates.append(result)
-                    if result["status"] == "new":
-                        notifications.append(result)
-                except RateLimitError as e:
-                    any_error = True
-                    reset_time = ""
-                    if e.reset_timestamp:
-                        dt = datetime.fromtimestamp(e.reset_timestamp, tz=timezone.utc)
-                        reset_time = f" — next check at {dt.strftime('%H:%M UTC')}"
-                    error_message = f"Rate limited{reset_time}"
-                except (GitHubAPIError, Exception) as e:
-                    any_error = True
-                    error_message = str(e)
+            try:
+                if self.profiler is not None:
+                    with self.profiler.cycle():
+                        cycle = self._run_cycle()
+                else:
+                    cycle = self._run_cycle()
+            except Exception as e:
+                cycle = new_cycle()
+                add_error(cycle, e)
 
             # Dispatch all UI mutations to the main Cocoa thread
             callAfter(
                 self._apply_check_results,
-                ui_updates, notifications, any_error, error_message,
+                cycle["updates"], cycle["notifications"],
+                cycle["any_error"], cycle["error_message"],
             )
         finally:
             self._check_lock.release()
 
-    def _check_repo(self, key: str, cfg: dict) -> dict:
-        """Check a single repo. Returns a dict of results for UI update."""
-        etag = self.state.get_etag(key)
-        is_first = self.state.is_first_run(key)
-
-        if cfg["watch"] == "tags":
-            result = self.client.fetch_latest_tag(cfg["owner"], cfg["repo"], etag=etag)
-        else:
-            result = self.client.fetch_latest_release(cfg["owner"], cfg["repo"], etag=etag)
-
-        if result is None:
-            return {"key": key, "status": "unchanged"}
-
-        # Build state update
-        if cfg["watch"] == "tags":
-            new_state = {
-                "last_tag_name": result["tag_name"],
-                "last_commit_sha": result["commit_sha"],
-                "etag": result["etag"],
-            }
-            changed = self._tag_changed(key, result)
-        else:
-            new_state = {
-                "last_release_id": result["release_id"],
-                "last_tag_name": result["tag_name"],
-                "etag": result["etag"],
-            }
-            changed = self._release_changed(key, result)
-
-        self.state.update(key, new_state)
-
-        version = result["tag_name"]
-        if changed and not is_first:
-            return {
-                "key": key,
-                "status": "new",
-                "version": version,
-                "watch": cfg["watch"],
-            }
-        else:
-            return {
-                "key": key,
-                "status": "baseline" if is_first else "unchanged",
-                "version": version,
-            }
+    def _run_cycle(self) -> dict:
+        if self.supervisor is not None:
+            return self.supervisor.run_cycle()
+        repos = [info["config"] for info in self._repo_items.values()]
+        return self.checker.check_all(repos)
 
     def _apply_check_results(self, ui_updates, notifications, any_error, error_message):
         """Apply check results to UI. MUST run on the main thread."""
+        if self.profiler is not None:
+            with self.profiler.late_span("ui_update"):
+                self._update_ui(ui_updates, notifications, any_error, error_message)
+        else:
+            self._update_ui(ui_updates, notifications, any_error, error_message)
+
+    def _update_ui(self, ui_updates, notifications, any_error, error_message):
         # Update menu item titles
         for update in ui_updates:
             key = update["key"]
             if key not in self._repo_items:
                 continue
             info = self._repo_items[key]
+            if update["status"] == "negative":
+                info["item"].title = f"{info['label']}: {NEGATIVE_LABELS[update['negative']]}"
+                continue
             if "version" not in update:
                 continue
             if update["status"] == "new":
@@ -224,21 +291,23 @@ class ReleaseWatcherApp(rumps.App):
             self._error_message = None
             self._status_item.title = "Last check: OK"
         self.icon = self._current_state_icon()
-
-    def _tag_changed(self, key: str, result: dict) -> bool:
-        prev = self.state.get(key)
-        if prev is None:
-            return True
-        return (
-            prev.get("last_tag_name") != result["tag_name"]
-            or prev.get("last_commit_sha") != result["commit_sha"]
-        )
-
-    def _release_changed(self, key: str, result: dict) -> bool:
-        prev = self.state.get(key)
-        if prev is None:
-            return True
-        return prev.get("last_release_id") != result["release_id"]
+        self._refresh_recent_menu()
+
+    def _refresh_recent_menu(self):
+        """Rebuild the "Recent Changes" submenu from the history log."""
+        labels = {key: info["label"] for key, info in self._repo_items.items()}
+        entries = self.history.recent(hours=24)
+        if len(self._recent_menu):
+            self._recent_menu.clear()
+        if not entries:
+            self._recent_menu.add(rumps.MenuItem("No changes", callback=None))
+            return
+        for entry in entries[:20]:
+            when = datetime.fromtimestamp(entry["detected_at"]).strftime("%H:%M")
+            label = labels.get(entry["repo"], entry["repo"])
+            self._recent_menu.add(
+                rumps.MenuItem(f"{when}  {label}: {entry['version']}", callback=None)
+            )
 
     def _current_state_icon(self):
         """Return the correct icon path for the current app state."""
@@ -261,23 +330,54 @@ class ReleaseWatcherApp(rumps.App):
         self._flash_generation += 1
         gen = self._flash_generation
         self.icon = ICON_GREEN
-        # 10-second revert via threading.Timer + callAfter for main thread
-        threading.Timer(10, lambda: callAfter(self._end_flash, gen)).start()
+        # 10-second revert via the scheduler + callAfter for main thread
+        self.scheduler.call_later(10, lambda: callAfter(self._end_flash, gen), name="flash-end")
+
+    @staticmethod
+    def _title_version(title: str) -> str:
+        # Extract version from menu title (e.g., "Vinext: v2.3.1 (NEW)" -> "v2.3.1")
+        return title.split(": ", 1)[-1].replace(" (NEW)", "").strip()
+
+    @staticmethod
+    def _has_version(shown: str) -> bool:
+        # False for the placeholders shown before any version is known
+        return shown not in ("checking...", "unknown", *NEGATIVE_LABELS.values())
+
+    def _show_release_details(self, sender):
+        info = self._repo_items[sender.repo_key]
+        tag = self._title_version(info["item"].title)
+        if not self._has_version(tag):
+            rumps.alert(title=info["label"], message="No version seen yet.")
+            return
+        threading.Thread(
+            target=self._release_details_worker, args=(info, tag), daemon=True,
+        ).start()
 
-    def _start_pre_check_timer(self):
-        """Start the recurring pre-check flash timer (called after initial offset)."""
-        self._pre_check_flash(None)  # Fire the first flash immediately
-        self._pre_check_timer.start()
+    def _release_details_worker(self, info, tag):
+        cfg = info["config"]
+        try:
+            details = self.release_details.get(cfg["owner"], cfg["repo"], tag)
+            title = f"{info['label']} {details['name']}"
+            message = summarize(details)
+        except GitHubAPIError as e:
+            title = f"{info['label']} {tag}"
+            if e.status_code == 404:
+                message = "No release published for this tag."
+            else:
+                message = describe_error(e)
+        except requests.RequestException as e:
+            title, message = f"{info['label']} {tag}", f"Network error: {e.__class__.__name__}"
+        callAfter(rumps.alert, title=title, message=message)
 
     def _copy_version(self, sender):
         """Copy version string to clipboard when a repo menu item is clicked."""
-        # Extract version from menu title (e.g., "Vinext: v2.3.1 (NEW)" -> "v2.3.1")
         title = sender.title
-        version = title.split(": ", 1)[-1].replace(" (NEW)", "").strip()
-        try:
-            subprocess.run(["pbcopy"], input=version.encode(), check=True)
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            pass
+        version = self._title_version(title)
+        if self._has_version(version):
+            try:
+                subprocess.run(["pbcopy"], input=version.encode(), check=True)
+            except (subprocess.CalledProcessError, FileNotFoundError):
+                pass
 
         # Clear NEW marker
         if "(NEW)" in title:
@@ -295,6 +395,13 @@ class ReleaseWatcherApp(rumps.App):
         subprocess.run(["open", CONFIG_PATH])
 
     def _quit(self, _):
+        self.scheduler.stop()
+        if self.supervisor is not None:
+            self.supervisor.shutdown()
+        if self._engine is not None:
+            self._engine.stop()
+        if self._event_server is not None:
+            self._event_server.stop()
         rumps.quit_application()
 
 
@@ -0,0 +1,141 @@
+"""asyncio GitHub API client with the same semantics as GitHubClient.
+
+Same endpoints, ETag handling, 304 -> None, and RateLimitError/GitHubAPIError
+mapping, but built on aiohttp so thousands of requests can be in flight on one
+event loop. Use it as an async context manager (it owns the HTTP session).
+
+Bodies are capped at `max_response_bytes` like the sync client's, and only
+the same fields are parsed out of them. Unlike the sync client, the whole
+(capped) body is read before parsing, since json_stream consumes a plain
+iterator.
+"""
+
+import json
+
+import aiohttp
+
+from github_client import (
+    GitHubAPIError, GitHubClient, _CHUNK_SIZE, _MAX_RESPONSE_BYTES, _RELEASE_FIELDS, _TAG_FIELDS,
+    _TagScan, _TAGS_PER_PAGE, _TIMEOUT, _rate_limit_error, api_error,
+)
+from json_stream import ResponseTooLarge, extract_fields, iter_objects
+from versions import TagFilter
+
+
+class AsyncGitHubClient:
+    def __init__(self, token: str | None = None, base_url: str | None = None, max_connections: int = 100,
+                 max_response_bytes: int = _MAX_RESPONSE_BYTES):
+        # Header building and base URL handling are shared with the sync client
+        self._sync = GitHubClient(token=token, base_url=base_url)
+        self.base_url = self._sync.base_url
+        self.max_response_bytes = max_response_bytes
+        self.max_connections = max_connections
+        self.request_count = 0
+        self._session: aiohttp.ClientSession | None = None
+
+    async def __aenter__(self) -> "AsyncGitHubClient":
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections),
+            timeout=aiohttp.ClientTimeout(total=_TIMEOUT),
+        )
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _get(self, url: str, spec: dict, etag: str | None = None, params: dict | None = None,
+                   array: bool = False):
+        """GET `url`. Returns (status, headers, the `spec` fields of the body or
+        None for 304); see GitHubClient._read_json."""
+        self.request_count += 1
+        async with self._session.get(
+            url, headers=self._sync._build_headers(etag), params=params,
+        ) as resp:
+            if resp.status == 304:
+                return 304, resp.headers, None
+            try:
+                chunks = await self._read_body(resp)
+            except ResponseTooLarge as e:
+                raise GitHubAPIError(resp.status, str(e)) from None
+            error = _rate_limit_error(resp.status, resp.headers)
+            if error is not None:
+                raise error
+            if resp.status >= 400:
+                raise api_error(resp.status, _error_message(b"".join(chunks)))
+            if array:
+                return resp.status, resp.headers, list(iter_objects(chunks, spec))
+            return resp.status, resp.headers, extract_fields(chunks, spec)
+
+    async def _read_body(self, resp: aiohttp.ClientResponse) -> list[bytes]:
+        chunks, size = [], 0
+        async for chunk in resp.content.iter_chunked(_CHUNK_SIZE):
+            size += len(chunk)
+            if size > self.max_response_bytes:
+                raise ResponseTooLarge(self.max_response_bytes)
+            chunks.append(chunk)
+        return chunks
+
+    async def fetch_latest_tag(
+        self, owner: str, repo: str, etag: str | None = None
+    ) -> dict | None:
+        url = f"{self.base_url}/repos/{owner}/{repo}/tags"
+        status, headers, tags = await self._get(url, _TAG_FIELDS, etag, {"per_page": 1}, array=True)
+        if status == 304 or not tags:
+            return None
+        return {
+            "tag_name": tags[0]["name"],
+            "commit_sha": tags[0]["commit"]["sha"],
+            "etag": headers.get("ETag"),
+        }
+
+    async def scan_tags(
+        self,
+        owner: str,
+        repo: str,
+        etag: str | None = None,
+        known_tags: list[str] | None = None,
+        current: dict | None = None,
+        tag_filter: TagFilter | None = None,
+        max_pages: int = 3,
+    ) -> dict | None:
+        """See GitHubClient.scan_tags."""
+        scan = _TagScan(known_tags, current, tag_filter)
+        url = f"{self.base_url}/repos/{owner}/{repo}/tags"
+        for page in range(1, max_pages + 1):
+            status, headers, tags = await self._get(
+                url, _TAG_FIELDS, etag if page == 1 else None, {"per_page": _TAGS_PER_PAGE, "page": page},
+                array=True,
+            )
+            if status == 304:
+                return None
+            if not scan.feed(tags, headers.get("ETag")):
+                break
+        return scan.result()
+
+    async def fetch_latest_release(
+        self, owner: str, repo: str, etag: str | None = None
+    ) -> dict | None:
+        url = f"{self.base_url}/repos/{owner}/{repo}/releases/latest"
+        status, headers, data = await self._get(url, _RELEASE_FIELDS, etag)
+        if status == 304:
+            return None
+        return {
+            "release_id": data["id"],
+            "tag_name": data["tag_name"],
+            "release_name": data.get("name", ""),
+            "etag": headers.get("ETag"),
+        }
+
+
+def _error_message(body: bytes) -> str:
+    if not body:
+        return "Unknown error"
+    try:
+        return json.loads(body).get("message", "Unknown error")
+    except (ValueError, AttributeError):
+        return body[:200].decode(errors="replace") or "Unknown error"
@@ -0,0 +1,143 @@
+"""Event-loop check engine: many repo checks in flight on one asyncio loop.
+
+`AsyncCheckEngine.check_all` produces the same cycle result as
+`RepoChecker.check_all`, with at most `concurrency` requests in flight. In the
+menubar app it runs on one long-lived loop thread (`EngineThread`). Run
+headless, this module is the main loop and prints changes as JSON lines.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+
+from async_client import AsyncGitHubClient
+from checker import RepoChecker, add_error, add_result, new_cycle, not_found_result, repo_key
+from config_loader import load_config
+from github_client import _MAX_RESPONSE_BYTES, NotFoundError
+from git_refs import GitRefsClient
+from history_store import HistoryStore
+from state_store import StateStore
+from token_resolver import resolve_token
+
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class AsyncCheckEngine:
+    def __init__(self, checker: RepoChecker, client: AsyncGitHubClient, concurrency: int = 20):
+        self.checker = checker
+        self.client = client
+        self.concurrency = concurrency
+
+    async def check_all(self, repos: list[dict]) -> dict:
+        if self.checker.prefilter is not None:
+            repos = await asyncio.to_thread(self.checker.select, repos)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(
+            *(self._check_repo(semaphore, cfg) for cfg in repos), return_exceptions=True,
+        )
+        cycle = new_cycle()
+        for result in results:
+            if isinstance(result, Exception):
+                add_error(cycle, result)
+            elif isinstance(result, BaseException):
+                raise result  # CancelledError and the like: not a failed check
+            else:
+                add_result(cycle, result)
+        return cycle
+
+    async def _check_repo(self, semaphore: asyncio.Semaphore, cfg: dict) -> dict:
+        key = repo_key(cfg)
+        async with semaphore:
+            # prepare/apply touch state and run on the loop thread only
+            plan = self.checker.prepare(key, cfg)
+            if plan["skip"]:
+                return self.checker.skipped(key, plan)
+            result = await self._fetch(cfg, plan)
+            return self.checker.apply(key, cfg, plan, result)
+
+    async def _fetch(self, cfg: dict, plan: dict) -> dict | None:
+        try:
+            return await self._fetch_once(cfg, plan)
+        except NotFoundError:
+            return not_found_result(cfg)
+
+    async def _fetch_once(self, cfg: dict, plan: dict) -> dict | None:
+        if cfg["watch"] == "tags" and cfg.get("tag_backend") == "git":
+            # The smart-HTTP backend is blocking; keep it off the loop
+            return await asyncio.to_thread(self.checker.fetch, cfg, plan)
+        prev = plan["prev"]
+        if cfg["watch"] == "tags":
+            return await self.client.scan_tags(
+                cfg["owner"], cfg["repo"], etag=plan["etag"],
+                known_tags=prev.get("known_tags"),
+                current={"tag_name": prev.get("last_tag_name"), "commit_sha": prev.get("last_commit_sha")},
+                tag_filter=plan["tag_filter"], max_pages=cfg.get("max_tag_pages", 3),
+            )
+        return await self.client.fetch_latest_release(cfg["owner"], cfg["repo"], etag=plan["etag"])
+
+
+class EngineThread:
+    """A long-lived event loop thread that runs check cycles on request."""
+
+    def __init__(self, checker: RepoChecker, token: str | None = None,
+                 base_url: str | None = None, concurrency: int = 20,
+                 max_response_bytes: int = _MAX_RESPONSE_BYTES):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self._client = AsyncGitHubClient(
+            token=token, base_url=base_url, max_connections=concurrency,
+            max_response_bytes=max_response_bytes,
+        )
+        self._engine = AsyncCheckEngine(checker, self._client, concurrency)
+        asyncio.run_coroutine_threadsafe(self._client.__aenter__(), self._loop).result()
+
+    def submit(self, repos: list[dict]):
+        """Start a cycle; returns a concurrent.futures.Future of the cycle result."""
+        return asyncio.run_coroutine_threadsafe(self._engine.check_all(repos), self._loop)
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._client.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+async def run_headless(config: dict, state: StateStore, history: HistoryStore | None,
+                       token: str | None = None, once: bool = False) -> None:
+    async with AsyncGitHubClient(
+        token=token, base_url=config.get("api_base_url"), max_connections=config["max_concurrency"],
+        max_response_bytes=config["max_response_bytes"],
+    ) as client:
+        checker = RepoChecker(None, GitRefsClient(token=token), state, history)
+        engine = AsyncCheckEngine(checker, client, config["max_concurrency"])
+        while True:
+            cycle = await engine.check_all(config["repos"])
+            for update in cycle["updates"]:
+                if update["status"] in ("new", "baseline"):
+                    print(json.dumps(update), flush=True)
+            if cycle["any_error"]:
+                print(json.dumps({"error": cycle["error_message"]}), flush=True)
+            if once:
+                return
+            await asyncio.sleep(config["check_interval_minutes"] * 60)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the watcher without the menubar.")
+    parser.add_argument("--config", default=os.path.join(_DIR, "config.json"))
+    parser.add_argument("--state", default=os.path.join(_DIR, "state.json"))
+    parser.add_argument("--once", action="store_true", help="run a single cycle and exit")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    history = HistoryStore(os.path.join(os.path.dirname(os.path.abspath(args.state)), "history.log"))
+    asyncio.run(run_headless(config, StateStore(args.state), history, resolve_token(), args.once))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
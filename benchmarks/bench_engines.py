@@ -0,0 +1,77 @@
+"""Compare the threaded check path with the asyncio engine.
+
+Runs one cold cycle (full responses) and one warm cycle (304s) per engine
+against the local stub API, with a per-request delay standing in for network
+latency:
+
+    python benchmarks/bench_engines.py --repos 500 --latency 0.02 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_client import AsyncGitHubClient  # noqa: E402
+from async_engine import AsyncCheckEngine  # noqa: E402
+from checker import RepoChecker  # noqa: E402
+from git_refs import GitRefsClient  # noqa: E402
+from github_client import GitHubClient  # noqa: E402
+from state_store import StateStore  # noqa: E402
+from tests.stub_api import StubGitHubAPI, make_repos  # noqa: E402
+
+
+def bench_threads(stub, repos, state_path):
+    checker = RepoChecker(GitHubClient(base_url=stub.url), GitRefsClient(), StateStore(state_path))
+    timings = []
+    for _ in range(2):
+        start = time.perf_counter()
+        cycle = checker.check_all(repos)
+        timings.append(time.perf_counter() - start)
+        assert not cycle["any_error"], cycle["error_message"]
+    return timings
+
+
+def bench_asyncio(stub, repos, state_path, concurrency):
+    async def run():
+        checker = RepoChecker(None, GitRefsClient(), StateStore(state_path))
+        async with AsyncGitHubClient(base_url=stub.url, max_connections=concurrency) as client:
+            engine = AsyncCheckEngine(checker, client, concurrency)
+            timings = []
+            for _ in range(2):
+                start = time.perf_counter()
+                cycle = await engine.check_all(repos)
+                timings.append(time.perf_counter() - start)
+                assert not cycle["any_error"], cycle["error_message"]
+            return timings
+    return asyncio.run(run())
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repos", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added per request")
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    repos = make_repos(args.repos)
+    with StubGitHubAPI() as stub, tempfile.TemporaryDirectory() as tmp:
+        stub.delay = args.latency
+        for i in range(args.repos):
+            stub.set_release(f"org/r{i}", i, f"v{i}.0")
+        threads = bench_threads(stub, repos, os.path.join(tmp, "threads.json"))
+        aio = bench_asyncio(stub, repos, os.path.join(tmp, "asyncio.json"), args.concurrency)
+
+    print(f"{args.repos} repos, {args.latency * 1000:.0f} ms latency, concurrency {args.concurrency}")
+    print(f"{'engine':<10}{'cold (s)':>10}{'warm (s)':>10}{'repos/s':>10}")
+    for name, (cold, warm) in (("threads", threads), ("asyncio", aio)):
+        print(f"{name:<10}{cold:>10.2f}{warm:>10.2f}{args.repos / warm:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,142 @@
+"""Compare json.loads on the whole body with streamed, field-selective parsing.
+
+Builds realistic large payloads (a release with long notes and hundreds of
+assets, a full page of tags, a page of org events carrying release payloads)
+and parses each one both ways, in the chunk size GitHubClient reads with.
+Reports the best time of several runs and the peak traced allocation:
+
+    python benchmarks/bench_parse.py --runs 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from github_client import (  # noqa: E402
+    _CHUNK_SIZE, _EVENT_FIELDS, _RELEASE_DETAIL_FIELDS, _RELEASE_FIELDS, _TAG_FIELDS,
+)
+from json_stream import extract_fields, iter_objects  # noqa: E402
+
+
+def _user(login):
+    return {
+        "login": login, "id": 1234567, "node_id": "MDQ6VXNlcjEyMzQ1Njc=",
+        "avatar_url": f"https://avatars.githubusercontent.com/u/1234567?v=4&u={login}",
+        "url": f"https://api.github.com/users/{login}", "html_url": f"https://github.com/{login}",
+        "type": "User", "site_admin": False,
+    }
+
+
+def _release(n_assets=300, notes_kb=120):
+    base = "https://api.github.com/repos/org/app/releases"
+    notes = "".join(f"* Fix #{i}: handle edge case in `module_{i}` (thanks @dev{i})\n" for i in range(notes_kb * 16))
+    return {
+        "url": f"{base}/1", "assets_url": f"{base}/1/assets", "html_url": "https://github.com/org/app/releases/v9.1",
+        "id": 150000001, "author": _user("release-bot"), "node_id": "RE_kwDOAbc",
+        "tag_name": "v9.1.0", "target_commitish": "main", "name": "v9.1.0 — big release",
+        "draft": False, "prerelease": False,
+        "created_at": "2024-05-01T00:00:00Z", "published_at": "2024-05-01T00:05:00Z",
+        "assets": [
+            {
+                "url": f"{base}/assets/{i}", "id": i, "node_id": f"RA_{i}",
+                "name": f"app-v9.1.0-{i}-linux-x64.tar.gz", "label": "", "uploader": _user("release-bot"),
+                "content_type": "application/gzip", "state": "uploaded", "size": 48_000_000 + i,
+                "download_count": 1000 + i, "created_at": "2024-05-01T00:01:00Z",
+                "updated_at": "2024-05-01T00:02:00Z",
+                "browser_download_url": f"https://github.com/org/app/releases/download/v9.1.0/app-{i}.tar.gz",
+            }
+            for i in range(n_assets)
+        ],
+        "tarball_url": "https://api.github.com/repos/org/app/tarball/v9.1.0",
+        "zipball_url": "https://api.github.com/repos/org/app/zipball/v9.1.0",
+        "body": notes,
+    }
+
+
+def _tags(n=100):
+    return [
+        {
+            "name": f"v{i // 10}.{i % 10}.0",
+            "zipball_url": f"https://api.github.com/repos/org/app/zipball/refs/tags/v{i}",
+            "tarball_url": f"https://api.github.com/repos/org/app/tarball/refs/tags/v{i}",
+            "commit": {"sha": f"{i:040x}", "url": f"https://api.github.com/repos/org/app/commits/{i:040x}"},
+            "node_id": f"MDM6UmVm{i}",
+        }
+        for i in range(n)
+    ]
+
+
+def _events(n=100):
+    release = _release(n_assets=20, notes_kb=8)
+    return [
+        {
+            "id": str(40000000000 + i), "type": "ReleaseEvent" if i % 3 == 0 else "PushEvent",
+            "actor": _user(f"dev{i}"), "repo": {"id": i, "name": f"org/repo{i}", "url": "https://api.github.com/x"},
+            "payload": {"action": "published", "release": release} if i % 3 == 0 else {
+                "push_id": i, "size": 1, "ref": "refs/heads/main", "head": f"{i:040x}",
+                "commits": [{"sha": f"{i:040x}", "message": "Update docs " * 20, "author": {"name": "dev"}}],
+            },
+            "public": True, "created_at": "2024-05-01T00:00:00Z", "org": {"id": 1, "login": "org"},
+        }
+        for i in range(n)
+    ]
+
+
+def _chunks(body: bytes) -> list[bytes]:
+    return [body[i:i + _CHUNK_SIZE] for i in range(0, len(body), _CHUNK_SIZE)]
+
+
+def _measure(fn, runs):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+CASES = [
+    # name, payload, spec, top-level array
+    ("release (latest)", _release, _RELEASE_FIELDS, False),
+    ("release (details)", _release, _RELEASE_DETAIL_FIELDS, False),
+    ("tags page", _tags, _TAG_FIELDS, True),
+    ("events page", _events, _EVENT_FIELDS, True),
+]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    print(f"{'payload':<20}{'size':>9}{'loads ms':>10}{'stream ms':>11}{'loads peak':>12}{'stream peak':>13}")
+    for name, build, spec, array in CASES:
+        body = json.dumps(build()).encode()
+        chunks = _chunks(body)
+
+        def full():
+            # What the client did before: join the body, then parse all of it
+            return json.loads(b"".join(chunks))
+
+        def streamed():
+            if array:
+                return list(iter_objects(chunks, spec))
+            return extract_fields(chunks, spec)
+
+        (t_full, m_full), (t_stream, m_stream) = _measure(full, args.runs), _measure(streamed, args.runs)
+        print(f"{name:<20}{len(body) / 1024:>7.0f}KB{t_full * 1000:>10.2f}{t_stream * 1000:>11.2f}"
+              f"{m_full / 1024:>10.0f}KB{m_stream / 1024:>11.0f}KB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
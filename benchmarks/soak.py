@@ -0,0 +1,201 @@
+"""Soak test: thousands of accelerated check cycles with resource budgets.
+
+Drives the same pieces the menubar app runs for weeks (scheduler thread, a
+worker thread or the asyncio engine per cycle, StateStore saves, history and
+event log appends) against the local stub API, with versions changing every few
+cycles. RSS, live threads and open file descriptors are sampled as it goes.
+Growth past the budgets, measured from the end of warmup, fails the run:
+
+    python benchmarks/soak.py --cycles 5000 --repos 50 --engine threads
+    python benchmarks/soak.py --cycles 2000 --engine asyncio --out soak.jsonl
+"""
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_engine import EngineThread  # noqa: E402
+from checker import RepoChecker  # noqa: E402
+from events import EventLog  # noqa: E402
+from git_refs import GitRefsClient  # noqa: E402
+from github_client import GitHubClient  # noqa: E402
+from history_store import HistoryStore  # noqa: E402
+from scheduler import Scheduler  # noqa: E402
+from state_store import StateStore  # noqa: E402
+from tests.stub_api import StubGitHubAPI, make_repos  # noqa: E402
+
+
+DEFAULT_BUDGETS = {"rss_mb": 25.0, "threads": 2, "fds": 8}
+
+
+def rss_bytes() -> int:
+    """Current (not peak) resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # macOS has no /proc; ps reports RSS in KiB
+        out = subprocess.run(["ps", "-o", "rss=", "-p", str(os.getpid())], capture_output=True, text=True)
+        return int(out.stdout.strip() or 0) * 1024
+
+
+def open_fds() -> int:
+    for path in ("/proc/self/fd", "/dev/fd"):
+        if os.path.isdir(path):
+            return len(os.listdir(path)) - 1  # minus the listing's own fd
+    return -1
+
+
+def sample(cycle: int) -> dict:
+    gc.collect()
+    return {
+        "cycle": cycle,
+        "time": time.time(),
+        "rss_mb": rss_bytes() / (1024 * 1024),
+        "threads": threading.active_count(),
+        "fds": open_fds(),
+    }
+
+
+def check_budgets(samples: list[dict], warmup: int, budgets: dict = DEFAULT_BUDGETS) -> list[str]:
+    """Violations: growth of any metric past its budget, relative to the
+    first sample taken at or after `warmup` cycles."""
+    settled = [s for s in samples if s["cycle"] >= warmup]
+    if len(settled) < 2:
+        return []
+    base = settled[0]
+    violations = []
+    for metric, budget in budgets.items():
+        worst = max(settled[1:], key=lambda s: s[metric])
+        growth = worst[metric] - base[metric]
+        if base[metric] >= 0 and growth > budget:
+            violations.append(
+                f"{metric} grew by {growth:g} (from {base[metric]:g} to {worst[metric]:g} "
+                f"by cycle {worst['cycle']}), budget {budget:g}"
+            )
+    return violations
+
+
+class _Harness:
+    """The app's per-cycle moving parts, minus Cocoa."""
+
+    def __init__(self, stub, repos, workdir, engine):
+        self.repos = repos
+        state = StateStore(os.path.join(workdir, "state.json"))
+        history = HistoryStore(os.path.join(workdir, "history.log"))
+        events = EventLog(os.path.join(workdir, "events.jsonl"))
+        self.checker = RepoChecker(GitHubClient(base_url=stub.url), GitRefsClient(), state, history, events)
+        self.engine = EngineThread(self.checker, base_url=stub.url) if engine == "asyncio" else None
+        self.scheduler = Scheduler(max_sleep=0.05)
+        self.errors = 0
+
+    def run_cycle(self) -> None:
+        done = threading.Event()
+
+        def worker():
+            try:
+                cycle = self.checker.check_all(self.repos)
+                self.errors += cycle["any_error"]
+                # The app queues a flash and its revert on every cycle
+                self.scheduler.call_later(0, lambda: None, name="flash", skip_if_late=True)
+            finally:
+                done.set()
+
+        def on_due():
+            if self.engine is not None:
+                future = self.engine.submit(self.repos)
+                future.add_done_callback(lambda f: (self._count(f), done.set()))
+            else:
+                threading.Thread(target=worker, daemon=True).start()
+
+        self.scheduler.call_later(0, on_due, name="check")
+        if not done.wait(30):
+            raise RuntimeError("check cycle did not finish within 30s")
+
+    def _count(self, future) -> None:
+        self.errors += future.result()["any_error"]
+
+    def close(self) -> None:
+        self.scheduler.stop()
+        if self.engine is not None:
+            self.engine.stop()
+
+
+def run_soak(cycles: int, repos: int = 50, engine: str = "threads", sample_every: int = 50,
+             change_every: int = 5, on_sample=None) -> dict:
+    """Run `cycles` check cycles. Returns {"samples", "errors", "elapsed"}."""
+    repo_cfgs = make_repos(repos, watch="mixed")
+    samples = []
+    start = time.perf_counter()
+    with StubGitHubAPI() as stub, tempfile.TemporaryDirectory() as workdir:
+        for cfg in repo_cfgs:
+            stub.set_release(f"org/{cfg['repo']}", 0, "v0.0")
+            stub.set_tags(f"org/{cfg['repo']}", ["v0.0"])
+        harness = _Harness(stub, repo_cfgs, workdir, engine)
+        harness.scheduler.start()
+        try:
+            for n in range(1, cycles + 1):
+                if n % change_every == 0:
+                    # A new version somewhere, so saves, history and events keep happening
+                    repo = repo_cfgs[n % repos]["repo"]
+                    stub.set_release(f"org/{repo}", n, f"v{n}.0")
+                    stub.add_tag(f"org/{repo}", f"v{n}.0")
+                stub.clear_log()
+                harness.run_cycle()
+                if n == 1 or n % sample_every == 0 or n == cycles:
+                    samples.append(sample(n))
+                    if on_sample is not None:
+                        on_sample(samples[-1])
+        finally:
+            harness.close()
+    return {"samples": samples, "errors": harness.errors, "elapsed": time.perf_counter() - start}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=2000)
+    parser.add_argument("--repos", type=int, default=50)
+    parser.add_argument("--engine", choices=("threads", "asyncio"), default="threads")
+    parser.add_argument("--sample-every", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=None, help="cycles before the baseline (default: 10%%)")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=DEFAULT_BUDGETS["rss_mb"])
+    parser.add_argument("--max-thread-growth", type=int, default=DEFAULT_BUDGETS["threads"])
+    parser.add_argument("--max-fd-growth", type=int, default=DEFAULT_BUDGETS["fds"])
+    parser.add_argument("--out", help="write samples here as JSON lines")
+    args = parser.parse_args(argv)
+
+    out = open(args.out, "w") if args.out else None
+
+    def report(s):
+        print(f"cycle {s['cycle']:>6}  rss {s['rss_mb']:7.1f} MB  threads {s['threads']:>3}  fds {s['fds']:>4}",
+              flush=True)
+        if out is not None:
+            out.write(json.dumps(s) + "\n")
+
+    try:
+        result = run_soak(args.cycles, args.repos, args.engine, args.sample_every, on_sample=report)
+    finally:
+        if out is not None:
+            out.close()
+
+    warmup = args.warmup if args.warmup is not None else args.cycles // 10
+    budgets = {"rss_mb": args.max_rss_growth_mb, "threads": args.max_thread_growth, "fds": args.max_fd_growth}
+    violations = check_budgets(result["samples"], warmup, budgets)
+    print(f"{args.cycles} cycles in {result['elapsed']:.1f}s, {result['errors']} cycles with errors")
+    for violation in violations:
+        print(f"FAIL: {violation}")
+    if not violations:
+        print("OK: within budgets")
+    return 1 if violations or result["errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,236 @@
+"""Shared caching proxy for the GitHub API endpoints the watcher polls.
+
+Run one instance on the local network and point every watcher at it with
+"api_base_url" in config.json. Responses for `/repos/{o}/{r}/tags` and
+`/repos/{o}/{r}/releases/latest`, release details by tag, and the org event
+feed `/orgs/{org}/events` are cached for a freshness TTL, concurrent
+identical requests collapse into one upstream fetch, and stale entries are
+revalidated upstream with their ETag. Clients keep their own ETags and get
+304s from the proxy as they would from GitHub, and see the feed's
+X-Poll-Interval.
+
+Upstream requests carry no token unless one is passed with `--token`. Anyone
+who can reach the proxy can read whatever that token can, so a token is only
+accepted on a loopback address unless `--allow-token-on-network` is given; use
+a token without private-repo access for a shared proxy.
+"""
+
+import argparse
+import ipaddress
+import re
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from github_client import _BASE_URL, _TIMEOUT
+
+
+_CACHEABLE_PATH = re.compile(
+    r"^(/repos/[^/]+/[^/]+/(tags|releases/latest|releases/tags/[^/]+)|/orgs/[^/]+/events)$"
+)
+_CACHEABLE_STATUS = {200, 404}
+_PASSTHROUGH_HEADERS = (
+    "Content-Type", "ETag", "Retry-After", "X-Poll-Interval",
+    "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset",
+)
+
+
+class _Entry:
+    def __init__(self, status: int, body: bytes, headers: dict):
+        self.status = status
+        self.body = body
+        self.headers = headers
+        self.fetched_at = time.monotonic()
+
+    @property
+    def etag(self) -> str | None:
+        return self.headers.get("ETag")
+
+
+class _Flight:
+    """One in-progress upstream fetch that other requests can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry: _Entry | None = None
+        self.error: Exception | None = None
+
+
+class CachingProxy:
+    def __init__(
+        self,
+        upstream: str = _BASE_URL,
+        token: str | None = None,
+        ttl: float = 60,
+        max_entries: int = 10_000,
+    ):
+        self.upstream = upstream.rstrip("/")
+        self.token = token
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "collapsed": 0, "upstream": 0}
+        self._cache: OrderedDict[str, _Entry] = OrderedDict()
+        self._flights: dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    def get(self, path: str) -> tuple[_Entry, str]:
+        """Return (entry, cache status) for a cacheable path and query."""
+        with self._lock:
+            entry = self._cache.get(path)
+            if entry is not None and time.monotonic() - entry.fetched_at < self.ttl:
+                self._cache.move_to_end(path)
+                self.stats["hits"] += 1
+                return entry, "HIT"
+            flight = self._flights.get(path)
+            leader = flight is None
+            if leader:
+                flight = self._flights[path] = _Flight()
+            else:
+                self.stats["collapsed"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.entry, "COLLAPSED"
+
+        try:
+            flight.entry, status = self._fetch(path, entry)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[path]
+            flight.done.set()
+        return flight.entry, status
+
+    def _fetch(self, path: str, stale: _Entry | None) -> tuple[_Entry, str]:
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if stale is not None and stale.etag:
+            headers["If-None-Match"] = stale.etag
+
+        with self._lock:
+            self.stats["upstream"] += 1
+        resp = requests.get(f"{self.upstream}{path}", headers=headers, timeout=_TIMEOUT)
+
+        if resp.status_code == 304 and stale is not None:
+            stale.fetched_at = time.monotonic()
+            with self._lock:
+                self.stats["revalidated"] += 1
+            return stale, "REVALIDATED"
+
+        entry = _Entry(
+            resp.status_code,
+            resp.content,
+            {k: resp.headers[k] for k in _PASSTHROUGH_HEADERS if k in resp.headers},
+        )
+        with self._lock:
+            self.stats["misses"] += 1
+            if entry.status in _CACHEABLE_STATUS:
+                self._cache[path] = entry
+                self._cache.move_to_end(path)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.pop(path, None)  # don't serve a stale body past an error
+        return entry, "MISS"
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        path = handler.path
+        if not _CACHEABLE_PATH.match(path.split("?", 1)[0]):
+            self._respond(handler, 404, b'{"message": "Not Found"}', {"Content-Type": "application/json"})
+            return
+        try:
+            entry, cache_status = self.get(path)
+        except Exception as e:  # the client must always get an answer
+            body = f'{{"message": "Upstream error: {e.__class__.__name__}"}}'.encode()
+            self._respond(handler, 502, body, {"Content-Type": "application/json"})
+            return
+
+        headers = dict(entry.headers, **{"X-Proxy-Cache": cache_status})
+        if entry.status == 200 and entry.etag and handler.headers.get("If-None-Match") == entry.etag:
+            self._respond(handler, 304, b"", headers)
+        else:
+            self._respond(handler, entry.status, entry.body, headers)
+
+    @staticmethod
+    def _respond(handler, status: int, body: bytes, headers: dict) -> None:
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        if body:
+            handler.wfile.write(body)
+
+    def serve(self, host: str = "127.0.0.1", port: int = 8787) -> ThreadingHTTPServer:
+        """Start serving in a background thread and return the server."""
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                proxy._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Shared caching proxy for watcher instances.")
+    parser.add_argument("--host", default="127.0.0.1", help="use 0.0.0.0 to serve the local network")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--ttl", type=float, default=60, help="seconds a cached response stays fresh")
+    parser.add_argument("--upstream", default=_BASE_URL)
+    parser.add_argument("--token", default=None,
+                        help="token for upstream requests (default: none); everyone who can reach "
+                             "the proxy can read what it can read")
+    parser.add_argument("--allow-token-on-network", action="store_true",
+                        help="accept --token with a non-loopback --host")
+    args = parser.parse_args(argv)
+    if args.token and not _is_loopback(args.host) and not args.allow_token_on_network:
+        parser.error("refusing to share --token on a non-loopback address; pass a token without "
+                     "private-repo access and --allow-token-on-network, or drop --token")
+
+    proxy = CachingProxy(upstream=args.upstream, token=args.token, ttl=args.ttl)
+    server = proxy.serve(args.host, args.port)
+    print(f"Caching proxy on http://{args.host}:{server.server_address[1]} -> {args.upstream}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        proxy.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
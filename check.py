@@ -0,0 +1,155 @@
+"""One-shot check for CI: has any watched repo shipped a new version?
+
+Loads config.json, checks every repo concurrently within a time budget, and
+prints the results as JSON. State (and so every ETag) is kept in
+check-state.json between runs, so repeated runs mostly get 304s; cache that
+file between CI jobs, because the first run only records baselines. It is not
+the app's state.json: a run there would move the app's versions forward
+without the app ever announcing them. Exit codes follow diff(1):
+
+    0  no new versions
+    1  at least one new version
+    2  errors or timeouts (takes precedence over 1)
+
+    python check.py --timeout 60 --pretty
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+from checker import RepoChecker, error_message, repo_key
+from config_loader import ConfigError, load_config
+from git_refs import GitRefsClient
+from github_client import GitHubClient
+from state_store import StateStore
+from token_resolver import resolve_token
+
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+
+EXIT_UNCHANGED = 0
+EXIT_NEW = 1
+EXIT_ERROR = 2
+
+
+class _Run:
+    """Concurrent fetches with state access serialized, as in the asyncio engine.
+
+    Results are recorded in `applied` under the same lock that guards state,
+    so the report covers exactly what reached state.json, however a worker's
+    finish races the deadline.
+    """
+
+    def __init__(self, checker: RepoChecker):
+        self.checker = checker
+        self.lock = threading.Lock()
+        self.abandoned = False  # set at the deadline; late results are dropped
+        self.applied = {}  # repo key -> result
+
+    def check(self, cfg: dict) -> None:
+        key = repo_key(cfg)
+        with self.lock:
+            if self.abandoned:
+                return
+            plan = self.checker.prepare(key, cfg)
+            if plan["skip"]:
+                self.applied[key] = self.checker.skipped(key, plan)
+                return
+        result = self.checker.fetch(cfg, plan)
+        with self.lock:
+            if not self.abandoned:
+                self.applied[key] = self.checker.apply(key, cfg, plan, result)
+
+
+def run_checks(config: dict, state: StateStore, token: str | None = None,
+               timeout: float = 60, workers: int | None = None) -> dict:
+    """Check every repo in `config`. Returns the JSON report."""
+    client = GitHubClient(
+        token=token, base_url=config.get("api_base_url"), max_response_bytes=config["max_response_bytes"],
+    )
+    checker = RepoChecker(client, GitRefsClient(token=token), state)
+    run = _Run(checker)
+    start = time.monotonic()
+    pool = ThreadPoolExecutor(max_workers=workers or config["max_concurrency"])
+    futures = {pool.submit(run.check, cfg): cfg for cfg in config["repos"]}
+    wait(futures, timeout=timeout)
+    with run.lock:
+        run.abandoned = True
+        applied = dict(run.applied)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    report = {
+        "checked_at": datetime.now(timezone.utc).isoformat(),
+        "elapsed": round(time.monotonic() - start, 3),
+        "results": [],
+        "new": [],
+        "errors": [],
+    }
+    for future, cfg in futures.items():
+        key = repo_key(cfg)
+        entry = {"key": key, "label": cfg["label"], "watch": cfg["watch"]}
+        if key not in applied:
+            error = future.exception() if future.done() and not future.cancelled() else None
+            if error is not None:
+                entry["status"] = "error"
+                report["errors"].append({"key": key, "error": error_message(error)})
+            else:
+                entry["status"] = "timeout"
+                report["errors"].append({"key": key, "error": f"no answer within {timeout:g}s"})
+        else:
+            result = applied[key]
+            entry["status"] = result["status"]
+            if result["status"] == "negative":
+                entry["negative"] = result["negative"]
+            if result["status"] == "unchanged" and "version" not in result:
+                # 304: report what state already holds
+                result = dict(result, version=(state.get(key) or {}).get("last_tag_name"))
+            for field in ("version", "previous"):
+                if field in result:
+                    entry[field] = result[field]
+            if result["status"] == "new":
+                report["new"].append(key)
+        report["results"].append(entry)
+    return report
+
+
+def exit_code(report: dict) -> int:
+    if report["errors"]:
+        return EXIT_ERROR
+    return EXIT_NEW if report["new"] else EXIT_UNCHANGED
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check every watched repo once and print JSON.")
+    parser.add_argument("--config", default=os.path.join(_DIR, "config.json"))
+    parser.add_argument("--state", default=os.path.join(_DIR, "check-state.json"))
+    parser.add_argument("--timeout", type=float, default=60, help="seconds for the whole run")
+    parser.add_argument("--workers", type=int, default=None, help="default: max_concurrency from config")
+    parser.add_argument("--pretty", action="store_true", help="indent the JSON output")
+    args = parser.parse_args(argv)
+
+    try:
+        config = load_config(args.config)
+    except ConfigError as e:
+        print(json.dumps({"errors": [{"key": None, "error": str(e)}]}))
+        return EXIT_ERROR
+
+    report = run_checks(config, StateStore(args.state), resolve_token(), args.timeout, args.workers)
+    print(json.dumps(report, indent=2 if args.pretty else None))
+    return exit_code(report)
+
+
+if __name__ == "__main__":
+    code = main()
+    # Fetches abandoned at the deadline can no longer touch state, but a normal
+    # exit would wait for their threads, up to the request timeout per page.
+    # State is already saved, so end the process now to keep to --timeout.
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(code)
@@ -0,0 +1,242 @@
+"""Check repos for new versions and record what was seen in state.
+
+This is the per-repo logic behind a check cycle, kept free of any UI code so
+it can run in the menubar app, in worker processes, or from the command line.
+"""
+
+import time
+from datetime import datetime, timezone
+
+from github_client import NotFoundError, RateLimitError
+from profiling import span
+from versions import TagFilter
+
+
+# Menu text for repos with nothing to show yet (not errors: the icon stays calm)
+NEGATIVE_LABELS = {
+    "no_releases": "no releases yet",
+    "no_tags": "no tags yet",
+    "not_found": "not found",
+}
+
+
+def not_found_result(cfg: dict) -> dict:
+    """Fetch result for a 404. /releases/latest is 404 for a repo with no
+    releases; /tags is only 404 when the repo itself is missing."""
+    return {"negative": "no_releases" if cfg["watch"] == "releases" else "not_found", "etag": None}
+
+
+def repo_key(cfg: dict) -> str:
+    return f"{cfg['owner']}/{cfg['repo']}"
+
+
+def new_cycle() -> dict:
+    """Empty result of a check cycle, filled in by add_result/add_error."""
+    return {"updates": [], "notifications": [], "any_error": False, "error_message": None}
+
+
+def add_result(cycle: dict, result: dict) -> None:
+    cycle["updates"].append(result)
+    if result["status"] == "new":
+        cycle["notifications"].append(result)
+
+
+def add_error(cycle: dict, exc: Exception) -> None:
+    cycle["any_error"] = True
+    cycle["error_message"] = error_message(exc)
+
+
+def error_message(exc: Exception) -> str:
+    if isinstance(exc, RateLimitError):
+        reset_time = ""
+        if exc.reset_timestamp:
+            dt = datetime.fromtimestamp(exc.reset_timestamp, tz=timezone.utc)
+            reset_time = f" — next check at {dt.strftime('%H:%M UTC')}"
+        return f"Rate limited{reset_time}"
+    return str(exc)
+
+
+class RepoChecker:
+    # Repos with nothing published are rechecked after 1h, 2h, 4h, ... up to a day
+    NEGATIVE_TTL_MIN = 3600
+    NEGATIVE_TTL_MAX = 86400
+
+    def __init__(self, client, git_client, state, history=None, events=None, clock=time.time,
+                 prefilter=None):
+        self.client = client
+        self.git_client = git_client
+        self.state = state
+        self.history = history
+        self.events = events
+        self.clock = clock
+        self.prefilter = prefilter
+
+    def select(self, repos: list[dict]) -> list[dict]:
+        """Repos worth fetching this cycle, per the optional event-feed prefilter."""
+        if self.prefilter is None:
+            return repos
+        return self.prefilter.select(repos)
+
+    def check_all(self, repos: list[dict]) -> dict:
+        """Check every repo in turn. Errors are collected, not raised."""
+        cycle = new_cycle()
+        for cfg in self.select(repos):
+            try:
+                add_result(cycle, self.check_repo(repo_key(cfg), cfg))
+            except Exception as e:
+                add_error(cycle, e)
+        return cycle
+
+    def check_repo(self, key: str, cfg: dict) -> dict:
+        """Check a single repo. Returns a dict of results for UI update."""
+        plan = self.prepare(key, cfg)
+        if plan["skip"]:
+            return self.skipped(key, plan)
+        return self.apply(key, cfg, plan, self.fetch(cfg, plan))
+
+    def prepare(self, key: str, cfg: dict) -> dict:
+        """Gather what the request for `key` needs from state."""
+        plan = {
+            "etag": self.state.get_etag(key),
+            "is_first": self.state.is_first_run(key),
+            "prev": self.state.get(key) or {},
+            "tag_filter": None,
+            "skip": False,
+        }
+        if cfg["watch"] == "tags":
+            plan["tag_filter"] = TagFilter.from_config(cfg)
+            prev = plan["prev"]
+            if prev and prev.get("tag_filter") != plan["tag_filter"].fingerprint:
+                # Filter changed (or state predates filters): rescan and re-baseline
+                plan.update(prev={}, etag=None, is_first=True)
+        negative = plan["prev"].get("negative")
+        if negative and negative["until"] > self.clock():
+            plan["skip"] = True
+        return plan
+
+    def skipped(self, key: str, plan: dict) -> dict:
+        """Result for a repo whose negative entry has not expired yet."""
+        return {"key": key, "status": "negative", "negative": plan["prev"]["negative"]["kind"]}
+
+    def fetch(self, cfg: dict, plan: dict) -> dict | None:
+        try:
+            return self._fetch(cfg, plan)
+        except NotFoundError:
+            return not_found_result(cfg)
+
+    def _fetch(self, cfg: dict, plan: dict) -> dict | None:
+        prev = plan["prev"]
+        if cfg["watch"] == "tags" and cfg.get("tag_backend") == "git":
+            return self.git_client.fetch_latest_tag(
+                cfg["owner"], cfg["repo"], etag=plan["etag"], tag_filter=plan["tag_filter"],
+            )
+        if cfg["watch"] == "tags":
+            return self.client.scan_tags(
+                cfg["owner"], cfg["repo"], etag=plan["etag"],
+                known_tags=prev.get("known_tags"),
+                current={"tag_name": prev.get("last_tag_name"), "commit_sha": prev.get("last_commit_sha")},
+                tag_filter=plan["tag_filter"], max_pages=cfg.get("max_tag_pages", 3),
+            )
+        return self.client.fetch_latest_release(cfg["owner"], cfg["repo"], etag=plan["etag"])
+
+    def apply(self, key: str, cfg: dict, plan: dict, result: dict | None) -> dict:
+        """Record a fetch result in state and classify it."""
+        applied = self._apply(key, cfg, plan, result)
+        if self.prefilter is not None:
+            self.prefilter.fetched(key)  # only now is its feed event fully handled
+        return applied
+
+    def _apply(self, key: str, cfg: dict, plan: dict, result: dict | None) -> dict:
+        if result is None:
+            negative = plan["prev"].get("negative")
+            if negative:  # 304 on a negative entry: still nothing there
+                still = {"negative": negative["kind"], "etag": plan["etag"]}
+                return self._apply_negative(key, cfg, plan, still)
+            return {"key": key, "status": "unchanged"}
+        if "negative" in result:
+            if plan["prev"].get("last_tag_name"):
+                # Releases deleted or repo gone: keep showing what we last saw
+                return {"key": key, "status": "unchanged"}
+            return self._apply_negative(key, cfg, plan, result)
+
+        # Build state update
+        if cfg["watch"] == "tags":
+            new_state = {
+                "last_tag_name": result["tag_name"],
+                "last_commit_sha": result["commit_sha"],
+                "etag": result["etag"],
+                "tag_filter": plan["tag_filter"].fingerprint,
+            }
+            if "known_tags" in result:
+                new_state["known_tags"] = result["known_tags"]
+                new_state["scan_requests"] = result["requests"]
+            changed = self._tag_changed(key, result)
+        else:
+            new_state = {
+                "last_release_id": result["release_id"],
+                "last_tag_name": result["tag_name"],
+                "etag": result["etag"],
+            }
+            changed = self._release_changed(key, result)
+
+        if plan["prev"].get("negative"):
+            new_state["negative"] = None
+
+        # From state, not plan["prev"]: a re-baseline after a tag filter change
+        # empties plan["prev"] but should still report the version it replaces
+        previous = (self.state.get(key) or {}).get("last_tag_name")
+        self.state.update(key, new_state)
+
+        version = result["tag_name"]
+        source = f"{cfg.get('tag_backend', 'api')}:{cfg['watch']}"
+        if changed and self.history is not None and not plan["is_first"]:
+            with span("history_record"):
+                self.history.record(key, version, source)
+        if changed and not plan["is_first"]:
+            status = "new"
+        else:
+            status = "baseline" if plan["is_first"] else "unchanged"
+        if changed and self.events is not None:
+            self.events.publish(key, cfg["watch"], previous, version, status, source)
+        return {
+            "key": key,
+            "status": status,
+            "version": version,
+            "previous": previous,
+            "watch": cfg["watch"],
+            "changed": changed,
+            "source": source,
+        }
+
+    def _apply_negative(self, key: str, cfg: dict, plan: dict, result: dict) -> dict:
+        """Record that there is nothing to see, and back off exponentially."""
+        kind = result["negative"]
+        prev = plan["prev"].get("negative")
+        if prev and prev["kind"] == kind:
+            ttl = min(prev["ttl"] * 2, self.NEGATIVE_TTL_MAX)
+        else:
+            ttl = self.NEGATIVE_TTL_MIN
+        new_state = {
+            "negative": {"kind": kind, "until": self.clock() + ttl, "ttl": ttl},
+            "etag": result["etag"],
+        }
+        if cfg["watch"] == "tags":
+            # Keep the fingerprint so a first tag is "new", not a re-baseline
+            new_state["tag_filter"] = plan["tag_filter"].fingerprint
+        self.state.update(key, new_state)
+        return {"key": key, "status": "negative", "negative": kind, "watch": cfg["watch"]}
+
+    def _tag_changed(self, key: str, result: dict) -> bool:
+        prev = self.state.get(key)
+        if prev is None:
+            return True
+        return (
+            prev.get("last_tag_name") != result["tag_name"]
+            or prev.get("last_commit_sha") != result["commit_sha"]
+        )
+
+    def _release_changed(self, key: str, result: dict) -> bool:
+        prev = self.state.get(key)
+        if prev is None:
+            return True
+        return prev.get("last_release_id") != result["release_id"]
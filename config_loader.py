@@ -9,6 +9,8 @@ class ConfigError(Exception):
 
 
 _VALID_WATCH_TYPES = {"tags", "releases"}
+_VALID_TAG_BACKENDS = {"api", "git"}
+_VALID_ENGINES = {"threads", "asyncio"}
 _REQUIRED_REPO_KEYS = {"owner", "repo", "watch", "label"}
 
 
@@ -33,6 +35,66 @@ def load_config(path: str) -> dict:
             "check_interval_minutes must be a number >= 1"
         )
 
+    base_url = data.get("api_base_url")
+    if base_url is not None and (
+        not isinstance(base_url, str) or not base_url.startswith(("http://", "https://"))
+    ):
+        raise ConfigError("api_base_url must be an http:// or https:// URL")
+
+    if data.setdefault("engine", "threads") not in _VALID_ENGINES:
+        raise ConfigError(f"engine must be one of: {_VALID_ENGINES}")
+    concurrency = data.setdefault("max_concurrency", 20)
+    if not isinstance(concurrency, int) or isinstance(concurrency, bool) or concurrency < 1:
+        raise ConfigError("max_concurrency must be an integer >= 1")
+    max_bytes = data.setdefault("max_response_bytes", 10 * 1024 * 1024)
+    if not isinstance(max_bytes, int) or isinstance(max_bytes, bool) or max_bytes < 1:
+        raise ConfigError("max_response_bytes must be an integer >= 1")
+
+    history = data.setdefault("history", {})
+    history.setdefault("retention_days", 365)
+    history.setdefault("rollup_after_days", 30)
+    for key in ("retention_days", "rollup_after_days"):
+        if not isinstance(history[key], (int, float)) or history[key] <= 0:
+            raise ConfigError(f"history.{key} must be a number > 0")
+    if history["rollup_after_days"] > history["retention_days"]:
+        raise ConfigError("history.rollup_after_days must not exceed history.retention_days")
+
+    profiling = data.setdefault("profiling", {})
+    if not isinstance(profiling.setdefault("enabled", False), bool):
+        raise ConfigError("profiling.enabled must be true or false")
+    for key, default in (("every_n_cycles", 10), ("keep", 20), ("top", 25)):
+        value = profiling.setdefault(key, default)
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            raise ConfigError(f"profiling.{key} must be an integer >= 1")
+    if not isinstance(profiling.setdefault("dir", "profiles"), str):
+        raise ConfigError("profiling.dir must be a path")
+
+    events = data.get("events")
+    if events is not None:
+        if not isinstance(events, dict):
+            raise ConfigError("events must be an object")
+        if not isinstance(events.setdefault("log", "events.jsonl"), str):
+            raise ConfigError("events.log must be a path")
+        socket_path = events.setdefault("socket", "events.sock")
+        if socket_path is not None and not isinstance(socket_path, str):
+            raise ConfigError("events.socket must be a path or null")
+
+    if data.get("sharding") is not None:
+        _validate_sharding(data["sharding"])
+
+    prefilter = data.get("event_prefilter")
+    if prefilter is not None:
+        if not isinstance(prefilter, dict):
+            raise ConfigError("event_prefilter must be an object")
+        orgs = prefilter.get("orgs")
+        if not isinstance(orgs, list) or not orgs or not all(isinstance(o, str) and o for o in orgs):
+            raise ConfigError("event_prefilter.orgs must be a non-empty list of org names")
+        hours = prefilter.setdefault("full_sweep_hours", 24)
+        if not isinstance(hours, (int, float)) or isinstance(hours, bool) or hours <= 0:
+            raise ConfigError("event_prefilter.full_sweep_hours must be a number > 0")
+        if data.get("sharding") is not None:
+            raise ConfigError("event_prefilter cannot be combined with sharding")
+
     for i, repo in enumerate(data["repos"]):
         missing = _REQUIRED_REPO_KEYS - set(repo.keys())
         if missing:
@@ -42,5 +104,44 @@ def load_config(path: str) -> dict:
                 f"Repo #{i} has invalid watch type '{repo['watch']}'. "
                 f"Must be one of: {_VALID_WATCH_TYPES}"
             )
+        backend = repo.setdefault("tag_backend", "api")
+        if backend not in _VALID_TAG_BACKENDS:
+            raise ConfigError(
+                f"Repo #{i} has invalid tag_backend '{backend}'. "
+                f"Must be one of: {_VALID_TAG_BACKENDS}"
+            )
+        if backend == "git" and repo["watch"] != "tags":
+            raise ConfigError(f"Repo #{i}: tag_backend 'git' requires watch 'tags'")
+        for key in ("tag_include", "tag_exclude"):
+            patterns = repo.setdefault(key, [])
+            if not isinstance(patterns, list) or not all(isinstance(p, str) for p in patterns):
+                raise ConfigError(f"Repo #{i}: {key} must be a list of glob patterns")
+        if not isinstance(repo.setdefault("include_prereleases", False), bool):
+            raise ConfigError(f"Repo #{i}: include_prereleases must be true or false")
+        pages = repo.setdefault("max_tag_pages", 3)
+        if not isinstance(pages, int) or isinstance(pages, bool) or pages < 1:
+            raise ConfigError(f"Repo #{i}: max_tag_pages must be an integer >= 1")
 
     return data
+
+
+def _validate_sharding(sharding: dict) -> None:
+    """Normalize the optional "sharding" block in place."""
+    if not isinstance(sharding, dict):
+        raise ConfigError("sharding must be an object")
+    shards = sharding.get("shards")
+    if isinstance(shards, int) and not isinstance(shards, bool) and shards >= 1:
+        shards = [f"shard-{n}" for n in range(shards)]
+    if (
+        not isinstance(shards, list) or not shards
+        or not all(isinstance(s, str) and s for s in shards)
+        or len(set(shards)) != len(shards)
+    ):
+        raise ConfigError("sharding.shards must be a number >= 1 or a list of unique names")
+    sharding["shards"] = shards
+
+    local = sharding.setdefault("local_shards", None)
+    if local is not None and (not isinstance(local, list) or not set(local) <= set(shards)):
+        raise ConfigError("sharding.local_shards must be a list of names from sharding.shards")
+    if not isinstance(sharding.setdefault("dir", "shards"), str):
+        raise ConfigError("sharding.dir must be a path")
@@ -0,0 +1,123 @@
+"""Skip repos whose org event feed shows no new tags or releases.
+
+For each configured org, one conditional request to `/orgs/{org}/events`
+(usually a 304) replaces a request per repo. Only repos with a `ReleaseEvent`
+or a tag `CreateEvent` since the last seen event ID go on to the per-repo
+fetch. Feed state lives in state.json's "event_feeds" section, per org.
+
+The cursor moves forward when the feed is read, but every repo selected for a
+fetch stays "pending" in the feed state until `fetched` reports it done. A repo
+whose fetch fails (rate limit, network, 5xx) is therefore selected again next
+cycle even though its event has already been consumed.
+
+The feed is public-only, keeps a limited window, and can't be polled more
+often than its X-Poll-Interval. So every org repo is checked when a gap is
+detected (the last seen event fell out of the pages read), when the feed
+fails, on the first poll, and in a slow periodic full sweep.
+"""
+
+import logging
+import time
+
+import requests
+
+from checker import repo_key
+from github_client import GitHubAPIError
+
+
+log = logging.getLogger(__name__)
+
+SECTION = "event_feeds"
+
+
+def _relevant(event: dict) -> bool:
+    if event.get("type") == "ReleaseEvent":
+        return True
+    return event.get("type") == "CreateEvent" and event.get("payload", {}).get("ref_type") == "tag"
+
+
+class EventFeedFilter:
+    def __init__(self, client, state, orgs: list[str], full_sweep_hours: float = 24, clock=time.time):
+        self.client = client
+        self.state = state
+        self.orgs = {org.lower() for org in orgs}
+        self.full_sweep_seconds = full_sweep_hours * 3600
+        self.clock = clock
+        self.stats = {"polled": 0, "skipped": 0}
+
+    def select(self, repos: list[dict]) -> list[dict]:
+        """The repos that need a per-repo fetch this cycle, in order."""
+        changed_by_org = {}
+        for org in {cfg["owner"].lower() for cfg in repos} & self.orgs:
+            changed_by_org[org] = self._changed_repos(org)
+
+        feeds = self.state.get_section(SECTION)
+        pending_by_org = {org: set(feeds.get(org, {}).get("pending", [])) for org in changed_by_org}
+        selected = []
+        selected_by_org = {org: set() for org in changed_by_org}
+        for cfg in repos:
+            org = cfg["owner"].lower()
+            if org not in changed_by_org:
+                selected.append(cfg)
+                continue
+            changed = changed_by_org[org]
+            key = repo_key(cfg)
+            lowered = key.lower()
+            if (changed is None or lowered in changed or lowered in pending_by_org[org]
+                    or self.state.is_first_run(key)):
+                selected.append(cfg)
+                selected_by_org[org].add(lowered)
+            else:
+                self.stats["skipped"] += 1
+
+        for org, keys in selected_by_org.items():
+            if keys != pending_by_org[org]:
+                self.state.update_section(SECTION, org, {"pending": sorted(keys)})
+        return selected
+
+    def fetched(self, key: str) -> None:
+        """Called once `key` was fetched and applied: it is no longer pending."""
+        org = key.split("/", 1)[0].lower()
+        if org not in self.orgs:
+            return
+        pending = self.state.get_section(SECTION).get(org, {}).get("pending", [])
+        if key.lower() in pending:
+            self.state.update_section(SECTION, org, {"pending": [k for k in pending if k != key.lower()]})
+
+    def _changed_repos(self, org: str) -> set[str] | None:
+        """Lowercased keys of repos with relevant events, or None for "check all"."""
+        feed = self.state.get_section(SECTION).get(org, {})
+        now = self.clock()
+        sweep = now - feed.get("last_sweep", 0) >= self.full_sweep_seconds
+        if now < feed.get("next_poll", 0):
+            # Too soon to poll; the cursor catches up later
+            if not sweep:
+                return set()
+            self.state.update_section(SECTION, org, {"last_sweep": now})
+            return None
+
+        try:
+            result = self.client.fetch_org_events(
+                org, etag=feed.get("etag"), since_id=feed.get("last_event_id"),
+            )
+        except (GitHubAPIError, requests.RequestException) as e:
+            log.warning("Event feed for %s failed, checking all its repos: %s", org, e)
+            return None
+        self.stats["polled"] += 1
+
+        values = {"next_poll": now + feed.get("poll_interval", 0)}
+        if result is None:  # 304
+            changed = set()
+        else:
+            changed = {e["repo"]["name"].lower() for e in result["events"] if _relevant(e)}
+            values.update(etag=result["etag"], poll_interval=result["poll_interval"],
+                          next_poll=now + result["poll_interval"])
+            ids = [int(e["id"]) for e in result["events"]]
+            values["last_event_id"] = max(ids, default=feed.get("last_event_id", 0))
+            if result["gap"] or "last_event_id" not in feed:
+                changed = None
+        if sweep:
+            changed = None
+            values["last_sweep"] = now
+        self.state.update_section(SECTION, org, values)
+        return changed
@@ -0,0 +1,240 @@
+"""Change-event stream: an offset-numbered JSONL log plus a Unix-socket feed.
+
+Every detected version change is appended to the log as one JSON object with
+a dense, monotonically increasing `offset` (0, 1, 2, ...). A torn last line
+left by a crash (one without its newline) is dropped when the log is reopened,
+so offsets are never reused. A corrupt record elsewhere is skipped and logged,
+leaving a gap in the offsets; the events after it are kept.
+
+Consumers connect to the Unix socket, send one line `{"from": N}`, and receive
+every event with offset >= N, then live events as they are published. A
+consumer that remembers the last offset it handled can reconnect and resume
+without missing or repeating anything. Omit "from" to receive only new events.
+
+    python events.py --from 0      # print the backlog, then follow
+"""
+
+import argparse
+import bisect
+import json
+import logging
+import os
+import select
+import socket
+import socketserver
+import threading
+import time
+
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+EVENTS_PATH = os.path.join(_DIR, "events.jsonl")
+SOCKET_PATH = os.path.join(_DIR, "events.sock")
+_INDEX_EVERY = 256
+
+log = logging.getLogger(__name__)
+
+
+def _parse(line: bytes) -> dict | None:
+    """The event on a complete log line, or None if the line is corrupt."""
+    try:
+        event = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(event, dict) or not isinstance(event.get("offset"), int):
+        return None
+    return event
+
+
+class EventLog:
+    def __init__(self, path: str, index_every: int = _INDEX_EVERY):
+        self.path = path
+        self.index_every = index_every
+        self._cond = threading.Condition()
+        # Byte position of every Nth event, so read_from() seeks near its start
+        self._index_offsets: list[int] = []
+        self._index_positions: list[int] = []
+        self.next_offset = 0
+        self._recover()
+
+    def _recover(self) -> None:
+        """Scan the log, rebuild the index, and cut off a torn last line."""
+        if not os.path.isfile(self.path):
+            return
+        position = 0
+        torn = False
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    torn = True  # only the last line can lack its newline
+                    break
+                event = _parse(line)
+                if event is None or event["offset"] < self.next_offset:
+                    log.warning("Skipping corrupt event log record at byte %d of %s", position, self.path)
+                else:
+                    self._note(event["offset"], position)
+                    self.next_offset = event["offset"] + 1
+                position += len(line)
+        if torn:
+            with open(self.path, "r+b") as f:
+                f.truncate(position)
+
+    def _note(self, offset: int, position: int) -> None:
+        if offset % self.index_every == 0:
+            self._index_offsets.append(offset)
+            self._index_positions.append(position)
+
+    def append(self, event: dict) -> int:
+        """Append `event` and wake subscribers. Returns its offset."""
+        with self._cond:
+            offset = self.next_offset
+            line = json.dumps({"offset": offset, **event}, sort_keys=True) + "\n"
+            with open(self.path, "ab") as f:
+                position = f.tell()
+                f.write(line.encode())
+            self._note(offset, position)
+            self.next_offset = offset + 1
+            self._cond.notify_all()
+        return offset
+
+    def publish(self, repo: str, watch: str, old_version: str | None, new_version: str,
+                status: str, source: str, detected_at: float | None = None) -> int:
+        return self.append({
+            "repo": repo,
+            "watch": watch,
+            "old_version": old_version,
+            "new_version": new_version,
+            "status": status,
+            "source": source,
+            "detected_at": detected_at if detected_at is not None else time.time(),
+        })
+
+    def read_from(self, offset: int, limit: int | None = None) -> list[dict]:
+        """Events with offset >= `offset`, oldest first."""
+        with self._cond:
+            end = self.next_offset
+            i = bisect.bisect_right(self._index_offsets, offset) - 1
+            start = self._index_positions[i] if i >= 0 else 0
+        events = []
+        if offset >= end or not os.path.isfile(self.path):
+            return events
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                event = _parse(line)
+                if event is None:
+                    continue  # corrupt record, skipped (and logged) by _recover
+                if event["offset"] >= end:
+                    break  # appended after we looked; the caller will see it next time
+                if event["offset"] >= offset:
+                    events.append(event)
+                    if limit is not None and len(events) >= limit:
+                        break
+        return events
+
+    def wait(self, offset: int, timeout: float | None = None) -> bool:
+        """Block until an event with offset >= `offset` exists."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.next_offset > offset, timeout)
+
+    def wake_all(self) -> None:
+        with self._cond:
+            self._cond.notify_all()
+
+
+class EventServer:
+    """Serve an EventLog to subscribers over a Unix domain socket."""
+
+    def __init__(self, log: EventLog, path: str, poll_interval: float = 1.0):
+        self.log = log
+        self.path = path
+        self.poll_interval = poll_interval
+        self._closing = threading.Event()
+        self._server = None
+        self._thread = None
+
+    def start(self) -> "EventServer":
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                server._serve_subscriber(self.connection, self.rfile, self.wfile)
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # stale socket from an earlier run
+        self._server = socketserver.ThreadingUnixStreamServer(self.path, Handler)
+        self._server.daemon_threads = True
+        os.chmod(self.path, 0o600)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.1}, daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._closing.set()
+        self.log.wake_all()
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _serve_subscriber(self, conn, rfile, wfile) -> None:
+        try:
+            request = json.loads(rfile.readline() or b"{}")
+            cursor = request.get("from")
+            if cursor is None:
+                cursor = self.log.next_offset
+            if not isinstance(cursor, int) or isinstance(cursor, bool) or cursor < 0:
+                raise ValueError("'from' must be an offset >= 0")
+        except (ValueError, AttributeError) as e:
+            wfile.write((json.dumps({"error": str(e)}) + "\n").encode())
+            return
+        try:
+            while not self._closing.is_set():
+                for event in self.log.read_from(cursor, limit=1000):
+                    wfile.write((json.dumps(event, sort_keys=True) + "\n").encode())
+                    cursor = event["offset"] + 1
+                wfile.flush()
+                if not self.log.wait(cursor, timeout=self.poll_interval) and _peer_closed(conn):
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # subscriber went away
+
+
+def _peer_closed(conn: socket.socket) -> bool:
+    """Subscribers send nothing after their request, so readable means EOF."""
+    readable, _, _ = select.select([conn], [], [], 0)
+    return bool(readable) and not conn.recv(1, socket.MSG_PEEK)
+
+
+def subscribe(path: str, offset: int | None = None, timeout: float | None = None):
+    """Yield events from the server at `path`, starting at `offset`."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        request = {} if offset is None else {"from": offset}
+        sock.sendall((json.dumps(request) + "\n").encode())
+        with sock.makefile("rb") as f:
+            for line in f:
+                yield json.loads(line)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Follow the watcher's change events.")
+    parser.add_argument("--socket", default=SOCKET_PATH)
+    parser.add_argument("--from", dest="offset", type=int, default=None,
+                        help="first offset to receive (default: only new events)")
+    args = parser.parse_args(argv)
+    try:
+        for event in subscribe(args.socket, args.offset):
+            print(json.dumps(event), flush=True)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,138 @@
+"""Tag lookups over the git smart-HTTP protocol (an ls-remote without git).
+
+Tag watches only need ref names and SHAs, so instead of the rate-limited REST
+API this reads the `info/refs` ref advertisement that every git host serves to
+`git fetch`. The pkt-line stream is parsed as it arrives and only the best tag
+seen so far is kept, so large listings are never buffered.
+"""
+
+import hashlib
+
+import requests
+
+from github_client import GitHubAPIError, _TIMEOUT, api_error
+from versions import TagFilter
+
+
+_BASE_URL = "https://github.com"
+_SERVICE = "git-upload-pack"
+_ADVERTISEMENT_TYPE = f"application/x-{_SERVICE}-advertisement"
+_TAG_PREFIX = b"refs/tags/"
+_PEELED_SUFFIX = b"^{}"
+_CHUNK_SIZE = 16 * 1024
+
+
+def _iter_pkt_lines(chunks):
+    """Yield pkt-line payloads from an iterable of byte chunks.
+
+    A flush packet ("0000") is yielded as None.
+    """
+    buf = bytearray()
+    for chunk in chunks:
+        buf += chunk
+        pos = 0
+        while len(buf) - pos >= 4:
+            try:
+                length = int(buf[pos:pos + 4], 16)
+            except ValueError:
+                raise GitHubAPIError(502, "Malformed pkt-line in ref advertisement")
+            if length == 0:
+                pos += 4
+                yield None
+                continue
+            if length < 4:
+                raise GitHubAPIError(502, "Malformed pkt-line in ref advertisement")
+            if len(buf) - pos < length:
+                break
+            yield bytes(buf[pos + 4:pos + length])
+            pos += length
+        del buf[:pos]
+    if buf:
+        raise GitHubAPIError(502, "Truncated ref advertisement")
+
+
+class GitRefsClient:
+    def __init__(self, token: str | None = None, base_url: str = _BASE_URL):
+        self.token = token
+        self.base_url = base_url.rstrip("/")
+
+    def _build_headers(self) -> dict:
+        headers = {"Accept": _ADVERTISEMENT_TYPE, "User-Agent": "git/2.0 (github-menubar-watcher)"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def fetch_latest_tag(
+        self,
+        owner: str,
+        repo: str,
+        etag: str | None = None,
+        tag_filter: TagFilter | None = None,
+    ) -> dict | None:
+        """Return the highest-versioned tag from the ref advertisement.
+
+        The returned "etag" is a hash of the advertisement itself. When it
+        matches the `etag` passed in, nothing changed and None is returned,
+        mirroring a 304 from the REST client. With no qualifying tag, the
+        result is {"negative": "no_tags", "etag"}.
+        """
+        url = f"{self.base_url}/{owner}/{repo}.git/info/refs"
+        resp = requests.get(
+            url, headers=self._build_headers(), params={"service": _SERVICE},
+            timeout=_TIMEOUT, stream=True,
+        )
+        with resp:
+            if resp.status_code >= 400:
+                raise api_error(resp.status_code, resp.reason or "Unknown error")
+            content_type = resp.headers.get("Content-Type", "")
+            if not content_type.startswith(_ADVERTISEMENT_TYPE):
+                raise GitHubAPIError(
+                    resp.status_code, f"Not a smart-HTTP git server ({content_type or 'no content type'})"
+                )
+
+            digest = hashlib.sha1()
+
+            def chunks():
+                for chunk in resp.iter_content(chunk_size=_CHUNK_SIZE):
+                    digest.update(chunk)
+                    yield chunk
+
+            best = self._scan_advertisement(_iter_pkt_lines(chunks()), tag_filter or TagFilter())
+
+        adv_hash = f'"git-{digest.hexdigest()}"'
+        if adv_hash == etag:
+            return None
+        if best is None:
+            return {"negative": "no_tags", "etag": adv_hash}
+        return {"tag_name": best[1], "commit_sha": best[2], "etag": adv_hash}
+
+    @staticmethod
+    def _scan_advertisement(lines, tag_filter: TagFilter) -> tuple | None:
+        """Return (key, tag_name, commit_sha) of the newest tag, or None."""
+        best = None
+        section = 0  # 0: service header, 1: refs
+        for line in lines:
+            if line is None:
+                if section == 1:
+                    break
+                section = 1
+                continue
+            if line.startswith(b"ERR "):
+                raise GitHubAPIError(502, line[4:].decode(errors="replace").strip())
+            if section == 0:
+                continue
+            sha, _, ref = line.rstrip(b"\n").partition(b" ")
+            ref = ref.split(b"\0", 1)[0]  # first ref carries capabilities
+            if not ref.startswith(_TAG_PREFIX):
+                continue
+            if ref.endswith(_PEELED_SUFFIX):
+                # Annotated tag: the peeled line follows its tag and names the commit
+                name = ref[len(_TAG_PREFIX):-len(_PEELED_SUFFIX)].decode(errors="replace")
+                if best is not None and best[1] == name:
+                    best = (best[0], name, sha.decode())
+                continue
+            name = ref[len(_TAG_PREFIX):].decode(errors="replace")
+            key = tag_filter.rank(name)
+            if key is not None and (best is None or key > best[0]):
+                best = (key, name, sha.decode())
+        return best
@@ -1,10 +1,30 @@
 """GitHub API client with ETag caching and rate limit handling."""
 
+from urllib.parse import quote
+
 import requests
 
+from json_stream import ResponseTooLarge, extract_fields, iter_objects
+from profiling import span
+from versions import TagFilter
+
 
 _BASE_URL = "https://api.github.com"
 _TIMEOUT = 30  # seconds
+_TAGS_PER_PAGE = 100
+_EVENTS_PER_PAGE = 100
+_DEFAULT_POLL_INTERVAL = 60  # seconds, when X-Poll-Interval is missing
+_MAX_RESPONSE_BYTES = 10 * 1024 * 1024
+_CHUNK_SIZE = 16 * 1024
+
+# Only these fields are parsed out of each response body; see json_stream
+_TAG_FIELDS = {"name": True, "commit": {"sha": True}}
+_RELEASE_FIELDS = {"id": True, "tag_name": True, "name": True}
+_RELEASE_DETAIL_FIELDS = {
+    "tag_name": True, "name": True, "body": True, "published_at": True, "html_url": True,
+    "prerelease": True, "assets": [{"name": True, "size": True, "download_count": True}],
+}
+_EVENT_FIELDS = {"id": True, "type": True, "repo": {"name": True}, "payload": {"ref_type": True}}
 
 
 class GitHubAPIError(Exception):
@@ -13,6 +33,19 @@ class GitHubAPIError(Exception):
         super().__init__(f"GitHub API error {status_code}: {message}")
 
 
+class NotFoundError(GitHubAPIError):
+    """404: the repo does not exist (or is private), or has no releases."""
+
+    def __init__(self, message: str = "Not Found"):
+        super().__init__(404, message)
+
+
+def api_error(status_code: int, message: str) -> GitHubAPIError:
+    if status_code == 404:
+        return NotFoundError(message)
+    return GitHubAPIError(status_code, message)
+
+
 class RateLimitError(GitHubAPIError):
     def __init__(self, reset_timestamp: int | None = None, retry_after: int | None = None):
         self.reset_timestamp = reset_timestamp
@@ -20,9 +53,112 @@ class RateLimitError(GitHubAPIError):
         super().__init__(429, "Rate limited")
 
 
+def _rate_limit_error(status_code: int, headers) -> RateLimitError | None:
+    """Map a 403/429 response to a RateLimitError, if it is one."""
+    if status_code in (403, 429):
+        remaining = headers.get("X-RateLimit-Remaining")
+        if status_code == 429 or (remaining is not None and int(remaining) == 0):
+            reset_ts = headers.get("X-RateLimit-Reset")
+            retry_after = headers.get("Retry-After")
+            return RateLimitError(
+                reset_timestamp=int(reset_ts) if reset_ts else None,
+                retry_after=int(retry_after) if retry_after else None,
+            )
+    return None
+
+
+class _TagScan:
+    """Running state of a paged tag scan, shared by the sync and async clients."""
+
+    def __init__(
+        self,
+        known_tags: list[str] | None = None,
+        current: dict | None = None,
+        tag_filter: TagFilter | None = None,
+    ):
+        self.tag_filter = tag_filter or TagFilter()
+        self.known = set(known_tags or ())
+        self.best = None
+        self.current = None
+        self.current_seen = False
+        self.complete = False  # the last page of the listing was read
+        self.first_page: list[str] = []
+        self.first_etag = None
+        self.pages = 0
+        if current and current.get("tag_name"):
+            key = self.tag_filter.rank(current["tag_name"])
+            if key is not None:
+                self.current = (key, current["tag_name"], current.get("commit_sha"))
+
+    def feed(self, tags: list[dict], etag: str | None = None) -> bool:
+        """Rank one page of tags. Returns True if the next page is worth fetching."""
+        self.pages += 1
+        if self.pages == 1:
+            self.first_page = [t["name"] for t in tags]
+            self.first_etag = etag
+
+        passed_known = False
+        for tag in tags:
+            # Known tags only end the paging; they are still ranked, so a
+            # force-moved current tag shows up through its new sha
+            passed_known = passed_known or tag["name"] in self.known
+            if self.current and tag["name"] == self.current[1]:
+                self.current_seen = True
+            key = self.tag_filter.rank(tag["name"])
+            if key is not None and (self.best is None or key > self.best[0]):
+                self.best = (key, tag["name"], tag["commit"]["sha"])
+        self.complete = len(tags) < _TAGS_PER_PAGE
+        return not passed_known and not self.complete
+
+    def result(self) -> dict:
+        if self.current and not self.current_seen and not self.complete:
+            # Not on the pages read, but it may be on one we skipped
+            if self.best is None or self.current[0] > self.best[0]:
+                self.best = self.current
+        if self.best is None:
+            # Nothing (matching) is tagged yet; the ETag makes the next look a 304
+            return {"negative": "no_tags", "etag": self.first_etag}
+        return {
+            "tag_name": self.best[1],
+            "commit_sha": self.best[2],
+            "etag": self.first_etag,
+            "known_tags": self.first_page,
+            "requests": self.pages,
+        }
+
+
 class GitHubClient:
-    def __init__(self, token: str | None = None):
+    def __init__(self, token: str | None = None, base_url: str | None = None,
+                 max_response_bytes: int = _MAX_RESPONSE_BYTES):
         self.token = token
+        self.base_url = (base_url or _BASE_URL).rstrip("/")
+        self.max_response_bytes = max_response_bytes
+        self.request_count = 0
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        self.request_count += 1
+        # DNS, connect/TLS and the response headers land in this span; the body
+        # is streamed later, inside "json_decode". The cProfile dump splits
+        # them further (getaddrinfo, do_handshake, recv)
+        with span("http"):
+            return requests.get(url, timeout=_TIMEOUT, stream=True, **kwargs)
+
+    def _read_json(self, resp: requests.Response, spec: dict, array: bool = False):
+        """The `spec` fields of the body: a dict, or a list of dicts if `array`.
+
+        The body is read only as far as needed, and never past
+        `max_response_bytes`.
+        """
+        chunks = resp.iter_content(chunk_size=_CHUNK_SIZE)
+        try:
+            with span("json_decode"):
+                if array:
+                    return list(iter_objects(chunks, spec, self.max_response_bytes))
+                return extract_fields(chunks, spec, self.max_response_bytes)
+        except ResponseTooLarge as e:
+            raise GitHubAPIError(resp.status_code, str(e)) from None
+        finally:
+            resp.close()
 
     def _build_headers(self, etag: str | None = None) -> dict:
         headers = {
@@ -36,15 +172,9 @@ class GitHubClient:
         return headers
 
     def _check_rate_limit(self, resp: requests.Response) -> None:
-        if resp.status_code in (403, 429):
-            remaining = resp.headers.get("X-RateLimit-Remaining")
-            if resp.status_code == 429 or (remaining is not None and int(remaining) == 0):
-                reset_ts = resp.headers.get("X-RateLimit-Reset")
-                retry_after = resp.headers.get("Retry-After")
-                raise RateLimitError(
-                    reset_timestamp=int(reset_ts) if reset_ts else None,
-                    retry_after=int(retry_after) if retry_after else None,
-                )
+        error = _rate_limit_error(resp.status_code, resp.headers)
+        if error is not None:
+            raise error
 
     def _check_error(self, resp: requests.Response) -> None:
         if resp.status_code >= 400:
@@ -54,23 +184,22 @@ class GitHubClient:
                     msg = resp.json().get("message", "Unknown error")
                 except (ValueError, KeyError):
                     msg = resp.text[:200] or "Unknown error"
-            raise GitHubAPIError(resp.status_code, msg)
+            raise api_error(resp.status_code, msg)
 
     def fetch_latest_tag(
         self, owner: str, repo: str, etag: str | None = None
     ) -> dict | None:
-        url = f"{_BASE_URL}/repos/{owner}/{repo}/tags"
-        resp = requests.get(
-            url, headers=self._build_headers(etag), params={"per_page": 1}, timeout=_TIMEOUT,
-        )
+        url = f"{self.base_url}/repos/{owner}/{repo}/tags"
+        resp = self._get(url, headers=self._build_headers(etag), params={"per_page": 1})
 
         if resp.status_code == 304:
+            resp.close()
             return None
 
         self._check_rate_limit(resp)
         self._check_error(resp)
 
-        tags = resp.json()
+        tags = self._read_json(resp, _TAG_FIELDS, array=True)
         if not tags:
             return None
 
@@ -80,22 +209,144 @@ class GitHubClient:
             "etag": resp.headers.get("ETag"),
         }
 
+    def scan_tags(
+        self,
+        owner: str,
+        repo: str,
+        etag: str | None = None,
+        known_tags: list[str] | None = None,
+        current: dict | None = None,
+        tag_filter: TagFilter | None = None,
+        max_pages: int = 3,
+    ) -> dict | None:
+        """Page through tags and return the highest-versioned one.
+
+        The tag listing is not in version order, so every tag on a page is
+        ranked. Paging stops at the first page that contains a tag from
+        `known_tags` (the previous scan's first page), at the last page, or
+        after `max_pages`. `current` ({"tag_name", "commit_sha"}) is kept if no
+        scanned tag outranks it and paging stopped before the last page; if
+        the whole listing was read without it, it was deleted. Returns None on
+        304, and
+        {"negative": "no_tags", "etag"} when no tag qualifies.
+        """
+        scan = _TagScan(known_tags, current, tag_filter)
+        url = f"{self.base_url}/repos/{owner}/{repo}/tags"
+        for page in range(1, max_pages + 1):
+            resp = self._get(
+                url,
+                headers=self._build_headers(etag if page == 1 else None),
+                params={"per_page": _TAGS_PER_PAGE, "page": page},
+            )
+            if resp.status_code == 304:
+                resp.close()
+                return None
+
+            self._check_rate_limit(resp)
+            self._check_error(resp)
+
+            tags = self._read_json(resp, _TAG_FIELDS, array=True)
+            if not scan.feed(tags, resp.headers.get("ETag")):
+                break
+        return scan.result()
+
     def fetch_latest_release(
         self, owner: str, repo: str, etag: str | None = None
     ) -> dict | None:
-        url = f"{_BASE_URL}/repos/{owner}/{repo}/releases/latest"
-        resp = requests.get(url, headers=self._build_headers(etag), timeout=_TIMEOUT)
+        url = f"{self.base_url}/repos/{owner}/{repo}/releases/latest"
+        resp = self._get(url, headers=self._build_headers(etag))
 
         if resp.status_code == 304:
+            resp.close()
             return None
 
         self._check_rate_limit(resp)
         self._check_error(resp)
 
-        data = resp.json()
+        data = self._read_json(resp, _RELEASE_FIELDS)
         return {
             "release_id": data["id"],
             "tag_name": data["tag_name"],
             "release_name": data.get("name", ""),
             "etag": resp.headers.get("ETag"),
         }
+
+    def fetch_release_details(
+        self, owner: str, repo: str, tag: str, etag: str | None = None
+    ) -> dict | None:
+        """Notes, assets and dates of the release for `tag`, or None on 304.
+
+        Kept off the check path, which only needs the release id and tag.
+        """
+        url = f"{self.base_url}/repos/{owner}/{repo}/releases/tags/{quote(tag, safe='')}"
+        resp = self._get(url, headers=self._build_headers(etag))
+
+        if resp.status_code == 304:
+            resp.close()
+            return None
+
+        self._check_rate_limit(resp)
+        self._check_error(resp)
+
+        data = self._read_json(resp, _RELEASE_DETAIL_FIELDS)
+        return {
+            "tag_name": data["tag_name"],
+            "name": data.get("name") or data["tag_name"],
+            "body": data.get("body") or "",
+            "published_at": data.get("published_at"),
+            "html_url": data.get("html_url"),
+            "prerelease": data.get("prerelease", False),
+            "assets": [
+                {
+                    "name": a["name"],
+                    "size": a.get("size", 0),
+                    "download_count": a.get("download_count", 0),
+                }
+                for a in data.get("assets", [])
+            ],
+            "etag": resp.headers.get("ETag"),
+        }
+
+    def fetch_org_events(
+        self, org: str, etag: str | None = None, since_id: int | None = None, max_pages: int = 3
+    ) -> dict | None:
+        """Events newer than `since_id` from an org's public feed, newest first.
+
+        Returns None on 304. "gap" is True when new events were found but
+        `since_id` was not reached within `max_pages` or the feed's retention,
+        so some events in between may be missing.
+        """
+        url = f"{self.base_url}/orgs/{org}/events"
+        events = []
+        first_etag, poll_interval = None, _DEFAULT_POLL_INTERVAL
+        reached = False
+        for page in range(1, max_pages + 1):
+            resp = self._get(
+                url,
+                headers=self._build_headers(etag if page == 1 else None),
+                params={"per_page": _EVENTS_PER_PAGE, "page": page},
+            )
+            if resp.status_code == 304:
+                resp.close()
+                return None
+
+            self._check_rate_limit(resp)
+            self._check_error(resp)
+
+            if page == 1:
+                first_etag = resp.headers.get("ETag")
+                poll_interval = int(resp.headers.get("X-Poll-Interval", _DEFAULT_POLL_INTERVAL))
+            batch = self._read_json(resp, _EVENT_FIELDS, array=True)
+            for event in batch:
+                if since_id is not None and int(event["id"]) <= since_id:
+                    reached = True
+                    break
+                events.append(event)
+            if reached or len(batch) < _EVENTS_PER_PAGE:
+                break
+        return {
+            "events": events,
+            "etag": first_etag,
+            "poll_interval": poll_interval,
+            "gap": since_id is not None and not reached and bool(events),
+        }
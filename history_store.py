@@ -0,0 +1,265 @@
+"""Append-only log of version transitions with a sparse time index.
+
+Each transition is one tab-separated line ("<epoch>\\t<repo>\\t<version>\\t<source>")
+appended in time order. Every Nth entry's timestamp and byte offset is also
+appended to a sidecar ".idx" file, so range queries bisect the index and read
+only the tail of the log they need, however large it grows.
+
+Compaction rewrites the whole log, so `compact_if_needed` first estimates from
+the index alone how many entries it would drop or roll up, and a ".compacted"
+sidecar remembers how far the log is already rolled up.
+"""
+
+import argparse
+import bisect
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_PATH = os.path.join(_DIR, "history.log")
+_INDEX_EVERY = 256
+_COMPACT_MIN_BLOCKS = 4  # compact once ~4 index blocks of entries are reclaimable
+
+
+def _clean(value: str) -> str:
+    return str(value).replace("\t", " ").replace("\n", " ")
+
+
+def _parse_line(line: bytes) -> dict | None:
+    parts = line.rstrip(b"\n").decode(errors="replace").split("\t")
+    if len(parts) != 4:
+        return None
+    try:
+        ts = float(parts[0])
+    except ValueError:
+        return None
+    return {"detected_at": ts, "repo": parts[1], "version": parts[2], "source": parts[3]}
+
+
+class HistoryStore:
+    def __init__(self, path: str, index_every: int = _INDEX_EVERY):
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self.compacted_path = f"{path}.compacted"
+        self.index_every = index_every
+        self._lock = threading.Lock()
+        self._index_ts: list[float] = []
+        self._index_offsets: list[int] = []
+        self._since_index = 0
+        self._last_ts = 0.0
+        self._load_index()
+
+    def _load_index(self) -> None:
+        size = os.path.getsize(self.path) if os.path.isfile(self.path) else 0
+        if os.path.isfile(self.index_path):
+            with open(self.index_path) as f:
+                for line in f:
+                    ts, _, offset = line.strip().partition("\t")
+                    try:
+                        ts, offset = float(ts), int(offset)
+                    except ValueError:
+                        break
+                    if offset >= size:
+                        break
+                    self._index_ts.append(ts)
+                    self._index_offsets.append(offset)
+            if len(self._index_offsets) and not self._offsets_consistent():
+                self._index_ts, self._index_offsets = [], []
+
+        start = self._index_offsets[-1] if self._index_offsets else 0
+        rebuild = not self._index_offsets and size > 0
+        # Count entries after the last index point (or everything, if rebuilding)
+        count = 0
+        for offset, entry in self._scan(start):
+            if rebuild and count % self.index_every == 0:
+                self._index_ts.append(entry["detected_at"])
+                self._index_offsets.append(offset)
+            count += 1
+            self._last_ts = entry["detected_at"]
+        self._since_index = count % self.index_every if rebuild else count
+        if rebuild:
+            self._write_index()
+
+    def _offsets_consistent(self) -> bool:
+        """The last index point must sit at the start of a line in the log."""
+        offset = self._index_offsets[-1]
+        if offset == 0:
+            return True
+        with open(self.path, "rb") as f:
+            f.seek(offset - 1)
+            return f.read(1) == b"\n"
+
+    def _write_index(self) -> None:
+        with open(self.index_path, "w") as f:
+            for ts, offset in zip(self._index_ts, self._index_offsets):
+                f.write(f"{ts:.3f}\t{offset}\n")
+
+    def _write_rolled_up_before(self, ts: float) -> None:
+        with open(self.compacted_path, "w") as f:
+            f.write(f"{ts:.3f}\n")
+
+    def _scan(self, offset: int = 0):
+        """Yield (offset, entry) for each complete line from `offset` on."""
+        if not os.path.isfile(self.path):
+            return
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partial line from a concurrent append
+                entry = _parse_line(line)
+                if entry is not None:
+                    yield offset, entry
+                offset += len(line)
+
+    def record(
+        self, repo: str, version: str, source: str, detected_at: float | None = None
+    ) -> None:
+        """Append a version transition. Timestamps never go backwards."""
+        with self._lock:
+            ts = max(detected_at if detected_at is not None else time.time(), self._last_ts)
+            line = f"{ts:.3f}\t{_clean(repo)}\t{_clean(version)}\t{_clean(source)}\n"
+            with open(self.path, "ab") as f:
+                offset = f.tell()
+                f.write(line.encode())
+            self._last_ts = ts
+            if self._since_index == 0 or self._since_index >= self.index_every:
+                self._index_ts.append(ts)
+                self._index_offsets.append(offset)
+                with open(self.index_path, "a") as f:
+                    f.write(f"{ts:.3f}\t{offset}\n")
+                self._since_index = 0
+            self._since_index += 1
+
+    def range(self, start: float, end: float | None = None, repo: str | None = None) -> list[dict]:
+        """Return entries with start <= detected_at <= end, oldest first."""
+        i = bisect.bisect_left(self._index_ts, start) - 1
+        offset = self._index_offsets[i] if i >= 0 else 0
+        results = []
+        for _, entry in self._scan(offset):
+            ts = entry["detected_at"]
+            if end is not None and ts > end:
+                break
+            if ts < start or (repo is not None and entry["repo"] != repo):
+                continue
+            results.append(entry)
+        return results
+
+    def recent(self, hours: float = 24, repo: str | None = None) -> list[dict]:
+        """Return entries from the last `hours`, newest first."""
+        return list(reversed(self.range(time.time() - hours * 3600, repo=repo)))
+
+    def _blocks_between(self, lo: float, hi: float) -> int:
+        """Index blocks (of `index_every` entries) lying wholly in [lo, hi)."""
+        ts = self._index_ts
+        return max(0, bisect.bisect_left(ts, hi) - bisect.bisect_left(ts, lo) - 1)
+
+    def _rolled_up_before(self) -> float:
+        try:
+            with open(self.compacted_path) as f:
+                return float(f.read().strip())
+        except (OSError, ValueError):
+            return 0.0
+
+    def needs_compaction(
+        self, retention_days: float, rollup_after_days: float, now: float | None = None,
+        min_blocks: int = _COMPACT_MIN_BLOCKS,
+    ) -> bool:
+        """Whether at least `min_blocks` index blocks of entries are due to be
+        dropped, or rolled up for the first time. Reads only the index."""
+        now = time.time() if now is None else now
+        drop_before = now - retention_days * 86400
+        rollup_before = now - rollup_after_days * 86400
+        due = self._blocks_between(0, drop_before) + self._blocks_between(
+            max(self._rolled_up_before(), drop_before), rollup_before,
+        )
+        return due >= min_blocks
+
+    def compact_if_needed(
+        self, retention_days: float, rollup_after_days: float, now: float | None = None,
+    ) -> dict | None:
+        """compact(), if `needs_compaction` says it is worth a rewrite."""
+        if not self.needs_compaction(retention_days, rollup_after_days, now):
+            return None
+        return self.compact(retention_days, rollup_after_days, now)
+
+    def compact(
+        self, retention_days: float, rollup_after_days: float, now: float | None = None
+    ) -> dict:
+        """Apply the retention/rollup policy by rewriting the log.
+
+        Entries older than `retention_days` are dropped. Entries older than
+        `rollup_after_days` are reduced to the last transition per repo per
+        UTC day. Newer entries are kept as-is.
+        """
+        now = time.time() if now is None else now
+        drop_before = now - retention_days * 86400
+        rollup_before = now - rollup_after_days * 86400
+        with self._lock:
+            kept, dropped, rolled = [], 0, 0
+            rollup: dict[tuple, dict] = {}
+            for _, entry in self._scan():
+                ts = entry["detected_at"]
+                if ts < drop_before:
+                    dropped += 1
+                elif ts < rollup_before:
+                    day = datetime.fromtimestamp(ts, tz=timezone.utc).date()
+                    slot = (entry["repo"], day)
+                    if slot in rollup:
+                        rolled += 1
+                    else:
+                        kept.append(slot)
+                    rollup[slot] = entry
+                else:
+                    kept.append(entry)
+            if not dropped and not rolled:
+                self._write_rolled_up_before(rollup_before)
+                return {"kept": len(kept), "dropped": 0, "rolled_up": 0}
+            # A rolled-up day keeps its last entry, so restore time order
+            entries = [rollup[item] if isinstance(item, tuple) else item for item in kept]
+            entries.sort(key=lambda e: e["detected_at"])
+
+            dir_name = os.path.dirname(self.path) or "."
+            fd, tmp_path = tempfile.mkstemp(dir=dir_name, suffix=".tmp")
+            # Built aside: range() reads the index without the lock
+            index_ts, index_offsets = [], []
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    for n, entry in enumerate(entries):
+                        if n % self.index_every == 0:
+                            index_ts.append(entry["detected_at"])
+                            index_offsets.append(f.tell())
+                        f.write((
+                            f"{entry['detected_at']:.3f}\t{entry['repo']}\t"
+                            f"{entry['version']}\t{entry['source']}\n"
+                        ).encode())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            self._index_ts, self._index_offsets = index_ts, index_offsets
+            self._write_index()
+            self._write_rolled_up_before(rollup_before)
+            self._since_index = len(entries) % self.index_every
+            return {"kept": len(entries), "dropped": dropped, "rolled_up": rolled}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Show recent version changes.")
+    parser.add_argument("--hours", type=float, default=24, help="look back this many hours")
+    parser.add_argument("--repo", help="only show this owner/repo")
+    parser.add_argument("--path", default=HISTORY_PATH, help="history log path")
+    args = parser.parse_args(argv)
+
+    for entry in HistoryStore(args.path).recent(args.hours, repo=args.repo):
+        dt = datetime.fromtimestamp(entry["detected_at"], tz=timezone.utc)
+        print(f"{dt.strftime('%Y-%m-%d %H:%M UTC')}  {entry['repo']}  {entry['version']}  ({entry['source']})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,241 @@
+"""Incremental, field-selective JSON extraction from a stream of byte chunks.
+
+The API answers with far more than the watcher reads: a release carries its
+full notes and asset list, and an org event carries its whole payload. Here the
+body is scanned chunk by chunk. In a top-level object, values of unwanted
+fields are skipped with regexes, without building Python objects, and parsing
+stops as soon as every wanted field has been seen, so the rest of the body is
+never read. Elements of arrays are decoded one at a time and trimmed to the
+spec, so memory follows the largest element rather than the whole body.
+
+A spec says what to keep:
+
+    {"id": True, "commit": {"sha": True}, "assets": [{"name": True}]}
+
+`True` keeps the whole value. A dict descends into an object. A one-item list
+applies its spec to every object in an array.
+"""
+
+import codecs
+import json
+import re
+
+
+_WS = re.compile(r"[ \t\n\r]*")
+# The inside of a string up to its closing quote, or up to the end of the
+# buffer. It never fails, so a string cut off mid-chunk is never backtracked over.
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_SCALAR = re.compile(r"-?[0-9][0-9.eE+\-]*|true|false|null")
+_TOKEN = re.compile(r"[^,:{}\[\]\" \t\n\r]*")
+# A run of anything but brackets, taking whole strings in one go. It stops at
+# a bracket, at a string cut off by the end of the buffer, or at the end.
+_CONTAINER_BODY = re.compile(r'[^"{}\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"{}\[\]]*)*')
+# Fast path for the common key without escapes: "name" :
+_PLAIN_KEY = re.compile(r'[ \t\n\r]*"([^"\\]*)"[ \t\n\r]*:')
+
+
+class ResponseTooLarge(ValueError):
+    def __init__(self, limit: int):
+        self.limit = limit
+        super().__init__(f"Response body exceeds {limit} bytes")
+
+
+_DECODER = json.JSONDecoder()
+
+
+class _Reader:
+    """A text buffer over the chunk stream. Text before `pos` is discarded as
+    more arrives."""
+
+    def __init__(self, chunks, max_bytes: int | None = None):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.buf = ""
+        self.pos = 0
+
+    def _read_chunk(self) -> bool:
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            return False
+        self.bytes_read += len(chunk)
+        if self.max_bytes is not None and self.bytes_read > self.max_bytes:
+            raise ResponseTooLarge(self.max_bytes)
+        self.buf = self.buf[self.pos:] + self._decoder.decode(chunk)
+        self.pos = 0
+        return True
+
+    def more(self) -> None:
+        if not self._read_chunk():
+            raise ValueError("Unexpected end of JSON body")
+
+    def peek(self) -> str:
+        """The next non-whitespace character, without consuming it."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            self.more()
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at byte ~{self.bytes_read}, got {self.buf[self.pos]!r}")
+        self.pos += 1
+
+    def _string_end(self) -> int:
+        """Index just past the string that starts at `pos`."""
+        end = self.pos + 1
+        while True:
+            end = _STRING_BODY.match(self.buf, end).end()
+            if end < len(self.buf) and self.buf[end] == '"':
+                return end + 1
+            # Cut off by the end of the buffer: resume scanning where we stopped
+            pos = self.pos
+            self.more()
+            end -= pos - self.pos
+
+    def _read_scalar(self) -> str:
+        # A scalar running into the end of the buffer may continue in the next chunk
+        while True:
+            end = _TOKEN.match(self.buf, self.pos).end()
+            if end < len(self.buf):
+                break
+            self.more()
+        token = self.buf[self.pos:end]
+        if not _SCALAR.fullmatch(token):
+            raise ValueError(f"Invalid JSON value {token[:20]!r} at byte ~{self.bytes_read}")
+        self.pos = end
+        return token
+
+    def read_key(self) -> str:
+        m = _PLAIN_KEY.match(self.buf, self.pos)
+        if m is not None:
+            self.pos = m.end()
+            return m.group(1)
+        key = self.read_string()  # escapes, or cut off by the end of the buffer
+        self.expect(":")
+        return key
+
+    def read_string(self) -> str:
+        if self.peek() != '"':
+            raise ValueError(f"Expected a string at byte ~{self.bytes_read}")
+        end = self._string_end()  # may shift the buffer, so read pos after
+        text, self.pos = self.buf[self.pos:end], end
+        return json.loads(text)
+
+    def skip_value(self) -> None:
+        char = self.peek()
+        if char == '"':
+            self.pos = self._string_end()
+        elif char in "{[":
+            self._skip_container()
+        else:
+            self._read_scalar()
+
+    def _skip_container(self) -> None:
+        # Python only sees the brackets; strings and scalars are run over by the regex
+        depth = 0
+        while True:
+            self.pos = _CONTAINER_BODY.match(self.buf, self.pos).end()
+            if self.pos == len(self.buf):
+                self.more()
+                continue
+            if self.buf[self.pos] == '"':  # a string cut off by the end of the buffer
+                self.pos = self._string_end()
+                continue
+            depth += 1 if self.buf[self.pos] in "{[" else -1
+            self.pos += 1
+            if depth == 0:
+                return
+
+    def read_value(self):
+        """Parse one whole value."""
+        char = self.peek()
+        if char == '"':
+            return self.read_string()
+        if char not in "{[":
+            return json.loads(self._read_scalar())
+        while True:
+            # A container parsed in C is only complete once its closing bracket
+            # is in the buffer, so a failure here usually means "read more"
+            try:
+                value, self.pos = _DECODER.raw_decode(self.buf, self.pos)
+                return value
+            except json.JSONDecodeError:
+                # At least double what's buffered before retrying, so a value
+                # spanning many chunks is re-parsed O(log n) times, not O(n)
+                want = 2 * (len(self.buf) - self.pos)
+                if not self._read_chunk():
+                    raise
+                while len(self.buf) - self.pos < want and self._read_chunk():
+                    pass
+
+
+def _read(reader: _Reader, spec):
+    if spec is True:
+        return reader.read_value()
+    char = reader.peek()
+    if isinstance(spec, dict) and char == "{":
+        return _read_object(reader, spec)
+    if isinstance(spec, list) and char == "[":
+        return list(_iter_array(reader, spec[0]))
+    return reader.read_value()  # shape differs from the spec (e.g. null): keep as is
+
+
+def _read_object(reader: _Reader, spec: dict, stop_early: bool = False) -> dict:
+    reader.expect("{")
+    out = {}
+    if reader.peek() == "}":
+        reader.pos += 1
+        return out
+    while True:
+        key = reader.read_key()
+        if key in spec:
+            out[key] = _read(reader, spec[key])
+            if stop_early and len(out) == len(spec):
+                return out
+        else:
+            reader.skip_value()
+        char = reader.peek()
+        reader.pos += 1
+        if char == "}":
+            return out
+        if char != ",":
+            raise ValueError(f"Expected ',' or '}}' at byte ~{reader.bytes_read}")
+
+
+def _project(value, spec):
+    if isinstance(spec, dict) and isinstance(value, dict):
+        return {key: _project(value[key], sub) for key, sub in spec.items() if key in value}
+    if isinstance(spec, list) and isinstance(value, list):
+        return [_project(item, spec[0]) for item in value]
+    return value
+
+
+def _iter_array(reader: _Reader, spec):
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        # Elements are small next to the array; one C-speed json.loads of each
+        # beats walking its keys in Python, and only one is held at a time
+        yield _project(reader.read_value(), spec)
+        char = reader.peek()
+        reader.pos += 1
+        if char == "]":
+            return
+        if char != ",":
+            raise ValueError(f"Expected ',' or ']' at byte ~{reader.bytes_read}")
+
+
+def extract_fields(chunks, spec: dict, max_bytes: int | None = None) -> dict:
+    """Wanted fields of a top-level JSON object. Reading stops once all of
+    `spec`'s top-level keys are found; missing keys are simply absent."""
+    return _read_object(_Reader(chunks, max_bytes), spec, stop_early=True)
+
+
+def iter_objects(chunks, spec: dict, max_bytes: int | None = None):
+    """Wanted fields of each object in a top-level JSON array."""
+    return _iter_array(_Reader(chunks, max_bytes), spec)
@@ -0,0 +1,183 @@
+"""Opt-in per-cycle profiling: cProfile stats, tracemalloc top allocations,
+and per-phase timing spans.
+
+Enable with the GHMW_PROFILE environment variable (GHMW_PROFILE=5 samples every
+5th cycle) or the "profiling" block in config.json. Each sampled cycle writes
+a directory under the profile dir holding `cprofile.prof` (load it with pstats
+or snakeviz), `cprofile.txt`, `tracemalloc.txt` and `spans.json`. Only the
+newest `keep` cycle directories are kept.
+
+Code marks phases with `with span("state_save"):`. Outside a sampled cycle,
+`span()` returns a shared no-op, so instrumented hot paths cost almost nothing.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import shutil
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+ENV_VAR = "GHMW_PROFILE"
+
+_active = None  # the CycleProfile being sampled, if any
+_active_lock = threading.Lock()
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    def __init__(self, cycle: "CycleProfile", name: str):
+        self.cycle = cycle
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.cycle.add_span(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def span(name: str):
+    """Time a phase of the current sampled cycle (from any thread)."""
+    cycle = _active
+    if cycle is None:
+        return _NOOP
+    return _Span(cycle, name)
+
+
+class CycleProfile:
+    def __init__(self, path: str):
+        self.path = path
+        self.spans: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def add_span(self, name: str, seconds: float) -> None:
+        with self._lock:
+            entry = self.spans.setdefault(name, {"count": 0, "total_s": 0.0, "max_s": 0.0})
+            entry["count"] += 1
+            entry["total_s"] += seconds
+            entry["max_s"] = max(entry["max_s"], seconds)
+
+    def write_spans(self) -> None:
+        with self._lock:
+            data = {name: dict(v) for name, v in sorted(self.spans.items())}
+        with open(os.path.join(self.path, "spans.json"), "w") as f:
+            json.dump(data, f, indent=2)
+
+
+class CycleProfiler:
+    def __init__(self, directory: str, every_n_cycles: int = 10, keep: int = 20, top: int = 25):
+        self.directory = directory
+        self.every_n_cycles = every_n_cycles
+        self.keep = keep
+        self.top = top
+        self.cycles_seen = 0
+        self.last: CycleProfile | None = None
+
+    @classmethod
+    def from_config(cls, config: dict, base_dir: str) -> "CycleProfiler | None":
+        """Build a profiler if enabled by GHMW_PROFILE or config, else None."""
+        cfg = config.get("profiling") or {}
+        every_n = cfg.get("every_n_cycles", 10) if cfg.get("enabled") else None
+        env = os.environ.get(ENV_VAR, "").strip()
+        if env:
+            try:
+                every_n = int(env) or None  # GHMW_PROFILE=0 turns profiling off
+            except ValueError:
+                every_n = every_n or 1
+        if not every_n:
+            return None
+        directory = os.path.join(base_dir, cfg.get("dir", "profiles"))
+        return cls(directory, every_n_cycles=every_n, keep=cfg.get("keep", 20), top=cfg.get("top", 25))
+
+    @contextmanager
+    def cycle(self):
+        """Profile the enclosed cycle if it is one of every Nth."""
+        global _active
+        self.cycles_seen += 1
+        if (self.cycles_seen - 1) % self.every_n_cycles:
+            yield None
+            return
+
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        profile = CycleProfile(os.path.join(self.directory, f"cycle-{stamp}-{self.cycles_seen:06d}"))
+        os.makedirs(profile.path, exist_ok=True)
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        profiler = cProfile.Profile()
+        with _active_lock:
+            _active = profile
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            yield profile
+        finally:
+            profiler.disable()
+            profile.add_span("cycle", time.perf_counter() - start)
+            with _active_lock:
+                _active = None
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            self._dump(profile, profiler, snapshot, current, peak)
+            self.last = profile
+            self._rotate()
+
+    def late_span(self, name: str):
+        """Time work that belongs to the last sampled cycle but runs after it,
+        such as the UI update dispatched to the main thread."""
+        profile = self.last
+        if profile is None:
+            return _NOOP
+        return _LateSpan(self, profile, name)
+
+    def _dump(self, profile, profiler, snapshot, current, peak) -> None:
+        profiler.dump_stats(os.path.join(profile.path, "cprofile.prof"))
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(self.top)
+        with open(os.path.join(profile.path, "cprofile.txt"), "w") as f:
+            f.write(out.getvalue())
+
+        with open(os.path.join(profile.path, "tracemalloc.txt"), "w") as f:
+            f.write(f"current: {current / 1024:.1f} KiB  peak: {peak / 1024:.1f} KiB\n\n")
+            for stat in snapshot.statistics("lineno")[:self.top]:
+                f.write(f"{stat}\n")
+        profile.write_spans()
+
+    def _rotate(self) -> None:
+        dirs = sorted(d for d in os.listdir(self.directory) if d.startswith("cycle-"))
+        for name in dirs[:-self.keep] if self.keep else []:
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+
+class _LateSpan(_Span):
+    def __init__(self, profiler: CycleProfiler, cycle: CycleProfile, name: str):
+        super().__init__(cycle, name)
+        self.profiler = profiler
+
+    def __exit__(self, *exc):
+        super().__exit__(*exc)
+        self.profiler.last = None  # one late span per sampled cycle
+        if os.path.isdir(self.cycle.path):
+            self.cycle.write_spans()
+        return False
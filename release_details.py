@@ -0,0 +1,101 @@
+"""Lazily fetched release details (notes, assets, dates) in a bounded LRU cache.
+
+Check cycles only record the latest release's id and tag. The larger details
+payload is fetched when the user asks for it, then cached by approximate size
+rather than entry count, since release notes range from a line to hundreds of
+KB. After `ttl` seconds an entry is revalidated with its ETag, so a repeat view
+usually costs one 304 and no rate limit quota.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Entry:
+    def __init__(self, details: dict, size: int, fetched_at: float):
+        self.details = details
+        self.size = size
+        self.fetched_at = fetched_at
+
+
+class ReleaseDetailsCache:
+    def __init__(self, client, max_bytes: int = 2_000_000, ttl: float = 300, clock=time.monotonic):
+        self.client = client
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self.size = 0
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "evicted": 0}
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, owner: str, repo: str, tag: str) -> dict:
+        """Details for the release of `tag`. Raises GitHubAPIError."""
+        key = (owner, repo, tag)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if self.clock() - entry.fetched_at < self.ttl:
+                    self.stats["hits"] += 1
+                    return entry.details
+
+        # Network I/O happens outside the lock
+        details = self.client.fetch_release_details(
+            owner, repo, tag, etag=entry.details.get("etag") if entry else None,
+        )
+        with self._lock:
+            if details is None:  # 304: the cached copy is still current
+                self.stats["revalidated"] += 1
+                entry.fetched_at = self.clock()
+                return entry.details
+            self.stats["misses"] += 1
+            self._store(key, details)
+        return details
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, key: tuple, details: dict) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= old.size
+        size = len(json.dumps(details))
+        if size > self.max_bytes:
+            return  # would evict everything else; serve it uncached
+        self._entries[key] = _Entry(details, size, self.clock())
+        self.size += size
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+            self.stats["evicted"] += 1
+
+
+def summarize(details: dict, max_notes: int = 1500) -> str:
+    """Plain-text summary for an alert dialog."""
+    lines = []
+    if details.get("published_at"):
+        lines.append(f"Published {details['published_at'][:10]}"
+                     + (" (pre-release)" if details.get("prerelease") else ""))
+    notes = details.get("body", "").strip()
+    if notes:
+        if len(notes) > max_notes:
+            notes = notes[:max_notes].rstrip() + "…"
+        lines += ["", notes]
+    assets = details.get("assets", [])
+    if assets:
+        lines += ["", f"Assets ({len(assets)}):"]
+        lines += [f"  {a['name']} ({_human_size(a['size'])})" for a in assets[:10]]
+        if len(assets) > 10:
+            lines.append(f"  … and {len(assets) - 10} more")
+    return "\n".join(lines) or "No release notes."
+
+
+def _human_size(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
@@ -0,0 +1,158 @@
+"""Single-thread scheduler for every timed event in the app.
+
+Deadlines are kept in wall-clock time and checked against the monotonic clock,
+which stops while the machine sleeps. When the two drift apart by more than
+`jump_threshold`, the machine was suspended (or the clock was changed). Then
+overdue events are not fired in a burst: recurring events fire once, not once
+per missed interval; catch-up work is spread out after wake; and events
+marked `skip_if_late` (such as the pre-check flash) are dropped.
+
+Both clocks are injectable, and `run_pending()` can be driven directly, so the
+scheduler is fully testable without threads or sleeping.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+
+log = logging.getLogger(__name__)
+
+
+class ScheduledEvent:
+    def __init__(self, due: float, callback, name: str, interval: float | None, skip_if_late: bool):
+        self.due = due
+        self.callback = callback
+        self.name = name
+        self.interval = interval
+        self.skip_if_late = skip_if_late
+        self.cancelled = False
+
+    def __repr__(self):
+        return f"<ScheduledEvent {self.name} due={self.due:.1f}>"
+
+
+class Scheduler:
+    def __init__(
+        self,
+        clock=time.time,
+        monotonic=time.monotonic,
+        jump_threshold: float = 60,
+        resume_delay: float = 15,
+        catchup_spacing: float = 30,
+        max_sleep: float = 30,
+        on_resume=None,
+    ):
+        self.clock = clock
+        self.monotonic = monotonic
+        self.jump_threshold = jump_threshold
+        self.resume_delay = resume_delay
+        self.catchup_spacing = catchup_spacing
+        self.max_sleep = max_sleep
+        self.on_resume = on_resume
+        self._heap: list[tuple[float, int, ScheduledEvent]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_wall = clock()
+        self._last_mono = monotonic()
+
+    def call_at(self, when: float, callback, name: str = "event", skip_if_late: bool = False) -> ScheduledEvent:
+        return self._push(ScheduledEvent(when, callback, name, None, skip_if_late))
+
+    def call_later(self, delay: float, callback, name: str = "event", skip_if_late: bool = False) -> ScheduledEvent:
+        return self.call_at(self.clock() + delay, callback, name, skip_if_late)
+
+    def call_every(
+        self, interval: float, callback, first_delay: float | None = None, name: str = "event",
+    ) -> ScheduledEvent:
+        """Run `callback` every `interval` seconds, first after `first_delay` (default: interval)."""
+        delay = interval if first_delay is None else first_delay
+        return self._push(ScheduledEvent(self.clock() + delay, callback, name, interval, False))
+
+    def cancel(self, event: ScheduledEvent) -> None:
+        event.cancelled = True
+
+    def _push(self, event: ScheduledEvent) -> ScheduledEvent:
+        with self._lock:
+            heapq.heappush(self._heap, (event.due, next(self._seq), event))
+        self._wakeup.set()
+        return event
+
+    def run_pending(self) -> list[ScheduledEvent]:
+        """Fire every event that is due now. Returns the events fired."""
+        now, mono = self.clock(), self.monotonic()
+        jumped = (now - self._last_wall) - (mono - self._last_mono)
+        self._last_wall, self._last_mono = now, mono
+
+        with self._lock:
+            due = []
+            while self._heap and self._heap[0][0] <= now:
+                event = heapq.heappop(self._heap)[2]
+                if not event.cancelled:
+                    due.append(event)
+
+        if jumped > self.jump_threshold and due:
+            due = self._spread_after_resume(due, now, jumped)
+        elif jumped > self.jump_threshold and self.on_resume is not None:
+            self.on_resume(jumped)
+
+        for event in due:
+            if event.interval is not None:
+                # Coalesce missed runs: next run is the first slot in the future
+                missed = int((now - event.due) // event.interval) + 1
+                event.due += missed * event.interval
+                self._push(event)
+            try:
+                event.callback()
+            except Exception:
+                log.exception("Scheduled event %s failed", event.name)
+        return due
+
+    def _spread_after_resume(self, due: list[ScheduledEvent], now: float, slept: float) -> list[ScheduledEvent]:
+        """Reschedule events that came due while suspended instead of firing them now."""
+        log.info("Resumed after %.0fs; spreading %d overdue events", slept, len(due))
+        if self.on_resume is not None:
+            self.on_resume(slept)
+        catchup = 0
+        for event in due:
+            if event.skip_if_late:
+                if event.interval is not None:
+                    missed = int((now - event.due) // event.interval) + 1
+                    event.due += missed * event.interval
+                    self._push(event)
+                continue
+            event.due = now + self.resume_delay + catchup * self.catchup_spacing
+            catchup += 1
+            self._push(event)
+        return []
+
+    def seconds_until_next(self) -> float:
+        with self._lock:
+            while self._heap and self._heap[0][2].cancelled:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return self.max_sleep
+            delay = self._heap[0][0] - self.clock()
+        return max(0.0, min(delay, self.max_sleep))
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.run_pending()
+            # Short waits bound how long a suspend can go unnoticed after wake
+            self._wakeup.wait(self.seconds_until_next())
+            self._wakeup.clear()
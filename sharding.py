@@ -0,0 +1,296 @@
+"""Split the watchlist across worker processes or hosts by consistent hashing.
+
+Each shard checks only the repos the hash ring assigns to it and owns its own
+state file, `state.<shard>.json`, in a shard directory that may be shared
+between hosts. After each cycle a shard writes a new report into its
+`results.<shard>/` directory; the supervisor merges every report it has not
+seen, oldest first, into the same cycle view `RepoChecker.check_all` returns,
+and deletes them. Notifications and the menu work exactly as in single-process
+mode, even when a remote shard ran several cycles between two merges.
+"""
+
+import argparse
+import bisect
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from checker import RepoChecker, add_error, add_result, new_cycle, repo_key
+from config_loader import load_config
+from git_refs import GitRefsClient
+from github_client import GitHubClient
+from state_store import StateStore
+from token_resolver import resolve_token
+
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+_REPLICAS = 64  # virtual nodes per shard, smooths the distribution
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """Consistent-hash ring: adding or removing a shard moves ~1/N of the repos."""
+
+    def __init__(self, nodes: list[str], replicas: int = _REPLICAS):
+        points = sorted((_hash(f"{node}#{i}"), node) for node in nodes for i in range(replicas))
+        self._hashes = [h for h, _ in points]
+        self._nodes = [n for _, n in points]
+
+    def node_for(self, key: str) -> str:
+        i = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[i]
+
+
+def assign(repos: list[dict], shards: list[str]) -> dict[str, list[dict]]:
+    ring = HashRing(shards)
+    slices = {shard: [] for shard in shards}
+    for cfg in repos:
+        slices[ring.node_for(repo_key(cfg))].append(cfg)
+    return slices
+
+
+def state_path(shard_dir: str, shard: str) -> str:
+    return os.path.join(shard_dir, f"state.{shard}.json")
+
+
+def results_dir(shard_dir: str, shard: str) -> str:
+    return os.path.join(shard_dir, f"results.{shard}")
+
+
+def _write_json(path: str, data: dict) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _read_json(path: str) -> dict | None:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _newest(entries) -> dict | None:
+    """The entry checked most recently (ISO timestamps in UTC sort as text)."""
+    return max(entries, key=lambda e: e.get("last_checked", ""), default=None)
+
+
+def _sync_moved_state(state: StateStore, repos: list[dict], shards: list[str],
+                      shard_dir: str, shard: str) -> None:
+    """Adopt state for repos rebalanced here, and drop state for repos moved away.
+
+    A repo's entry is taken from whichever other shard file checked it most
+    recently, if that is newer than ours. This keeps its ETag and baseline,
+    so a rebalance costs no extra requests or spurious notifications. Our
+    copy of a repo now owned elsewhere is deleted once the new owner holds
+    an entry at least as recent. Each shard only ever writes its own file,
+    so this can't race with another shard's saves. Without the deletion, a
+    repo that moved back here would reuse a stale ETag and version and notify
+    again.
+    """
+    ring = HashRing(shards)
+    owner = {repo_key(cfg): ring.node_for(repo_key(cfg)) for cfg in repos}
+    others = {}
+    for path in glob.glob(os.path.join(shard_dir, "state.*.json")):
+        if path != state.path:
+            others[path] = _read_json(path) or {}
+
+    mine = {key for key, node in owner.items() if node == shard}
+    for key in mine:
+        best = _newest(data[key] for data in others.values() if key in data)
+        own = state.get(key)
+        if best is not None and (own is None or best.get("last_checked", "") > own.get("last_checked", "")):
+            state.replace(key, best)
+
+    moved_away = []
+    for key, entry in state.data.items():
+        if key not in owner or key in mine:
+            continue
+        adopted = others.get(state_path(shard_dir, owner[key]), {}).get(key)
+        if adopted is not None and adopted.get("last_checked", "") >= entry.get("last_checked", ""):
+            moved_away.append(key)
+    if moved_away:
+        state.remove(moved_away)
+
+
+def run_shard(
+    shard: str,
+    shards: list[str],
+    repos: list[dict],
+    shard_dir: str,
+    cycle_id: str,
+    token: str | None = None,
+    base_url: str | None = None,
+) -> str:
+    """Check this shard's slice of `repos` once and write a results file.
+
+    Returns the file's path. Names sort in the order the cycles finished.
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    mine = assign(repos, shards)[shard]
+    state = StateStore(state_path(shard_dir, shard))
+    _sync_moved_state(state, repos, shards, shard_dir, shard)
+
+    client = GitHubClient(token=token, base_url=base_url)
+    checker = RepoChecker(client, GitRefsClient(token=token), state)
+    cycle = checker.check_all(mine)
+    cycle.update(
+        shard=shard,
+        cycle_id=cycle_id,
+        finished_at=time.time(),
+        requests=client.request_count,
+    )
+    out_dir = results_dir(shard_dir, shard)
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{time.time_ns():020d}-{cycle_id}.json")
+    _write_json(path, cycle)
+    return path
+
+
+def merge_results(shard_dir: str, shards: list[str]) -> tuple[dict, list[str]]:
+    """Merge every pending shard report into one cycle, oldest first.
+
+    Each report is deleted once merged, so it is only ever merged (and
+    notified) once, and none is lost however many cycles a shard ran since
+    the last merge. Returns the merged cycle and the shards that had nothing
+    new to report.
+    """
+    cycle = new_cycle()
+    missing = []
+    for shard in shards:
+        paths = sorted(glob.glob(os.path.join(results_dir(shard_dir, shard), "*.json")))
+        merged = False
+        for path in paths:
+            data = _read_json(path)
+            if data is None:
+                continue  # unreadable for now; retried next merge
+            for result in data["updates"]:
+                add_result(cycle, result)
+            if data["any_error"]:
+                cycle["any_error"] = True
+                cycle["error_message"] = data["error_message"]
+            os.remove(path)
+            merged = True
+        if not merged:
+            missing.append(shard)
+    return cycle, missing
+
+
+class Supervisor:
+    """Run the local shards in a pool of worker processes and merge results."""
+
+    def __init__(
+        self,
+        config: dict,
+        shard_dir: str,
+        token: str | None = None,
+        base_url: str | None = None,
+        history=None,
+        timeout: float | None = None,
+        events=None,
+    ):
+        sharding = config["sharding"]
+        self.repos = config["repos"]
+        self.shards = sharding["shards"]
+        self.local_shards = sharding["local_shards"] or self.shards
+        self.shard_dir = shard_dir
+        self.token = token
+        self.base_url = base_url
+        self.history = history
+        self.events = events
+        self.timeout = timeout
+        # spawn: never fork a process that has Cocoa or network threads running
+        self._pool = ProcessPoolExecutor(
+            max_workers=len(self.local_shards),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        os.makedirs(shard_dir, exist_ok=True)
+
+    def run_cycle(self) -> dict:
+        cycle_id = uuid.uuid4().hex
+        futures = {
+            self._pool.submit(
+                run_shard, shard, self.shards, self.repos, self.shard_dir,
+                cycle_id, self.token, self.base_url,
+            ): shard
+            for shard in self.local_shards
+        }
+        done, not_done = wait(futures, timeout=self.timeout)
+
+        cycle, _ = merge_results(self.shard_dir, self.shards)
+        for future in done:
+            if future.exception() is not None:
+                add_error(cycle, future.exception())
+        for future in not_done:
+            add_error(cycle, TimeoutError(f"Shard {futures[future]} timed out"))
+
+        for result in cycle["updates"]:
+            if not result.get("changed"):
+                continue
+            if self.history is not None and result["status"] != "baseline":
+                self.history.record(result["key"], result["version"], result["source"])
+            if self.events is not None:
+                self.events.publish(
+                    result["key"], result["watch"], result.get("previous"), result["version"],
+                    result["status"], result["source"],
+                )
+        return cycle
+
+    def load_state(self) -> dict:
+        """Merged read-only view of every shard's state."""
+        merged = {}
+        for shard in self.shards:
+            for key, entry in (_read_json(state_path(self.shard_dir, shard)) or {}).items():
+                # A repo may briefly sit in two shards after a rebalance; the
+                # most recently checked copy wins, whatever the shard order
+                merged[key] = _newest(e for e in (merged.get(key), entry) if e is not None)
+        return merged
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def main(argv=None) -> int:
+    """Run one shard as a standalone worker, e.g. on another host."""
+    parser = argparse.ArgumentParser(description="Run a watcher shard.")
+    parser.add_argument("--shard", required=True, help="shard name from config sharding.shards")
+    parser.add_argument("--config", default=os.path.join(_DIR, "config.json"))
+    parser.add_argument("--once", action="store_true", help="run a single cycle and exit")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    if not config.get("sharding"):
+        parser.error("config has no 'sharding' section")
+    shards = config["sharding"]["shards"]
+    if args.shard not in shards:
+        parser.error(f"unknown shard {args.shard!r}; expected one of {shards}")
+    shard_dir = os.path.join(os.path.dirname(os.path.abspath(args.config)), config["sharding"]["dir"])
+    token = resolve_token()
+
+    while True:
+        run_shard(
+            args.shard, shards, config["repos"], shard_dir, uuid.uuid4().hex,
+            token, config.get("api_base_url"),
+        )
+        if args.once:
+            return 0
+        time.sleep(config["check_interval_minutes"] * 60)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,20 +1,40 @@
-"""Persist last-seen versions and ETags to state.json."""
+"""Persist last-seen versions and ETags to state.json.
+
+The store is safe to share between threads. State is a copy-on-write snapshot:
+an update copies the top-level dict and the one entry it changes, then
+publishes the copy with a single assignment. A published snapshot and its
+entries are never mutated again, so readers (the UI, the serializer) take no
+lock. Writers are serialized by one lock held only for the copy.
+
+Saves are group-committed. Each update bumps a version number. A save writes
+whatever snapshot is current, so an updater whose version is already on disk,
+because another thread's save covered it, skips its own write.
+"""
 
 import json
 import os
 import tempfile
+import threading
+import time
 from datetime import datetime, timezone
 
+from profiling import span
+
 
 class StateStore:
     def __init__(self, path: str):
         self.path = path
-        self.data: dict = {}
+        self._data: dict = {}
+        self._version = 0
+        self._saved_version = 0
+        self._lock = threading.Lock()  # writers: copy and publish
+        self._save_lock = threading.Lock()  # one save at a time
+        self.stats = {"updates": 0, "saves": 0, "coalesced": 0, "lock_wait": 0.0}
         self.corruption_warning: str | None = None
         if os.path.isfile(path):
             try:
                 with open(path) as f:
-                    self.data = json.load(f)
+                    self._data = json.load(f)
             except (json.JSONDecodeError, OSError) as e:
                 # Rename corrupted file for forensics, start fresh
                 ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
@@ -23,37 +43,94 @@ class StateStore:
                     os.rename(path, corrupt_path)
                 except OSError:
                     pass  # Best effort rename
-                self.data = {}
+                self._data = {}
                 self.corruption_warning = (
                     f"State reset: {e.__class__.__name__} — "
                     f"corrupt file saved as {os.path.basename(corrupt_path)}"
                 )
 
+    @property
+    def data(self) -> dict:
+        """The current snapshot. Read-only: it is shared with other readers."""
+        return self._data
+
     def get(self, repo_key: str) -> dict | None:
-        return self.data.get(repo_key)
+        """The repo's entry in the current snapshot. Read-only, like `data`."""
+        return self._data.get(repo_key)
 
     def get_etag(self, repo_key: str) -> str | None:
-        entry = self.data.get(repo_key)
+        entry = self._data.get(repo_key)
         if entry:
             return entry.get("etag")
         return None
 
     def is_first_run(self, repo_key: str) -> bool:
-        return repo_key not in self.data
+        return repo_key not in self._data
 
     def update(self, repo_key: str, values: dict) -> None:
-        existing = self.data.get(repo_key, {})
-        existing.update(values)
-        existing["last_checked"] = datetime.now(timezone.utc).isoformat()
-        self.data[repo_key] = existing
-        self._save()
+        def change(data):
+            entry = dict(data.get(repo_key, {}))
+            entry.update(values)
+            entry["last_checked"] = datetime.now(timezone.utc).isoformat()
+            data[repo_key] = entry
+        self._commit(change)
+
+    def replace(self, repo_key: str, entry: dict) -> None:
+        """Store `entry` as is, e.g. one copied from another state file."""
+        def change(data):
+            data[repo_key] = dict(entry)
+        self._commit(change)
+
+    def remove(self, repo_keys) -> None:
+        def change(data):
+            for key in repo_keys:
+                data.pop(key, None)
+        self._commit(change)
+
+    def get_section(self, name: str) -> dict:
+        """Non-repo state kept under its own top-level key. Repo keys always
+        contain a "/", so a section name without one can't collide."""
+        return self._data.get(name) or {}
+
+    def update_section(self, name: str, key: str, values: dict) -> None:
+        def change(data):
+            section = dict(data.get(name) or {})
+            section[key] = {**section.get(key, {}), **values}
+            data[name] = section
+        self._commit(change)
+
+    def _commit(self, change) -> None:
+        """Apply `change` to a copy of the current snapshot, publish it, save."""
+        start = time.perf_counter()
+        with self._lock:
+            self.stats["lock_wait"] += time.perf_counter() - start
+            data = dict(self._data)
+            change(data)
+            self._data = data
+            self._version += 1
+            self.stats["updates"] += 1
+            version = self._version
+        self._save(version)
+
+    def _save(self, version: int) -> None:
+        """Make sure snapshot `version` (or a later one) is on disk."""
+        with self._save_lock:
+            if self._saved_version >= version:
+                self.stats["coalesced"] += 1
+                return
+            with self._lock:
+                data, saved = self._data, self._version
+            with span("state_save"):
+                self._write(data)
+            self._saved_version = saved
+            self.stats["saves"] += 1
 
-    def _save(self) -> None:
+    def _write(self, data: dict) -> None:
         dir_name = os.path.dirname(self.path) or "."
         fd, tmp_path = tempfile.mkstemp(dir=dir_name, suffix=".tmp")
         try:
             with os.fdopen(fd, "w") as f:
-                json.dump(self.data, f, indent=2)
+                json.dump(data, f, indent=2)
             os.replace(tmp_path, self.path)
         except BaseException:
             os.unlink(tmp_path)
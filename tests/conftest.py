@@ -0,0 +1,18 @@
+import pytest
+
+from tests.stub_api import StubGitHubAPI
+
+
+@pytest.fixture
+def stub_seed():
+    """Data for the `stub` API. Override in a module with a callable that
+    takes the stub and fills it in."""
+    return None
+
+
+@pytest.fixture
+def stub(stub_seed):
+    with StubGitHubAPI() as api:
+        if stub_seed is not None:
+            stub_seed(api)
+        yield api
@@ -0,0 +1,196 @@
+"""Minimal stand-in for the GitHub REST API, for tests and local load runs.
+
+Serves `/repos/{owner}/{repo}/tags` (paginated), `/releases/latest`,
+`/releases/tags/{tag}` and `/orgs/{org}/events` with ETags and 304s, so
+clients can be pointed at it through `base_url`. Also holds the watchlist
+builder and fake clock that the tests and benchmarks share.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+def make_repos(n: int, watch: str = "releases") -> list[dict]:
+    """Watchlist entries org/r0 .. org/r{n-1}. `watch="mixed"` alternates
+    tags (even) and releases (odd)."""
+    return [
+        {
+            "owner": "org", "repo": f"r{i}", "label": f"R{i}",
+            "watch": ("releases" if i % 2 else "tags") if watch == "mixed" else watch,
+        }
+        for i in range(n)
+    ]
+
+
+class FakeClock:
+    """A monotonic clock that only moves when a test sets `now`."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class StubGitHubAPI:
+    def __init__(self):
+        self.tags: dict[str, list[dict]] = {}
+        self.releases: dict[str, dict] = {}
+        self.request_log: list[str] = []
+        self.request_headers: list[dict] = []
+        self.delay = 0.0  # seconds to stall each response, to widen races
+        self.rate_limit_reset: int | None = None  # set to answer everything 403 rate limited
+        self.errors: dict[str, int] = {}  # repo key -> status to answer with
+        self.org_events: dict[str, list[dict]] = {}  # org -> events, newest first
+        self.poll_interval = 60
+        self._next_event_id = 1000
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def set_tags(self, key: str, names: list[str]) -> None:
+        """Set a repo's tag listing, in the order the API should return it."""
+        with self._lock:
+            self.tags[key] = [
+                {"name": n, "commit": {"sha": hashlib.sha1(f"{key}@{n}".encode()).hexdigest()}}
+                for n in names
+            ]
+
+    def add_tag(self, key: str, name: str) -> None:
+        self.set_tags(key, [name] + [t["name"] for t in self.tags.get(key, [])])
+
+    def set_release(self, key: str, release_id: int, tag_name: str, **extra) -> None:
+        with self._lock:
+            self.releases[key] = {"id": release_id, "tag_name": tag_name, "name": tag_name, **extra}
+
+    def add_event(self, key: str, event_type: str, ref_type: str | None = None) -> int:
+        """Publish an event for repo `key` on its org's feed. Returns its ID."""
+        with self._lock:
+            self._next_event_id += 1
+            event = {"id": str(self._next_event_id), "type": event_type, "repo": {"name": key}, "payload": {}}
+            if ref_type is not None:
+                event["payload"]["ref_type"] = ref_type
+            self.org_events.setdefault(key.split("/")[0], []).insert(0, event)
+            return self._next_event_id
+
+    def requests_for(self, fragment: str) -> int:
+        with self._lock:
+            return sum(1 for path in self.request_log if fragment in path)
+
+    def clear_log(self) -> None:
+        """Forget logged requests, so long runs don't grow the stub itself."""
+        with self._lock:
+            self.request_log.clear()
+            self.request_headers.clear()
+
+    def start(self) -> "StubGitHubAPI":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            # The default listen backlog of 5 drops bursts of concurrent
+            # connects, which then stall for a 1s SYN retransmit
+            request_queue_size = 128
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _route(self, path: str, query: dict):
+        if self.rate_limit_reset is not None:
+            return 403, {"message": "API rate limit exceeded"}
+        parts = path.strip("/").split("/")
+        if len(parts) == 3 and parts[0] == "orgs" and parts[2] == "events":
+            with self._lock:
+                events = self.org_events.get(parts[1], [])
+                per_page = int(query.get("per_page", ["30"])[0])
+                start = (int(query.get("page", ["1"])[0]) - 1) * per_page
+                return 200, events[start:start + per_page]
+        if len(parts) < 4 or parts[0] != "repos":
+            return 404, {"message": "Not Found"}
+        key = f"{parts[1]}/{parts[2]}"
+        if key in self.errors:
+            return self.errors[key], {"message": "Server Error"}
+        with self._lock:
+            if parts[3:] == ["tags"]:
+                if key not in self.tags:
+                    return 404, {"message": "Not Found"}
+                per_page = int(query.get("per_page", ["30"])[0])
+                page = int(query.get("page", ["1"])[0])
+                start = (page - 1) * per_page
+                return 200, self.tags[key][start:start + per_page]
+            if parts[3:] == ["releases", "latest"]:
+                if key not in self.releases:
+                    return 404, {"message": "Not Found"}
+                return 200, self.releases[key]
+            if parts[3:5] == ["releases", "tags"] and len(parts) == 6:
+                release = self.releases.get(key)
+                if release is None or release["tag_name"] != unquote(parts[5]):
+                    return 404, {"message": "Not Found"}
+                return 200, release
+        return 404, {"message": "Not Found"}
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        url = urlsplit(handler.path)
+        with self._lock:
+            self.request_log.append(handler.path)
+            self.request_headers.append(dict(handler.headers))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            status, payload = self._route(url.path, parse_qs(url.query))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        body = json.dumps(payload).encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if status == 200 and handler.headers.get("If-None-Match") == etag:
+            handler.send_response(304)
+            handler.send_header("ETag", etag)
+            handler.end_headers()
+            return
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        if status == 200:
+            handler.send_header("ETag", etag)
+        if url.path.startswith("/orgs/"):
+            handler.send_header("X-Poll-Interval", str(self.poll_interval))
+        if self.rate_limit_reset is not None:
+            handler.send_header("X-RateLimit-Remaining", "0")
+            handler.send_header("X-RateLimit-Reset", str(self.rate_limit_reset))
+        handler.end_headers()
+        handler.wfile.write(body)
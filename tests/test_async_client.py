@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from async_client import AsyncGitHubClient
+from github_client import GitHubAPIError, RateLimitError
+
+
+def _run(stub, call):
+    async def go():
+        async with AsyncGitHubClient(base_url=stub.url) as client:
+            return await call(client)
+    return asyncio.run(go())
+
+
+def test_fetch_latest_release(stub):
+    stub.set_release("acme/app", 7, "v1.5.0", name="Release 1.5.0")
+    result = _run(stub, lambda c: c.fetch_latest_release("acme", "app"))
+    assert result["release_id"] == 7
+    assert result["tag_name"] == "v1.5.0"
+    assert result["release_name"] == "Release 1.5.0"
+    assert result["etag"].startswith('"')
+
+
+def test_etag_304_returns_none(stub):
+    stub.set_release("acme/app", 7, "v1.5.0")
+
+    async def twice(client):
+        first = await client.fetch_latest_release("acme", "app")
+        return await client.fetch_latest_release("acme", "app", etag=first["etag"])
+
+    assert _run(stub, twice) is None
+
+
+def test_fetch_latest_tag(stub):
+    stub.set_tags("acme/widget", ["v2.0", "v1.0"])
+    result = _run(stub, lambda c: c.fetch_latest_tag("acme", "widget"))
+    assert result["tag_name"] == "v2.0"
+
+
+def test_scan_tags_matches_sync_semantics(stub):
+    stub.set_tags("acme/widget", ["v5.15.180", "v6.9", "v6.10-rc1"])
+    result = _run(stub, lambda c: c.scan_tags("acme", "widget"))
+    assert result["tag_name"] == "v6.9"
+    assert result["known_tags"] == ["v5.15.180", "v6.9", "v6.10-rc1"]
+    assert result["requests"] == 1
+
+
+def test_404_raises_api_error(stub):
+    with pytest.raises(GitHubAPIError, match="404: Not Found"):
+        _run(stub, lambda c: c.fetch_latest_release("acme", "missing"))
+
+
+def test_rate_limit_maps_to_rate_limit_error(stub):
+    stub.rate_limit_reset = 1700000000
+    with pytest.raises(RateLimitError) as exc_info:
+        _run(stub, lambda c: c.fetch_latest_release("acme", "app"))
+    assert exc_info.value.reset_timestamp == 1700000000
+
+
+def test_body_over_limit_is_an_error(stub):
+    stub.set_release("acme/app", 7, "v1.5.0", body="x" * 5000)
+
+    async def go():
+        async with AsyncGitHubClient(base_url=stub.url, max_response_bytes=1000) as client:
+            return await client.fetch_latest_release("acme", "app")
+
+    with pytest.raises(GitHubAPIError, match="exceeds 1000 bytes"):
+        asyncio.run(go())
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from async_client import AsyncGitHubClient
+from async_engine import AsyncCheckEngine, EngineThread
+from checker import RepoChecker
+from git_refs import GitRefsClient
+from github_client import GitHubClient
+from state_store import StateStore
+from tests.stub_api import make_repos
+
+
+def _repos(n):
+    return make_repos(n, watch="mixed")
+
+
+@pytest.fixture
+def stub_seed():
+    def seed(api):
+        for i in range(20):
+            api.set_release(f"org/r{i}", i, f"v{i}.0")
+            api.set_tags(f"org/r{i}", [f"v{i}.0", "v0.1"])
+    return seed
+
+
+def _checker(tmp_path, name="state.json"):
+    return RepoChecker(None, GitRefsClient(), StateStore(str(tmp_path / name)))
+
+
+def _run_cycle(stub, checker, repos, concurrency=5):
+    async def go():
+        async with AsyncGitHubClient(base_url=stub.url) as client:
+            return await AsyncCheckEngine(checker, client, concurrency).check_all(repos)
+    return asyncio.run(go())
+
+
+def test_matches_threaded_checker(stub, tmp_path):
+    repos = _repos(20)
+    sync = RepoChecker(GitHubClient(base_url=stub.url), GitRefsClient(), StateStore(str(tmp_path / "a.json")))
+    expected = sync.check_all(repos)
+    cycle = _run_cycle(stub, _checker(tmp_path, "b.json"), repos)
+    assert sorted(cycle["updates"], key=lambda u: u["key"]) == sorted(expected["updates"], key=lambda u: u["key"])
+
+
+def test_second_cycle_is_conditional(stub, tmp_path):
+    checker = _checker(tmp_path)
+    _run_cycle(stub, checker, _repos(10))
+    stub.set_release("org/r3", 99, "v3.1")
+    cycle = _run_cycle(stub, checker, _repos(10))
+    assert [n["key"] for n in cycle["notifications"]] == ["org/r3"]
+    assert sum(u["status"] == "unchanged" for u in cycle["updates"]) == 9
+
+
+def test_concurrency_is_bounded(stub, tmp_path):
+    stub.delay = 0.05
+    _run_cycle(stub, _checker(tmp_path), _repos(20), concurrency=4)
+    assert 1 < stub.max_in_flight <= 4
+
+
+def test_errors_are_collected(stub, tmp_path):
+    stub.errors["org/broken"] = 500
+    repos = _repos(2) + [{"owner": "org", "repo": "broken", "watch": "releases", "label": "Broken"}]
+    cycle = _run_cycle(stub, _checker(tmp_path), repos)
+    assert cycle["any_error"] is True
+    assert "500" in cycle["error_message"]
+    assert len(cycle["updates"]) == 2
+
+
+def test_missing_release_is_negative_not_error(stub, tmp_path):
+    repos = _repos(1) + [{"owner": "org", "repo": "fresh", "watch": "releases", "label": "Fresh"}]
+    cycle = _run_cycle(stub, _checker(tmp_path), repos)
+    assert cycle["any_error"] is False
+    assert cycle["updates"][1] == {
+        "key": "org/fresh", "status": "negative", "negative": "no_releases", "watch": "releases",
+    }
+
+
+def test_engine_thread_runs_cycles_on_one_loop(stub, tmp_path):
+    engine = EngineThread(_checker(tmp_path), base_url=stub.url, concurrency=5)
+    try:
+        first = engine.submit(_repos(6)).result(timeout=10)
+        second = engine.submit(_repos(6)).result(timeout=10)
+    finally:
+        engine.stop()
+    assert all(u["status"] == "baseline" for u in first["updates"])
+    assert all(u["status"] == "unchanged" for u in second["updates"])
+
+
+def test_prefilter_runs_before_fetching(stub, tmp_path):
+    class OnlyFirst:
+        def select(self, repos):
+            return repos[:1]
+
+        def fetched(self, key):
+            pass
+
+    checker = _checker(tmp_path)
+    checker.prefilter = OnlyFirst()
+    cycle = _run_cycle(stub, checker, _repos(4))
+    assert [u["key"] for u in cycle["updates"]] == ["org/r0"]
+
+
+def test_cancelled_check_cancels_the_cycle(stub, tmp_path):
+    class Cancelling(RepoChecker):
+        def apply(self, key, cfg, plan, result):
+            if key == "org/r1":
+                raise asyncio.CancelledError()
+            return super().apply(key, cfg, plan, result)
+
+    checker = Cancelling(None, GitRefsClient(), StateStore(str(tmp_path / "state.json")))
+    with pytest.raises(asyncio.CancelledError):
+        _run_cycle(stub, checker, _repos(3))
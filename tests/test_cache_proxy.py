@@ -0,0 +1,124 @@
+import threading
+
+import pytest
+import requests
+
+import cache_proxy
+from cache_proxy import CachingProxy
+from github_client import GitHubClient
+
+
+@pytest.fixture
+def stub_seed():
+    def seed(api):
+        api.set_release("acme/app", 1, "v1.0")
+        api.set_tags("acme/widget", ["v2.0", "v1.0"])
+    return seed
+
+
+@pytest.fixture
+def upstream(stub):
+    return stub
+
+
+@pytest.fixture
+def proxy(upstream):
+    p = CachingProxy(upstream=upstream.url, ttl=60)
+    server = p.serve(port=0)
+    p.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield p
+    p.shutdown()
+
+
+def test_fresh_response_served_from_cache(proxy, upstream):
+    client = GitHubClient(base_url=proxy.url)
+    first = client.fetch_latest_release("acme", "app")
+    second = client.fetch_latest_release("acme", "app")
+    assert first["tag_name"] == second["tag_name"] == "v1.0"
+    assert upstream.requests_for("/releases/latest") == 1
+    assert proxy.stats["hits"] == 1
+
+
+def test_client_etag_gets_304(proxy):
+    client = GitHubClient(base_url=proxy.url)
+    first = client.fetch_latest_release("acme", "app")
+    assert client.fetch_latest_release("acme", "app", etag=first["etag"]) is None
+
+
+def test_query_string_is_part_of_cache_key(proxy, upstream):
+    client = GitHubClient(base_url=proxy.url)
+    client.scan_tags("acme", "widget")
+    client.fetch_latest_tag("acme", "widget")
+    assert upstream.requests_for("/tags") == 2
+
+
+def test_stale_entry_revalidated_with_etag(proxy, upstream):
+    proxy.ttl = 0
+    client = GitHubClient(base_url=proxy.url)
+    client.fetch_latest_release("acme", "app")
+    client.fetch_latest_release("acme", "app")
+    assert proxy.stats["revalidated"] == 1
+    assert upstream.request_headers[-1]["If-None-Match"].startswith('"')
+
+
+def test_stale_entry_refreshed_on_change(proxy, upstream):
+    proxy.ttl = 0
+    client = GitHubClient(base_url=proxy.url)
+    client.fetch_latest_release("acme", "app")
+    upstream.set_release("acme/app", 2, "v2.0")
+    assert client.fetch_latest_release("acme", "app")["tag_name"] == "v2.0"
+
+
+def test_concurrent_requests_collapse(proxy, upstream):
+    upstream.delay = 0.3
+    results = []
+
+    def fetch():
+        resp = requests.get(f"{proxy.url}/repos/acme/app/releases/latest", timeout=10)
+        results.append(resp.json()["tag_name"])
+
+    threads = [threading.Thread(target=fetch) for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["v1.0"] * 20
+    assert upstream.requests_for("/releases/latest") == 1
+    assert proxy.stats["collapsed"] + proxy.stats["hits"] == 19
+
+
+def test_not_found_is_cached(proxy, upstream):
+    for _ in range(2):
+        resp = requests.get(f"{proxy.url}/repos/acme/none/releases/latest", timeout=10)
+        assert resp.status_code == 404
+    assert upstream.requests_for("/repos/acme/none") == 1
+
+
+def test_other_paths_are_refused(proxy, upstream):
+    resp = requests.get(f"{proxy.url}/user/repos", timeout=10)
+    assert resp.status_code == 404
+    assert upstream.request_log == []
+
+
+def test_cache_is_bounded(proxy, upstream):
+    proxy.max_entries = 1
+    client = GitHubClient(base_url=proxy.url)
+    client.fetch_latest_release("acme", "app")
+    client.fetch_latest_tag("acme", "widget")
+    client.fetch_latest_release("acme", "app")
+    assert upstream.requests_for("/releases/latest") == 2
+
+
+def test_unexpected_errors_get_502(proxy, monkeypatch):
+    def broken(path, stale):
+        raise ValueError("boom")
+
+    monkeypatch.setattr(proxy, "_fetch", broken)
+    resp = requests.get(f"{proxy.url}/repos/acme/app/releases/latest", timeout=10)
+    assert resp.status_code == 502
+
+
+def test_token_refused_on_network_address():
+    with pytest.raises(SystemExit) as exc:
+        cache_proxy.main(["--host", "0.0.0.0", "--token", "ghp_x"])
+    assert exc.value.code == 2
@@ -0,0 +1,130 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import check
+
+
+@pytest.fixture
+def stub_seed():
+    def seed(api):
+        api.set_tags("acme/widget", ["v1.0"])
+        api.set_release("acme/app", 1, "v2.0")
+    return seed
+
+
+def _run(stub, tmp_path, capsys, repos=None, *extra):
+    config = {
+        "api_base_url": stub.url,
+        "repos": repos or [
+            {"owner": "acme", "repo": "widget", "watch": "tags", "label": "Widget"},
+            {"owner": "acme", "repo": "app", "watch": "releases", "label": "App"},
+        ],
+    }
+    (tmp_path / "config.json").write_text(json.dumps(config))
+    code = check.main([
+        "--config", str(tmp_path / "config.json"), "--state", str(tmp_path / "state.json"), *extra,
+    ])
+    return code, json.loads(capsys.readouterr().out)
+
+
+def test_first_run_is_baseline_and_exits_zero(stub, tmp_path, capsys):
+    code, report = _run(stub, tmp_path, capsys)
+    assert code == check.EXIT_UNCHANGED
+    assert [(r["key"], r["status"], r["version"]) for r in report["results"]] == [
+        ("acme/widget", "baseline", "v1.0"), ("acme/app", "baseline", "v2.0"),
+    ]
+    assert report["new"] == [] and report["errors"] == []
+
+
+def test_repeat_run_uses_etags_and_reports_versions(stub, tmp_path, capsys):
+    _run(stub, tmp_path, capsys)
+    stub.clear_log()
+    code, report = _run(stub, tmp_path, capsys)
+    assert code == check.EXIT_UNCHANGED
+    assert all("If-None-Match" in h for h in stub.request_headers)
+    assert [(r["status"], r["version"]) for r in report["results"]] == [
+        ("unchanged", "v1.0"), ("unchanged", "v2.0"),
+    ]
+
+
+def test_new_version_exits_one(stub, tmp_path, capsys):
+    _run(stub, tmp_path, capsys)
+    stub.add_tag("acme/widget", "v1.1")
+    code, report = _run(stub, tmp_path, capsys)
+    assert code == check.EXIT_NEW
+    assert report["new"] == ["acme/widget"]
+    assert report["results"][0]["previous"] == "v1.0"
+
+
+def test_errors_take_precedence(stub, tmp_path, capsys):
+    _run(stub, tmp_path, capsys)
+    stub.add_tag("acme/widget", "v1.1")
+    stub.errors["acme/app"] = 500
+    code, report = _run(stub, tmp_path, capsys)
+    assert code == check.EXIT_ERROR
+    assert report["new"] == ["acme/widget"]
+    assert report["errors"][0]["key"] == "acme/app"
+    assert "500" in report["errors"][0]["error"]
+
+
+def test_time_budget_reports_timeouts(stub, tmp_path, capsys):
+    stub.delay = 0.5
+    code, report = _run(stub, tmp_path, capsys, None, "--timeout", "0.1")
+    assert code == check.EXIT_ERROR
+    assert {r["status"] for r in report["results"]} == {"timeout"}
+    assert report["elapsed"] < 0.5
+
+
+def test_process_exits_at_the_deadline(stub, tmp_path):
+    stub.delay = 5
+    (tmp_path / "config.json").write_text(json.dumps({
+        "api_base_url": stub.url,
+        "repos": [{"owner": "acme", "repo": "app", "watch": "releases", "label": "App"}],
+    }))
+    start = time.monotonic()
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(check.__file__), "--config", str(tmp_path / "config.json"),
+         "--state", str(tmp_path / "state.json"), "--timeout", "0.2"],
+        capture_output=True, timeout=30,
+    )
+    assert time.monotonic() - start < 4
+    assert proc.returncode == check.EXIT_ERROR
+    assert json.loads(proc.stdout)["results"][0]["status"] == "timeout"
+
+
+def test_result_applied_after_deadline_is_reported(stub, tmp_path, capsys, monkeypatch):
+    real_wait = check.wait
+
+    def slow_wait(futures, timeout):
+        # The workers finish between the deadline and the abandon flag
+        done = real_wait(futures, timeout=timeout)
+        time.sleep(0.6)
+        return done
+
+    monkeypatch.setattr(check, "wait", slow_wait)
+    stub.delay = 0.3
+    code, report = _run(stub, tmp_path, capsys, None, "--timeout", "0.1")
+    assert [r["status"] for r in report["results"]] == ["baseline", "baseline"]
+    assert code == check.EXIT_UNCHANGED
+
+
+def test_repos_are_checked_concurrently(stub, tmp_path, capsys):
+    stub.delay = 0.2
+    repos = [{"owner": "acme", "repo": f"r{i}", "watch": "releases", "label": f"R{i}"} for i in range(8)]
+    for i in range(8):
+        stub.set_release(f"acme/r{i}", i, "v1")
+    code, report = _run(stub, tmp_path, capsys, repos)
+    assert code == check.EXIT_UNCHANGED
+    assert stub.max_in_flight > 1
+    assert report["elapsed"] < 8 * 0.2
+
+
+def test_bad_config_exits_two(tmp_path, capsys):
+    (tmp_path / "config.json").write_text("{}")
+    assert check.main(["--config", str(tmp_path / "config.json")]) == check.EXIT_ERROR
+    assert "repos" in json.loads(capsys.readouterr().out)["errors"][0]["error"]
@@ -0,0 +1,142 @@
+import pytest
+
+from checker import RepoChecker, error_message
+from git_refs import GitRefsClient
+from github_client import GitHubClient, RateLimitError
+from history_store import HistoryStore
+from state_store import StateStore
+from tests.stub_api import FakeClock
+
+
+TAGS = {"owner": "acme", "repo": "widget", "watch": "tags", "label": "Widget"}
+RELEASES = {"owner": "acme", "repo": "app", "watch": "releases", "label": "App"}
+
+
+@pytest.fixture
+def checker(stub, tmp_path):
+    client = GitHubClient(base_url=stub.url)
+    state = StateStore(str(tmp_path / "state.json"))
+    history = HistoryStore(str(tmp_path / "history.log"))
+    return RepoChecker(client, GitRefsClient(), state, history)
+
+
+def test_first_check_is_baseline(stub, checker):
+    stub.set_tags("acme/widget", ["v1.0", "v1.1"])
+    result = checker.check_repo("acme/widget", TAGS)
+    assert result["status"] == "baseline"
+    assert result["version"] == "v1.1"
+    assert checker.state.get("acme/widget")["known_tags"] == ["v1.0", "v1.1"]
+
+
+def test_unchanged_uses_etag(stub, checker):
+    stub.set_release("acme/app", 1, "v1.0")
+    checker.check_repo("acme/app", RELEASES)
+    assert checker.check_repo("acme/app", RELEASES) == {"key": "acme/app", "status": "unchanged"}
+
+
+def test_new_release_is_reported_and_recorded(stub, checker):
+    stub.set_release("acme/app", 1, "v1.0")
+    checker.check_repo("acme/app", RELEASES)
+    stub.set_release("acme/app", 2, "v1.1")
+    result = checker.check_repo("acme/app", RELEASES)
+    assert result["status"] == "new"
+    assert result["version"] == "v1.1"
+    assert [e["version"] for e in checker.history.range(0)] == ["v1.1"]
+
+
+def test_tag_filter_change_rebaselines(stub, checker):
+    stub.set_tags("acme/widget", ["v1.0", "v2.0-rc.1"])
+    checker.check_repo("acme/widget", TAGS)
+    result = checker.check_repo("acme/widget", dict(TAGS, include_prereleases=True))
+    assert result["status"] == "baseline"
+    assert result["version"] == "v2.0-rc.1"
+
+
+def test_check_all_collects_errors(stub, checker):
+    stub.set_release("acme/app", 1, "v1.0")
+    stub.errors["acme/broken"] = 500
+    cycle = checker.check_all([dict(TAGS, repo="broken"), RELEASES])
+    assert cycle["any_error"] is True
+    assert "500" in cycle["error_message"]
+    assert [u["key"] for u in cycle["updates"]] == ["acme/app"]
+
+
+def test_rate_limit_message():
+    assert error_message(RateLimitError(reset_timestamp=0)).startswith("Rate limited")
+
+
+@pytest.fixture
+def clocked(stub, tmp_path):
+    clock = FakeClock()
+    checker = RepoChecker(
+        GitHubClient(base_url=stub.url), GitRefsClient(),
+        StateStore(str(tmp_path / "state.json")), clock=clock,
+    )
+    return checker, clock
+
+
+def test_repo_without_releases_is_negative_not_error(stub, clocked):
+    checker, _ = clocked
+    cycle = checker.check_all([RELEASES])
+    assert cycle["any_error"] is False
+    assert cycle["updates"] == [
+        {"key": "acme/app", "status": "negative", "negative": "no_releases", "watch": "releases"},
+    ]
+    assert checker.state.get("acme/app")["negative"]["ttl"] == RepoChecker.NEGATIVE_TTL_MIN
+
+
+def test_negative_entry_skips_requests_until_ttl_then_backs_off(stub, clocked):
+    checker, clock = clocked
+    checker.check_repo("acme/app", RELEASES)
+    assert checker.check_repo("acme/app", RELEASES)["status"] == "negative"
+    assert stub.requests_for("/releases/latest") == 1
+
+    clock.now += RepoChecker.NEGATIVE_TTL_MIN
+    checker.check_repo("acme/app", RELEASES)
+    assert stub.requests_for("/releases/latest") == 2
+    assert checker.state.get("acme/app")["negative"]["ttl"] == 2 * RepoChecker.NEGATIVE_TTL_MIN
+
+    for _ in range(10):
+        clock.now += RepoChecker.NEGATIVE_TTL_MAX
+        checker.check_repo("acme/app", RELEASES)
+    assert checker.state.get("acme/app")["negative"]["ttl"] == RepoChecker.NEGATIVE_TTL_MAX
+
+
+def test_first_release_after_negative_is_new(stub, clocked):
+    checker, clock = clocked
+    checker.check_repo("acme/app", RELEASES)
+    stub.set_release("acme/app", 1, "v1.0")
+    clock.now += RepoChecker.NEGATIVE_TTL_MIN
+    result = checker.check_repo("acme/app", RELEASES)
+    assert result["status"] == "new"
+    assert checker.state.get("acme/app")["negative"] is None
+
+
+def test_known_version_survives_releases_disappearing(stub, clocked):
+    checker, _ = clocked
+    stub.set_release("acme/app", 1, "v1.0")
+    checker.check_repo("acme/app", RELEASES)
+    del stub.releases["acme/app"]
+    assert checker.check_repo("acme/app", RELEASES) == {"key": "acme/app", "status": "unchanged"}
+    entry = checker.state.get("acme/app")
+    assert entry["last_tag_name"] == "v1.0"
+    assert not entry.get("negative")
+
+
+def test_empty_tag_list_is_revalidated_with_etag(stub, clocked):
+    checker, clock = clocked
+    stub.set_tags("acme/widget", [])
+    assert checker.check_repo("acme/widget", TAGS)["negative"] == "no_tags"
+    clock.now += RepoChecker.NEGATIVE_TTL_MIN
+    assert checker.check_repo("acme/widget", TAGS)["negative"] == "no_tags"
+    assert "If-None-Match" in stub.request_headers[-1]
+    assert checker.state.get("acme/widget")["negative"]["ttl"] == 2 * RepoChecker.NEGATIVE_TTL_MIN
+
+    stub.add_tag("acme/widget", "v0.1")
+    clock.now += 2 * RepoChecker.NEGATIVE_TTL_MIN
+    assert checker.check_repo("acme/widget", TAGS)["status"] == "new"
+
+
+def test_missing_repo_is_not_found(stub, clocked):
+    checker, _ = clocked
+    assert checker.check_repo("acme/gone", dict(TAGS, repo="gone"))["negative"] == "not_found"
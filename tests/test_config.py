@@ -100,3 +100,173 @@ def test_load_config_rejects_negative_interval(tmp_path):
     p.write_text(json.dumps(cfg))
     with pytest.raises(ConfigError, match="check_interval_minutes must be a number"):
         load_config(str(p))
+
+
+def test_load_config_defaults_tag_backend(tmp_path):
+    cfg = {"repos": [{"owner": "x", "repo": "y", "watch": "tags", "label": "Z"}]}
+    p = tmp_path / "config.json"
+    p.write_text(json.dumps(cfg))
+    result = load_config(str(p))
+    assert result["repos"][0]["tag_backend"] == "api"
+
+
+def test_load_config_rejects_git_backend_for_releases(tmp_path):
+    cfg = {
+        "repos": [
+            {"owner": "x", "repo": "y", "watch": "releases", "label": "Z", "tag_backend": "git"}
+        ],
+    }
+    p = tmp_path / "config.json"
+    p.write_text(json.dumps(cfg))
+    with pytest.raises(ConfigError, match="tag_backend"):
+        load_config(str(p))
+
+
+def test_load_config_defaults_history_policy(tmp_path):
+    cfg = {"repos": [{"owner": "x", "repo": "y", "watch": "tags", "label": "Z"}]}
+    p = tmp_path / "config.json"
+    p.write_text(json.dumps(cfg))
+    result = load_config(str(p))
+    assert result["history"] == {"retention_days": 365, "rollup_after_days": 30}
+
+
+def test_load_config_rejects_rollup_beyond_retention(tmp_path):
+    cfg = {
+        "history": {"retention_days": 10, "rollup_after_days": 30},
+        "repos": [{"owner": "x", "repo": "y", "watch": "tags", "label": "Z"}],
+    }
+    p = tmp_path / "config.json"
+    p.write_text(json.dumps(cfg))
+    with pytest.raises(ConfigError, match="rollup_after_days"):
+        load_config(str(p))
+
+
+def test_load_config_tag_filter_defaults(tmp_path):
+    cfg = {"repos": [{"owner": "x", "repo": "y", "watch": "tags", "label": "Z"}]}
+    p = tmp_path / "config.json"
+    p.write_text(json.dumps(cfg))
+    repo = load_config(str(p))["repos"][0]
+    assert repo["tag_include"] == []
+    assert repo["tag_exclude"] == []
+    assert repo["include_prereleases"] is False
+    assert repo["max_tag_pages"] == 3
+
+
+def test_load_config_rejects_bad_tag_patterns(tmp_path):
+    cfg = {"repos": [{"owner": "x", "repo": "y", "watch": "tags", "label": "Z", "tag_include": "v*"}]}
+    p = tmp_path / "config.json"
+    p.write_text(json.dumps(cfg))
+    with pytest.raises(ConfigError, match="tag_include"):
+        load_config(str(p))
+
+
+def test_load_config_rejects_zero_tag_pages(tmp_path):
+    cfg = {"repos": [{"owner": "x", "repo": "y", "watch": "tags", "label": "Z", "max_tag_pages": 0}]}
+    p = tmp_path / "config.json"
+    p.write_text(json.dumps(cfg))
+    with pytest.raises(ConfigError, match="max_tag_pages"):
+        load_config(str(p))
+
+
+def _sharding_config(tmp_path, sharding):
+    cfg = {
+        "sharding": sharding,
+        "repos": [{"owner": "x", "repo": "y", "watch": "tags", "label": "Z"}],
+    }
+    p = tmp_path / "config.json"
+    p.write_text(json.dumps(cfg))
+    return str(p)
+
+
+def test_load_config_sharding_count_becomes_names(tmp_path):
+    result = load_config(_sharding_config(tmp_path, {"shards": 2}))
+    assert result["sharding"] == {
+        "shards": ["shard-0", "shard-1"], "local_shards": None, "dir": "shards",
+    }
+
+
+def test_load_config_rejects_unknown_local_shard(tmp_path):
+    with pytest.raises(ConfigError, match="local_shards"):
+        load_config(_sharding_config(tmp_path, {"shards": ["a"], "local_shards": ["b"]}))
+
+
+def test_load_config_rejects_duplicate_shards(tmp_path):
+    with pytest.raises(ConfigError, match="unique"):
+        load_config(_sharding_config(tmp_path, {"shards": ["a", "a"]}))
+
+
+def test_load_config_rejects_bad_api_base_url(tmp_path):
+    cfg = {
+        "api_base_url": "proxy.local:8787",
+        "repos": [{"owner": "x", "repo": "y", "watch": "tags", "label": "Z"}],
+    }
+    p = tmp_path / "config.json"
+    p.write_text(json.dumps(cfg))
+    with pytest.raises(ConfigError, match="api_base_url"):
+        load_config(str(p))
+
+
+def test_load_config_engine_defaults(tmp_path):
+    cfg = {"repos": [{"owner": "x", "repo": "y", "watch": "tags", "label": "Z"}]}
+    p = tmp_path / "config.json"
+    p.write_text(json.dumps(cfg))
+    result = load_config(str(p))
+    assert result["engine"] == "threads"
+    assert result["max_concurrency"] == 20
+    assert result["max_response_bytes"] == 10 * 1024 * 1024
+
+
+def test_load_config_rejects_bad_max_response_bytes(tmp_path):
+    cfg = {"max_response_bytes": 0, "repos": [{"owner": "x", "repo": "y", "watch": "tags", "label": "Z"}]}
+    p = tmp_path / "config.json"
+    p.write_text(json.dumps(cfg))
+    with pytest.raises(ConfigError, match="max_response_bytes"):
+        load_config(str(p))
+
+
+def test_load_config_rejects_unknown_engine(tmp_path):
+    cfg = {"engine": "gevent", "repos": [{"owner": "x", "repo": "y", "watch": "tags", "label": "Z"}]}
+    p = tmp_path / "config.json"
+    p.write_text(json.dumps(cfg))
+    with pytest.raises(ConfigError, match="engine"):
+        load_config(str(p))
+
+
+def test_load_config_profiling_defaults(tmp_path):
+    cfg = {"repos": [{"owner": "x", "repo": "y", "watch": "tags", "label": "Z"}]}
+    p = tmp_path / "config.json"
+    p.write_text(json.dumps(cfg))
+    result = load_config(str(p))
+    assert result["profiling"] == {"enabled": False, "every_n_cycles": 10, "keep": 20, "top": 25, "dir": "profiles"}
+
+
+def test_load_config_rejects_bad_profiling_interval(tmp_path):
+    cfg = {
+        "profiling": {"enabled": True, "every_n_cycles": 0},
+        "repos": [{"owner": "x", "repo": "y", "watch": "tags", "label": "Z"}],
+    }
+    p = tmp_path / "config.json"
+    p.write_text(json.dumps(cfg))
+    with pytest.raises(ConfigError, match="every_n_cycles"):
+        load_config(str(p))
+
+
+def test_load_config_events_defaults(tmp_path):
+    cfg = {"events": {}, "repos": [{"owner": "x", "repo": "y", "watch": "tags", "label": "Z"}]}
+    p = tmp_path / "config.json"
+    p.write_text(json.dumps(cfg))
+    result = load_config(str(p))
+    assert result["events"] == {"log": "events.jsonl", "socket": "events.sock"}
+
+
+def test_load_config_event_prefilter(tmp_path):
+    repos = [{"owner": "x", "repo": "y", "watch": "tags", "label": "Z"}]
+    p = tmp_path / "config.json"
+    p.write_text(json.dumps({"event_prefilter": {"orgs": ["x"]}, "repos": repos}))
+    assert load_config(str(p))["event_prefilter"]["full_sweep_hours"] == 24
+    p.write_text(json.dumps({"event_prefilter": {"orgs": []}, "repos": repos}))
+    with pytest.raises(ConfigError, match="orgs"):
+        load_config(str(p))
+    p.write_text(json.dumps({"event_prefilter": {"orgs": ["x"]}, "sharding": {"shards": 2}, "repos": repos}))
+    with pytest.raises(ConfigError, match="sharding"):
+        load_config(str(p))
@@ -0,0 +1,174 @@
+import pytest
+
+from cache_proxy import CachingProxy
+from checker import RepoChecker
+from event_filter import EventFeedFilter
+from git_refs import GitRefsClient
+from github_client import GitHubClient
+from state_store import StateStore
+from tests.stub_api import FakeClock
+
+
+REPOS = [
+    {"owner": "acme", "repo": f"r{i}", "watch": "tags" if i % 2 else "releases", "label": f"R{i}"}
+    for i in range(4)
+] + [{"owner": "solo", "repo": "tool", "watch": "releases", "label": "Tool"}]
+
+
+@pytest.fixture
+def stub_seed():
+    def seed(api):
+        for cfg in REPOS:
+            key = f"{cfg['owner']}/{cfg['repo']}"
+            api.set_release(key, 1, "v1.0")
+            api.set_tags(key, ["v1.0"])
+        api.add_event("acme/r0", "WatchEvent")
+    return seed
+
+
+@pytest.fixture
+def setup(stub, tmp_path):
+    clock = FakeClock()
+    state = StateStore(str(tmp_path / "state.json"))
+    client = GitHubClient(base_url=stub.url)
+    prefilter = EventFeedFilter(client, state, ["acme"], full_sweep_hours=24, clock=clock)
+    checker = RepoChecker(client, GitRefsClient(), state, clock=clock, prefilter=prefilter)
+    checker.check_all(REPOS)  # first cycle: baselines, feed cursor recorded
+    stub.clear_log()
+    return checker, prefilter, clock
+
+
+def _keys(repos):
+    return [f"{cfg['owner']}/{cfg['repo']}" for cfg in repos]
+
+
+def _next_cycle(clock):
+    clock.now += 3600
+
+
+def _checked(checker):
+    return [u["key"] for u in checker.check_all(REPOS)["updates"]]
+
+
+def test_quiet_feed_skips_org_repos(stub, setup):
+    checker, prefilter, clock = setup
+    _next_cycle(clock)
+    assert _keys(prefilter.select(REPOS)) == ["solo/tool"]
+    assert stub.requests_for("/orgs/acme/events") == 1
+    assert "If-None-Match" in stub.request_headers[0]
+
+
+def test_release_and_tag_events_select_their_repos(stub, setup):
+    checker, prefilter, clock = setup
+    stub.set_release("acme/r2", 2, "v2.0")
+    stub.add_event("acme/r2", "ReleaseEvent")
+    stub.add_tag("acme/r3", "v1.1")
+    stub.add_event("acme/r3", "CreateEvent", ref_type="tag")
+    stub.add_event("acme/r1", "CreateEvent", ref_type="branch")
+    _next_cycle(clock)
+    cycle = checker.check_all(REPOS)
+    assert [u["key"] for u in cycle["updates"]] == ["acme/r2", "acme/r3", "solo/tool"]
+    assert {u["key"] for u in cycle["notifications"]} == {"acme/r2", "acme/r3"}
+
+    _next_cycle(clock)
+    assert _keys(prefilter.select(REPOS)) == ["solo/tool"]  # cursor moved past them
+
+
+def test_poll_interval_is_respected(stub, setup):
+    checker, _, clock = setup
+    stub.poll_interval = 7200
+    stub.add_event("acme/r0", "ReleaseEvent")
+    _next_cycle(clock)
+    assert "acme/r0" in _checked(checker)
+    stub.add_event("acme/r1", "ReleaseEvent")
+    _next_cycle(clock)
+    assert _checked(checker) == ["solo/tool"]  # too soon to poll again
+    _next_cycle(clock)
+    assert "acme/r1" in _checked(checker)
+    assert stub.requests_for("/orgs/acme/events") == 2
+
+
+def test_gap_in_feed_checks_every_org_repo(stub, setup):
+    _, prefilter, clock = setup
+    for _ in range(350):  # more than max_pages * 100 events since the cursor
+        stub.add_event("acme/r0", "WatchEvent")
+    _next_cycle(clock)
+    assert _keys(prefilter.select(REPOS)) == _keys(REPOS)
+
+
+def test_periodic_full_sweep(stub, setup):
+    checker, _, clock = setup
+    clock.now += 25 * 3600
+    assert _checked(checker) == _keys(REPOS)
+    _next_cycle(clock)
+    assert _checked(checker) == ["solo/tool"]
+
+
+def test_sweep_while_poll_is_throttled_happens_once(stub, setup):
+    checker, _, clock = setup
+    stub.poll_interval = 48 * 3600
+    stub.add_event("acme/r0", "WatchEvent")  # a 200, so the new interval is read
+    _next_cycle(clock)
+    checker.check_all(REPOS)
+    clock.now += 25 * 3600  # sweep due, next poll still a day away
+    assert _checked(checker) == _keys(REPOS)
+    _next_cycle(clock)
+    assert _checked(checker) == ["solo/tool"]
+
+
+def test_feed_is_polled_through_the_caching_proxy(stub, tmp_path):
+    proxy = CachingProxy(upstream=stub.url, ttl=0)
+    server = proxy.serve(port=0)
+    try:
+        clock = FakeClock()
+        state = StateStore(str(tmp_path / "state.json"))
+        client = GitHubClient(base_url=f"http://127.0.0.1:{server.server_address[1]}")
+        prefilter = EventFeedFilter(client, state, ["acme"], clock=clock)
+        checker = RepoChecker(client, GitRefsClient(), state, clock=clock, prefilter=prefilter)
+        stub.poll_interval = 120
+        checker.check_all(REPOS)
+        _next_cycle(clock)
+        assert _keys(prefilter.select(REPOS)) == ["solo/tool"]
+        assert prefilter.stats["polled"] == 2
+        assert state.get_section("event_feeds")["acme"]["poll_interval"] == 120
+    finally:
+        proxy.shutdown()
+
+
+def test_failed_fetch_stays_pending_until_it_succeeds(stub, setup):
+    checker, prefilter, clock = setup
+    stub.set_release("acme/r2", 2, "v2.0")
+    stub.add_event("acme/r2", "ReleaseEvent")
+    stub.errors["acme/r2"] = 502
+    _next_cycle(clock)
+    cycle = checker.check_all(REPOS)
+    assert cycle["any_error"] and cycle["notifications"] == []
+
+    # No new events, but the consumed one is not forgotten
+    _next_cycle(clock)
+    assert _keys(prefilter.select(REPOS)) == ["acme/r2", "solo/tool"]
+    del stub.errors["acme/r2"]
+    _next_cycle(clock)
+    assert [u["key"] for u in checker.check_all(REPOS)["notifications"]] == ["acme/r2"]
+    _next_cycle(clock)
+    assert _checked(checker) == ["solo/tool"]
+
+
+def test_feed_state_has_its_own_section(setup):
+    checker, _, _ = setup
+    assert not any(key.startswith("events:") for key in checker.state.data)
+    assert checker.state.get_section("event_feeds")["acme"]["pending"] == []
+
+
+def test_feed_error_checks_every_org_repo(stub, setup):
+    _, prefilter, clock = setup
+    stub.rate_limit_reset = 1
+    _next_cycle(clock)
+    assert _keys(prefilter.select(REPOS)) == _keys(REPOS)
+
+
+def test_new_repo_in_config_is_checked(stub, setup):
+    _, prefilter, clock = setup
+    added = {"owner": "acme", "repo": "fresh", "watch": "releases", "label": "Fresh"}
+    _next_cycle(clock)
+    assert _keys(prefilter.select(REPOS + [added])) == ["solo/tool", "acme/fresh"]
@@ -0,0 +1,150 @@
+import os
+import socket
+import tempfile
+import threading
+import time
+
+import pytest
+
+from checker import RepoChecker
+from events import EventLog, EventServer, subscribe
+from git_refs import GitRefsClient
+from github_client import GitHubClient
+from state_store import StateStore
+from tests.stub_api import StubGitHubAPI
+
+
+TAGS = {"owner": "acme", "repo": "widget", "watch": "tags", "label": "Widget"}
+
+
+def _publish(log, n, repo="a/b"):
+    return [log.publish(repo, "tags", f"v{i}", f"v{i + 1}", "new", "api:tags") for i in range(n)]
+
+
+@pytest.fixture
+def sock_dir():
+    # Unix socket paths are limited to ~104 bytes; keep them short on macOS
+    with tempfile.TemporaryDirectory(prefix="ev", dir="/tmp") as d:
+        yield d
+
+
+def test_offsets_are_dense_and_survive_reopen(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    assert _publish(EventLog(path), 3) == [0, 1, 2]
+    log = EventLog(path)
+    assert log.next_offset == 3
+    assert _publish(log, 1) == [3]
+    assert [e["offset"] for e in log.read_from(0)] == [0, 1, 2, 3]
+
+
+def test_read_from_uses_index(tmp_path):
+    log = EventLog(str(tmp_path / "events.jsonl"), index_every=4)
+    _publish(log, 11)
+    assert [e["offset"] for e in log.read_from(9)] == [9, 10]
+    assert [e["offset"] for e in log.read_from(5, limit=2)] == [5, 6]
+    assert log.read_from(11) == []
+    reopened = EventLog(log.path, index_every=4)
+    assert reopened._index_offsets == [0, 4, 8]
+    assert [e["new_version"] for e in reopened.read_from(8)] == ["v9", "v10", "v11"]
+
+
+def test_torn_last_line_is_dropped_on_recovery(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    _publish(EventLog(path), 2)
+    with open(path, "ab") as f:
+        f.write(b'{"offset": 2, "repo": "a/')
+    log = EventLog(path)
+    assert log.next_offset == 2
+    assert log.publish("c/d", "releases", None, "v1", "baseline", "api:releases") == 2
+    assert [e["repo"] for e in log.read_from(0)] == ["a/b", "a/b", "c/d"]
+
+
+def test_corrupt_record_mid_log_is_skipped_not_truncated(tmp_path):
+    path = tmp_path / "events.jsonl"
+    _publish(EventLog(str(path)), 4)
+    lines = path.read_bytes().splitlines(keepends=True)
+    lines[1] = b'{"offset": 1, "repo": garbage\n'
+    path.write_bytes(b"".join(lines))
+    log = EventLog(str(path))
+    assert log.next_offset == 4
+    assert [e["offset"] for e in log.read_from(0)] == [0, 2, 3]
+    assert log.publish("c/d", "releases", None, "v1", "baseline", "api:releases") == 4
+    assert len(path.read_bytes().splitlines()) == 5
+
+
+def test_checker_publishes_changes_with_old_and_new_version(tmp_path):
+    log = EventLog(str(tmp_path / "events.jsonl"))
+    with StubGitHubAPI() as stub:
+        checker = RepoChecker(
+            GitHubClient(base_url=stub.url), GitRefsClient(),
+            StateStore(str(tmp_path / "state.json")), events=log,
+        )
+        stub.set_tags("acme/widget", ["v1.0"])
+        checker.check_repo("acme/widget", TAGS)
+        checker.check_repo("acme/widget", TAGS)  # unchanged: nothing published
+        stub.add_tag("acme/widget", "v1.1")
+        result = checker.check_repo("acme/widget", TAGS)
+    assert result["previous"] == "v1.0"
+    events = log.read_from(0)
+    assert [(e["old_version"], e["new_version"], e["status"]) for e in events] == [
+        (None, "v1.0", "baseline"), ("v1.0", "v1.1", "new"),
+    ]
+    assert events[1]["repo"] == "acme/widget"
+    assert events[1]["watch"] == "tags"
+    assert isinstance(events[1]["detected_at"], float)
+
+
+def test_subscriber_gets_backlog_then_live_events(tmp_path, sock_dir):
+    log = EventLog(str(tmp_path / "events.jsonl"))
+    _publish(log, 3)
+    server = EventServer(log, os.path.join(sock_dir, "e.sock"), poll_interval=0.1).start()
+    try:
+        stream = subscribe(server.path, offset=1, timeout=5)
+        assert [next(stream)["offset"] for _ in range(2)] == [1, 2]
+        threading.Timer(0.1, _publish, args=(log, 1, "c/d")).start()
+        live = next(stream)
+        assert (live["offset"], live["repo"]) == (3, "c/d")
+        stream.close()
+    finally:
+        server.stop()
+    assert not os.path.exists(server.path)
+
+
+def test_subscriber_without_offset_gets_only_new_events(tmp_path, sock_dir):
+    log = EventLog(str(tmp_path / "events.jsonl"))
+    _publish(log, 2)
+    server = EventServer(log, os.path.join(sock_dir, "e.sock"), poll_interval=0.1).start()
+    try:
+        stream = subscribe(server.path, timeout=5)
+        threading.Timer(0.2, _publish, args=(log, 1)).start()
+        assert next(stream)["offset"] == 2
+        stream.close()
+    finally:
+        server.stop()
+
+
+def test_bad_offset_is_rejected(tmp_path, sock_dir):
+    log = EventLog(str(tmp_path / "events.jsonl"))
+    server = EventServer(log, os.path.join(sock_dir, "e.sock")).start()
+    try:
+        assert "error" in next(subscribe(server.path, offset=-1, timeout=5))
+    finally:
+        server.stop()
+
+
+def test_server_drops_idle_subscriber_that_disconnects(tmp_path, sock_dir):
+    log = EventLog(str(tmp_path / "events.jsonl"))
+    server = EventServer(log, os.path.join(sock_dir, "e.sock"), poll_interval=0.05).start()
+    try:
+        before = threading.active_count()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(server.path)
+            sock.sendall(b"{}\n")
+            time.sleep(0.2)
+            assert threading.active_count() == before + 1
+        deadline = time.time() + 5
+        while threading.active_count() > before and time.time() < deadline:
+            time.sleep(0.05)
+        assert threading.active_count() == before
+    finally:
+        server.stop()
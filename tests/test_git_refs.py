@@ -0,0 +1,166 @@
+import os
+import shutil
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from git_refs import GitRefsClient, _iter_pkt_lines
+from github_client import GitHubAPIError, NotFoundError
+from versions import TagFilter
+
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _git(*args, cwd):
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd, check=True, capture_output=True,
+    )
+
+
+def _rev_parse(ref, cwd):
+    return subprocess.run(
+        ["git", "rev-parse", ref], cwd=cwd, check=True, capture_output=True, text=True,
+    ).stdout.strip()
+
+
+class _GitHTTPHandler(BaseHTTPRequestHandler):
+    """Serve bare repos through `git http-backend`, like a real git host."""
+
+    project_root = None
+    requests_seen = []
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        self.requests_seen.append(path)
+        env = {
+            "PATH": os.environ.get("PATH", ""),
+            "GIT_PROJECT_ROOT": self.project_root,
+            "GIT_HTTP_EXPORT_ALL": "1",
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "REQUEST_METHOD": "GET",
+        }
+        out = subprocess.run(["git", "http-backend"], env=env, capture_output=True).stdout
+        head, _, body = out.partition(b"\r\n\r\n")
+        status = 200
+        headers = []
+        for line in head.decode().split("\r\n"):
+            name, _, value = line.partition(": ")
+            if name == "Status":
+                status = int(value.split()[0])
+            elif name:
+                headers.append((name, value))
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def git_server(tmp_path):
+    root = tmp_path / "srv"
+    (root / "acme").mkdir(parents=True)
+    bare = root / "acme" / "widget.git"
+    _git("init", "-q", "--bare", str(bare), cwd=tmp_path)
+
+    work = tmp_path / "work"
+    _git("init", "-q", str(work), cwd=tmp_path)
+    _git("commit", "-q", "--allow-empty", "-m", "one", cwd=work)
+    _git("tag", "v1.2.0", cwd=work)
+    _git("commit", "-q", "--allow-empty", "-m", "two", cwd=work)
+    _git("tag", "-a", "v1.10.0", "-m", "annotated", cwd=work)
+    _git("commit", "-q", "--allow-empty", "-m", "three", cwd=work)
+    _git("tag", "v1.9.3", cwd=work)
+    _git("push", "-q", str(bare), "HEAD:refs/heads/main", "--tags", cwd=work)
+
+    handler = type("Handler", (_GitHTTPHandler,), {"project_root": str(root), "requests_seen": []})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield {
+            "url": f"http://127.0.0.1:{server.server_address[1]}",
+            "work": work,
+            "bare": bare,
+            "handler": handler,
+        }
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class TestPktLines:
+    def test_lines_split_across_chunks(self):
+        data = b"000ahello\n0000" + b"0009world"
+        chunks = [data[i:i + 3] for i in range(0, len(data), 3)]
+        assert list(_iter_pkt_lines(chunks)) == [b"hello\n", None, b"world"]
+
+    def test_truncated_stream_raises(self):
+        with pytest.raises(GitHubAPIError, match="Truncated"):
+            list(_iter_pkt_lines([b"000ahel"]))
+
+    def test_malformed_length_raises(self):
+        with pytest.raises(GitHubAPIError, match="Malformed"):
+            list(_iter_pkt_lines([b"zzzzhello"]))
+
+
+class TestFetchLatestTag:
+    def test_picks_highest_version(self, git_server):
+        client = GitRefsClient(base_url=git_server["url"])
+        result = client.fetch_latest_tag("acme", "widget")
+        assert result["tag_name"] == "v1.10.0"
+        assert result["etag"].startswith('"git-')
+
+    def test_tag_filter_applies(self, git_server):
+        client = GitRefsClient(base_url=git_server["url"])
+        result = client.fetch_latest_tag(
+            "acme", "widget", tag_filter=TagFilter(exclude=["v1.1*"]),
+        )
+        assert result["tag_name"] == "v1.9.3"
+
+    def test_annotated_tag_reports_commit_sha(self, git_server):
+        client = GitRefsClient(base_url=git_server["url"])
+        result = client.fetch_latest_tag("acme", "widget")
+        assert result["commit_sha"] == _rev_parse("v1.10.0^{commit}", git_server["work"])
+
+    def test_unchanged_advertisement_returns_none(self, git_server):
+        client = GitRefsClient(base_url=git_server["url"])
+        first = client.fetch_latest_tag("acme", "widget")
+        assert client.fetch_latest_tag("acme", "widget", etag=first["etag"]) is None
+
+    def test_new_tag_changes_hash(self, git_server):
+        client = GitRefsClient(base_url=git_server["url"])
+        first = client.fetch_latest_tag("acme", "widget")
+        work = git_server["work"]
+        _git("commit", "-q", "--allow-empty", "-m", "four", cwd=work)
+        _git("tag", "v2.0.0", cwd=work)
+        _git("push", "-q", str(git_server["bare"]), "--tags", cwd=work)
+        result = client.fetch_latest_tag("acme", "widget", etag=first["etag"])
+        assert result["tag_name"] == "v2.0.0"
+        assert result["commit_sha"] == _rev_parse("HEAD", work)
+
+    def test_uses_smart_http_endpoint(self, git_server):
+        client = GitRefsClient(base_url=git_server["url"])
+        client.fetch_latest_tag("acme", "widget")
+        assert git_server["handler"].requests_seen == ["/acme/widget.git/info/refs"]
+
+    def test_repo_without_tags_is_negative(self, git_server, tmp_path):
+        _git("init", "-q", "--bare", str(tmp_path / "srv" / "acme" / "empty.git"), cwd=tmp_path)
+        client = GitRefsClient(base_url=git_server["url"])
+        result = client.fetch_latest_tag("acme", "empty")
+        assert result["negative"] == "no_tags"
+        assert client.fetch_latest_tag("acme", "empty", etag=result["etag"]) is None
+
+    def test_missing_repo_raises(self, git_server):
+        client = GitRefsClient(base_url=git_server["url"])
+        with pytest.raises(NotFoundError):
+            client.fetch_latest_tag("acme", "nope")
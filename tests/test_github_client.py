@@ -1,6 +1,9 @@
+import json
+
 import pytest
 from unittest.mock import patch, MagicMock
 from github_client import GitHubClient, RateLimitError, GitHubAPIError
+from versions import TagFilter
 
 
 @pytest.fixture
@@ -13,10 +16,15 @@ def authed_client():
     return GitHubClient(token="ghp_test123")
 
 
-def _mock_response(status_code, json_data=None, headers=None):
+def _mock_response(status_code, json_data=None, headers=None, chunk_size=7):
+    body = json.dumps(json_data if json_data is not None else {}).encode()
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
     resp = MagicMock()
     resp.status_code = status_code
     resp.json.return_value = json_data or {}
+    resp.content = body
+    # The client streams bodies; small chunks exercise the incremental parser
+    resp.iter_content.side_effect = lambda chunk_size=1: iter(chunks)
     resp.headers = headers or {}
     return resp
 
@@ -147,3 +155,147 @@ class TestTimeout:
         client.fetch_latest_release("x", "y")
         _, kwargs = mock_get.call_args
         assert kwargs["timeout"] == 30
+
+
+def _tag_page(*names):
+    return [{"name": n, "commit": {"sha": f"sha-{n}"}} for n in names]
+
+
+class TestScanTags:
+    @patch("github_client._TAGS_PER_PAGE", 3)
+    @patch("github_client.requests.get")
+    def test_ranks_by_version_not_listing_order(self, mock_get, client):
+        mock_get.return_value = _mock_response(
+            200, _tag_page("v5.15.180", "v6.9"), {"ETag": '"p1"'},
+        )
+        result = client.scan_tags("torvalds", "linux")
+        assert result["tag_name"] == "v6.9"
+        assert result["commit_sha"] == "sha-v6.9"
+        assert result["etag"] == '"p1"'
+        assert result["requests"] == 1
+
+    @patch("github_client._TAGS_PER_PAGE", 3)
+    @patch("github_client.requests.get")
+    def test_stops_at_known_tags(self, mock_get, client):
+        mock_get.side_effect = [
+            _mock_response(200, _tag_page("v3.0", "v2.1", "v2.2"), {"ETag": '"p1"'}),
+            _mock_response(200, _tag_page("v2.0", "v1.0", "v0.9")),
+            _mock_response(200, _tag_page("v0.1")),
+        ]
+        result = client.scan_tags("x", "y", known_tags=["v2.0"], max_pages=5)
+        assert result["tag_name"] == "v3.0"
+        assert result["known_tags"] == ["v3.0", "v2.1", "v2.2"]
+        assert result["requests"] == 2
+        assert mock_get.call_count == 2
+
+    @patch("github_client._TAGS_PER_PAGE", 2)
+    @patch("github_client.requests.get")
+    def test_first_scan_respects_max_pages(self, mock_get, client):
+        mock_get.side_effect = [
+            _mock_response(200, _tag_page("v1.0", "v1.1")),
+            _mock_response(200, _tag_page("v1.2", "v1.3")),
+            _mock_response(200, _tag_page("v9.0", "v9.1")),
+        ]
+        result = client.scan_tags("x", "y", max_pages=2)
+        assert result["tag_name"] == "v1.3"
+        assert mock_get.call_count == 2
+        assert client.request_count == 2
+
+    @patch("github_client._TAGS_PER_PAGE", 1)
+    @patch("github_client.requests.get")
+    def test_current_tag_kept_when_not_outranked(self, mock_get, client):
+        mock_get.return_value = _mock_response(200, _tag_page("v5.15.180"), {"ETag": '"p1"'})
+        result = client.scan_tags(
+            "x", "y", known_tags=["v5.15.180"], current={"tag_name": "v6.9", "commit_sha": "abc"},
+        )
+        assert result["tag_name"] == "v6.9"
+        assert result["commit_sha"] == "abc"
+        assert result["etag"] == '"p1"'
+        assert mock_get.call_count == 1
+
+    @patch("github_client.requests.get")
+    def test_deleted_current_tag_is_dropped(self, mock_get, client):
+        mock_get.return_value = _mock_response(200, _tag_page("v5.15.180"))
+        result = client.scan_tags(
+            "x", "y", known_tags=["v5.15.180"], current={"tag_name": "v6.9", "commit_sha": "abc"},
+        )
+        assert result["tag_name"] == "v5.15.180"
+
+    @patch("github_client.requests.get")
+    def test_known_tag_moved_to_new_commit_is_detected(self, mock_get, client):
+        mock_get.return_value = _mock_response(200, _tag_page("v6.9", "v5.15.180"))
+        result = client.scan_tags(
+            "x", "y", known_tags=["v6.9", "v5.15.180"], current={"tag_name": "v6.9", "commit_sha": "old"},
+        )
+        assert result["tag_name"] == "v6.9"
+        assert result["commit_sha"] == "sha-v6.9"
+
+    @patch("github_client.requests.get")
+    def test_filter_skips_prereleases_and_excluded(self, mock_get, client):
+        mock_get.return_value = _mock_response(
+            200, _tag_page("v2.0.0-rc.1", "tools-v9.0", "v1.5.0"),
+        )
+        result = client.scan_tags("x", "y", tag_filter=TagFilter(include=["v*"]))
+        assert result["tag_name"] == "v1.5.0"
+
+    @patch("github_client.requests.get")
+    def test_304_returns_none(self, mock_get, client):
+        mock_get.return_value = _mock_response(304)
+        assert client.scan_tags("x", "y", etag='"p1"') is None
+        _, kwargs = mock_get.call_args
+        assert kwargs["headers"]["If-None-Match"] == '"p1"'
+        assert kwargs["params"] == {"per_page": 100, "page": 1}
+
+
+class TestFetchReleaseDetails:
+    @patch("github_client.requests.get")
+    def test_returns_notes_and_assets(self, mock_get, client):
+        mock_get.return_value = _mock_response(200, {
+            "tag_name": "v2.0", "name": "Two", "body": "Notes", "published_at": "2024-05-01T00:00:00Z",
+            "html_url": "https://github.com/a/b/releases/tag/v2.0",
+            "assets": [{"name": "b.tar.gz", "size": 2048, "download_count": 7, "uploader": {}}],
+        }, {"ETag": '"d1"'})
+        details = client.fetch_release_details("a", "b", "v2.0")
+        assert details["body"] == "Notes"
+        assert details["assets"] == [{"name": "b.tar.gz", "size": 2048, "download_count": 7}]
+        assert details["etag"] == '"d1"'
+
+    @patch("github_client.requests.get")
+    def test_tag_is_url_quoted(self, mock_get, client):
+        mock_get.return_value = _mock_response(304)
+        assert client.fetch_release_details("a", "b", "release/1.0", etag='"d1"') is None
+        assert mock_get.call_args[0][0].endswith("/releases/tags/release%2F1.0")
+
+
+class TestStreamedBodies:
+    @patch("github_client.requests.get")
+    def test_release_stops_reading_after_wanted_fields(self, mock_get, client):
+        resp = _mock_response(200, {
+            "id": 1, "tag_name": "v1.0", "name": "One", "body": "x" * 50_000, "assets": [],
+        }, chunk_size=64)
+        mock_get.return_value = resp
+        chunks = iter(resp.iter_content())
+        resp.iter_content.side_effect = lambda chunk_size=1: chunks
+        result = client.fetch_latest_release("x", "y")
+        assert result["tag_name"] == "v1.0"
+        assert len(list(chunks)) > 700  # the notes were never read
+        assert mock_get.call_args[1]["stream"] is True
+        resp.close.assert_called_once()
+
+    @patch("github_client.requests.get")
+    def test_oversized_body_raises_api_error(self, mock_get):
+        client = GitHubClient(max_response_bytes=1000)
+        mock_get.return_value = _mock_response(200, _tag_page(*(f"v{i}" for i in range(100))))
+        with pytest.raises(GitHubAPIError, match="exceeds 1000 bytes"):
+            client.scan_tags("x", "y")
+        mock_get.return_value.close.assert_called_once()
+
+    @patch("github_client.requests.get")
+    def test_org_events_keep_only_needed_fields(self, mock_get, client):
+        mock_get.return_value = _mock_response(200, [{
+            "id": "7", "type": "ReleaseEvent", "actor": {"login": "a"},
+            "repo": {"id": 1, "name": "o/r", "url": "u"},
+            "payload": {"action": "published", "release": {"body": "notes", "assets": []}},
+        }])
+        result = client.fetch_org_events("o")
+        assert result["events"] == [{"id": "7", "type": "ReleaseEvent", "repo": {"name": "o/r"}, "payload": {}}]
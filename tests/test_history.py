@@ -0,0 +1,130 @@
+import time
+
+from history_store import HistoryStore, main
+
+DAY = 86400
+
+
+def test_empty_history(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.log"))
+    assert store.range(0) == []
+    assert store.recent() == []
+
+
+def test_record_and_range(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.log"))
+    store.record("a/b", "v1.0", "api:tags", detected_at=100)
+    store.record("c/d", "v2.0", "api:releases", detected_at=200)
+    store.record("a/b", "v1.1", "git:tags", detected_at=300)
+    assert [e["version"] for e in store.range(150, 300)] == ["v2.0", "v1.1"]
+    assert [e["version"] for e in store.range(0, repo="a/b")] == ["v1.0", "v1.1"]
+    assert store.range(0)[0] == {
+        "detected_at": 100.0, "repo": "a/b", "version": "v1.0", "source": "api:tags",
+    }
+
+
+def test_recent_is_newest_first(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.log"))
+    now = time.time()
+    store.record("a/b", "old", "api:tags", detected_at=now - 2 * DAY)
+    store.record("a/b", "v1", "api:tags", detected_at=now - 3600)
+    store.record("c/d", "v2", "api:tags", detected_at=now - 60)
+    assert [e["version"] for e in store.recent(24)] == ["v2", "v1"]
+
+
+def test_timestamps_never_go_backwards(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.log"))
+    store.record("a/b", "v1", "api:tags", detected_at=500)
+    store.record("a/b", "v2", "api:tags", detected_at=400)
+    assert [e["detected_at"] for e in store.range(0)] == [500.0, 500.0]
+
+
+def test_index_is_sparse_and_persisted(tmp_path):
+    path = str(tmp_path / "history.log")
+    store = HistoryStore(path, index_every=10)
+    for i in range(95):
+        store.record("a/b", f"v{i}", "api:tags", detected_at=i)
+    assert len(store._index_offsets) == 10
+
+    reloaded = HistoryStore(path, index_every=10)
+    assert reloaded._index_offsets == store._index_offsets
+    assert [e["version"] for e in reloaded.range(42, 44)] == ["v42", "v43", "v44"]
+    reloaded.record("a/b", "v95", "api:tags", detected_at=95)
+    reloaded.record("a/b", "v96", "api:tags", detected_at=96)
+    assert len(reloaded._index_offsets) == 10
+    assert [e["version"] for e in reloaded.range(95)] == ["v95", "v96"]
+
+
+def test_missing_index_is_rebuilt(tmp_path):
+    path = tmp_path / "history.log"
+    store = HistoryStore(str(path), index_every=10)
+    for i in range(25):
+        store.record("a/b", f"v{i}", "api:tags", detected_at=i)
+    (tmp_path / "history.log.idx").unlink()
+
+    rebuilt = HistoryStore(str(path), index_every=10)
+    assert rebuilt._index_offsets == store._index_offsets
+    assert [e["version"] for e in rebuilt.range(24)] == ["v24"]
+
+
+def test_range_skips_partial_trailing_line(tmp_path):
+    path = tmp_path / "history.log"
+    store = HistoryStore(str(path))
+    store.record("a/b", "v1", "api:tags", detected_at=1)
+    with open(path, "a") as f:
+        f.write("2.000\ta/b\tv2")
+    assert [e["version"] for e in store.range(0)] == ["v1"]
+
+
+def test_compact_drops_and_rolls_up(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.log"), index_every=2)
+    now = 1_000 * DAY
+    store.record("a/b", "ancient", "api:tags", detected_at=now - 400 * DAY)
+    store.record("a/b", "v1", "api:tags", detected_at=now - 60 * DAY)
+    store.record("c/d", "w1", "api:tags", detected_at=now - 60 * DAY + 10)
+    store.record("a/b", "v2", "api:tags", detected_at=now - 60 * DAY + 20)
+    store.record("a/b", "v3", "api:tags", detected_at=now - DAY)
+    store.record("a/b", "v4", "api:tags", detected_at=now - DAY + 1)
+
+    stats = store.compact(retention_days=365, rollup_after_days=30, now=now)
+    assert stats == {"kept": 4, "dropped": 1, "rolled_up": 1}
+    assert [e["version"] for e in store.range(0)] == ["w1", "v2", "v3", "v4"]
+    assert [e["version"] for e in store.range(now - 2 * DAY)] == ["v3", "v4"]
+
+    reloaded = HistoryStore(str(tmp_path / "history.log"), index_every=2)
+    assert reloaded._index_offsets == store._index_offsets
+
+
+def test_compact_noop_leaves_file(tmp_path):
+    path = tmp_path / "history.log"
+    store = HistoryStore(str(path))
+    store.record("a/b", "v1", "api:tags", detected_at=time.time())
+    before = path.read_bytes()
+    assert store.compact(365, 30)["dropped"] == 0
+    assert path.read_bytes() == before
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_compacts_only_when_enough_is_due(tmp_path):
+    path = str(tmp_path / "history.log")
+    store = HistoryStore(path, index_every=2)
+    now = 1_000 * DAY
+    for n in range(12):  # six index blocks, all due for rollup
+        store.record("a/b", f"v{n}", "api:tags", detected_at=now - 60 * DAY + n)
+    store.record("a/b", "fresh", "api:tags", detected_at=now - DAY)
+    assert not store.needs_compaction(365, 30, now=now, min_blocks=6)
+    assert store.needs_compaction(365, 30, now=now, min_blocks=5)
+
+    assert store.compact_if_needed(365, 30, now=now)["rolled_up"] == 11
+    # Rolled up through now - 30 days: nothing is due until more entries age
+    reloaded = HistoryStore(path, index_every=2)
+    assert not reloaded.needs_compaction(365, 30, now=now + DAY, min_blocks=1)
+    assert reloaded.compact_if_needed(365, 30, now=now + DAY) is None
+
+
+def test_cli_prints_recent(tmp_path, capsys):
+    path = str(tmp_path / "history.log")
+    HistoryStore(path).record("a/b", "v9.9", "api:releases")
+    assert main(["--path", path, "--hours", "1"]) == 0
+    out = capsys.readouterr().out
+    assert "a/b  v9.9  (api:releases)" in out
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from json_stream import ResponseTooLarge, extract_fields, iter_objects
+
+
+RELEASE = {
+    "url": "https://api.github.com/repos/o/r/releases/1",
+    "id": 1,
+    "author": {"login": "dev", "tricky": "}]\"{[", "list": [1, {"a": [2, 3]}]},
+    "tag_name": "v1.0",
+    "name": "Café ☕ \"quoted\" \\ release",
+    "draft": False,
+    "prerelease": True,
+    "published_at": None,
+    "assets": [
+        {"name": "a.tar.gz", "size": 10, "uploader": {"login": "bot"}, "download_count": 3},
+        {"name": "b.zip", "size": -1.5e3, "download_count": 0},
+    ],
+    "body": "é" * 5000,
+}
+
+
+def _chunks(data, size):
+    body = json.dumps(data, ensure_ascii=False).encode() if not isinstance(data, bytes) else data
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 64, 1 << 20])
+def test_chunk_boundaries_anywhere(size):
+    # 1-byte chunks split every multi-byte UTF-8 character and every token
+    spec = {"id": True, "tag_name": True, "name": True, "prerelease": True, "published_at": True}
+    assert extract_fields(_chunks(RELEASE, size), spec) == {k: RELEASE[k] for k in spec}
+
+
+@pytest.mark.parametrize("size", [1, 7, 4096])
+def test_nested_and_array_specs(size):
+    spec = {"author": {"list": True, "missing": True}, "assets": [{"name": True, "size": True}]}
+    assert extract_fields(_chunks(RELEASE, size), spec) == {
+        "author": {"list": RELEASE["author"]["list"]},
+        "assets": [{"name": "a.tar.gz", "size": 10}, {"name": "b.zip", "size": -1500.0}],
+    }
+
+
+def test_stops_once_all_fields_seen():
+    chunks = iter(_chunks(RELEASE, 16))
+    assert extract_fields(chunks, {"id": True, "tag_name": True}) == {"id": 1, "tag_name": "v1.0"}
+    assert len(list(chunks)) > 500  # the body was never read
+
+
+def test_missing_fields_are_absent():
+    assert extract_fields(_chunks({"a": 1}, 1), {"a": True, "b": True}) == {"a": 1}
+    assert extract_fields([b"{ }"], {"a": True}) == {}
+
+
+def test_spec_shape_mismatch_keeps_value():
+    assert extract_fields([b'{"commit": null}'], {"commit": {"sha": True}}) == {"commit": None}
+
+
+@pytest.mark.parametrize("size", [1, 3, 100])
+def test_iter_objects(size):
+    tags = [{"name": f"v{i}", "commit": {"sha": f"s{i}", "url": "u"}, "zipball_url": "z"} for i in range(20)]
+    parsed = list(iter_objects(_chunks(tags, size), {"name": True, "commit": {"sha": True}}))
+    assert parsed == [{"name": t["name"], "commit": {"sha": t["commit"]["sha"]}} for t in tags]
+    assert list(iter_objects([b" [ ] "], {"name": True})) == []
+
+
+def test_byte_cap():
+    with pytest.raises(ResponseTooLarge):
+        extract_fields(_chunks(RELEASE, 100), {"body": True}, max_bytes=1000)
+    # Fields found before the cap is reached are enough
+    assert extract_fields(_chunks(RELEASE, 100), {"id": True}, max_bytes=1000) == {"id": 1}
+
+
+@pytest.mark.parametrize("body", [
+    b'{"id": 1',                 # truncated
+    b'{"id": tru}',              # bad literal
+    b'{"id" 1}',                 # missing colon
+    b'{"id": 1 "x": 2}',         # missing comma
+    b'{"name": "unterminated',   # truncated string
+])
+def test_malformed_input_raises(body):
+    with pytest.raises(ValueError):
+        extract_fields(_chunks(body, 3), {"id": True, "name": True, "x": True})
@@ -0,0 +1,87 @@
+import json
+import os
+
+import profiling
+from profiling import CycleProfiler, span
+from state_store import StateStore
+
+
+def _cycle_dirs(profiler):
+    return sorted(os.listdir(profiler.directory))
+
+
+def test_span_is_noop_outside_a_sampled_cycle():
+    assert profiling._active is None
+    with span("state_save") as s:
+        pass
+    assert s is profiling._NOOP
+
+
+def test_samples_every_nth_cycle(tmp_path):
+    profiler = CycleProfiler(str(tmp_path / "profiles"), every_n_cycles=3)
+    sampled = []
+    for _ in range(7):
+        with profiler.cycle() as profile:
+            sampled.append(profile is not None)
+    assert sampled == [True, False, False, True, False, False, True]
+    assert len(_cycle_dirs(profiler)) == 3
+
+
+def test_sampled_cycle_writes_profile_allocations_and_spans(tmp_path):
+    profiler = CycleProfiler(str(tmp_path / "profiles"), every_n_cycles=1)
+    state = StateStore(str(tmp_path / "state.json"))
+    with profiler.cycle():
+        state.update("a/b", {"etag": "x"})
+        state.update("c/d", {"etag": "y"})
+    [name] = _cycle_dirs(profiler)
+    path = os.path.join(profiler.directory, name)
+    assert set(os.listdir(path)) == {"cprofile.prof", "cprofile.txt", "tracemalloc.txt", "spans.json"}
+    spans = json.load(open(os.path.join(path, "spans.json")))
+    assert spans["state_save"]["count"] == 2
+    assert spans["cycle"]["count"] == 1
+    assert spans["cycle"]["total_s"] >= spans["state_save"]["total_s"]
+    assert "peak" in open(os.path.join(path, "tracemalloc.txt")).read()
+    assert profiling._active is None
+
+
+def test_late_span_is_added_to_last_sampled_cycle_once(tmp_path):
+    profiler = CycleProfiler(str(tmp_path / "profiles"), every_n_cycles=1)
+    with profiler.cycle():
+        pass
+    with profiler.late_span("ui_update"):
+        pass
+    with profiler.late_span("ui_update"):
+        pass
+    [name] = _cycle_dirs(profiler)
+    spans = json.load(open(os.path.join(profiler.directory, name, "spans.json")))
+    assert spans["ui_update"]["count"] == 1
+
+
+def test_keeps_only_newest_cycles(tmp_path):
+    profiler = CycleProfiler(str(tmp_path / "profiles"), every_n_cycles=1, keep=2)
+    for _ in range(5):
+        with profiler.cycle():
+            pass
+    assert [d.rsplit("-", 1)[1] for d in _cycle_dirs(profiler)] == ["000004", "000005"]
+
+
+def test_from_config_disabled_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv(profiling.ENV_VAR, raising=False)
+    assert CycleProfiler.from_config({"profiling": {"enabled": False}}, str(tmp_path)) is None
+
+
+def test_from_config_enabled(tmp_path, monkeypatch):
+    monkeypatch.delenv(profiling.ENV_VAR, raising=False)
+    cfg = {"profiling": {"enabled": True, "every_n_cycles": 4, "dir": "p", "keep": 3, "top": 10}}
+    profiler = CycleProfiler.from_config(cfg, str(tmp_path))
+    assert profiler.every_n_cycles == 4
+    assert profiler.keep == 3
+    assert profiler.top == 10
+    assert profiler.directory == str(tmp_path / "p")
+
+
+def test_env_var_overrides_config(tmp_path, monkeypatch):
+    monkeypatch.setenv(profiling.ENV_VAR, "2")
+    assert CycleProfiler.from_config({}, str(tmp_path)).every_n_cycles == 2
+    monkeypatch.setenv(profiling.ENV_VAR, "0")
+    assert CycleProfiler.from_config({"profiling": {"enabled": True}}, str(tmp_path)) is None
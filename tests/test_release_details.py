@@ -0,0 +1,78 @@
+import pytest
+
+from github_client import GitHubAPIError, GitHubClient
+from release_details import ReleaseDetailsCache, summarize
+from tests.stub_api import FakeClock
+
+
+def _cache(stub, clock, **kw):
+    return ReleaseDetailsCache(GitHubClient(base_url=stub.url), clock=clock, **kw)
+
+
+def test_fresh_entry_served_without_request(stub):
+    stub.set_release("a/b", 1, "v1.0", body="Fixes", assets=[])
+    clock = FakeClock(now=0.0)
+    cache = _cache(stub, clock)
+    assert cache.get("a", "b", "v1.0")["body"] == "Fixes"
+    assert cache.get("a", "b", "v1.0")["body"] == "Fixes"
+    assert stub.requests_for("/releases/tags/") == 1
+    assert cache.stats["hits"] == 1
+
+
+def test_stale_entry_revalidated_with_etag(stub):
+    stub.set_release("a/b", 1, "v1.0", body="Fixes")
+    clock = FakeClock(now=0.0)
+    cache = _cache(stub, clock, ttl=60)
+    cache.get("a", "b", "v1.0")
+    clock.now = 61
+    assert cache.get("a", "b", "v1.0")["body"] == "Fixes"
+    assert cache.stats["revalidated"] == 1
+    assert "If-None-Match" in stub.request_headers[-1]
+
+    stub.set_release("a/b", 1, "v1.0", body="Edited notes")
+    clock.now = 200
+    assert cache.get("a", "b", "v1.0")["body"] == "Edited notes"
+
+
+def test_evicts_least_recently_used_by_size(stub):
+    clock = FakeClock(now=0.0)
+    for n in range(3):
+        stub.set_release(f"a/r{n}", n, "v1", body="x" * 400)
+    cache = _cache(stub, clock, max_bytes=1200)
+    cache.get("a", "r0", "v1")
+    cache.get("a", "r1", "v1")
+    cache.get("a", "r0", "v1")  # r1 is now least recently used
+    cache.get("a", "r2", "v1")
+    assert len(cache) == 2
+    assert cache.size <= 1200
+    assert cache.stats["evicted"] == 1
+    cache.get("a", "r0", "v1")
+    assert cache.stats["hits"] == 2
+
+
+def test_oversized_details_are_not_cached(stub):
+    stub.set_release("a/b", 1, "v1", body="x" * 5000)
+    cache = _cache(stub, FakeClock(), max_bytes=1000)
+    assert len(cache.get("a", "b", "v1")["body"]) == 5000
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_missing_release_raises(stub):
+    stub.set_release("a/b", 1, "v1")
+    with pytest.raises(GitHubAPIError) as exc:
+        _cache(stub, FakeClock()).get("a", "b", "v2")
+    assert exc.value.status_code == 404
+
+
+def test_summarize_truncates_notes_and_lists_assets():
+    details = {
+        "published_at": "2024-05-01T12:00:00Z", "prerelease": True, "body": "n" * 50,
+        "assets": [{"name": f"f{i}", "size": 3 * 1024 * 1024} for i in range(12)],
+    }
+    text = summarize(details, max_notes=10)
+    assert text.startswith("Published 2024-05-01 (pre-release)")
+    assert "nnnnnnnnnn…" in text
+    assert "f0 (3 MB)" in text
+    assert "… and 2 more" in text
+    assert summarize({"body": "", "assets": []}) == "No release notes."
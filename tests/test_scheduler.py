@@ -0,0 +1,146 @@
+import threading
+
+from scheduler import Scheduler
+
+
+class FakeClock:
+    """Wall and monotonic clocks; suspend() advances only the wall clock."""
+
+    def __init__(self):
+        self.wall = 1_000_000.0
+        self.mono = 0.0
+
+    def advance(self, seconds):
+        self.wall += seconds
+        self.mono += seconds
+
+    def suspend(self, seconds):
+        self.wall += seconds
+
+
+def _scheduler(clock, **kwargs):
+    return Scheduler(clock=lambda: clock.wall, monotonic=lambda: clock.mono, **kwargs)
+
+
+def test_call_later_fires_when_due():
+    clock = FakeClock()
+    sched = _scheduler(clock)
+    fired = []
+    sched.call_later(10, lambda: fired.append("a"))
+    clock.advance(9)
+    sched.run_pending()
+    assert fired == []
+    clock.advance(1)
+    sched.run_pending()
+    assert fired == ["a"]
+    clock.advance(100)
+    sched.run_pending()
+    assert fired == ["a"]
+
+
+def test_call_every_repeats_with_first_delay():
+    clock = FakeClock()
+    sched = _scheduler(clock)
+    fired = []
+    event = sched.call_every(60, lambda: fired.append(clock.wall), first_delay=5)
+    for _ in range(130):
+        clock.advance(1)
+        sched.run_pending()
+    assert [t - 1_000_000 for t in fired] == [5, 65, 125]
+    assert event.due == 1_000_000 + 185
+
+
+def test_cancel():
+    clock = FakeClock()
+    sched = _scheduler(clock)
+    fired = []
+    event = sched.call_later(1, lambda: fired.append(1))
+    sched.cancel(event)
+    clock.advance(5)
+    sched.run_pending()
+    assert fired == []
+
+
+def test_late_recurring_event_is_coalesced():
+    clock = FakeClock()
+    sched = _scheduler(clock)
+    fired = []
+    event = sched.call_every(60, lambda: fired.append(1))
+    clock.advance(60 * 5 + 10)  # e.g. a long-blocked process, no suspend
+    sched.run_pending()
+    assert fired == [1]
+    assert event.due == 1_000_000 + 360
+
+
+def test_resume_spreads_catchup_instead_of_bursting():
+    clock = FakeClock()
+    resumed = []
+    sched = _scheduler(clock, resume_delay=15, catchup_spacing=30, on_resume=resumed.append)
+    fired = []
+    sched.call_every(3600, lambda: fired.append(("check", clock.wall)), name="check")
+    sched.call_every(3600, lambda: fired.append(("other", clock.wall)), first_delay=3000, name="other")
+
+    clock.suspend(3 * 3600)
+    assert sched.run_pending() == []
+    assert fired == []
+    assert resumed == [3 * 3600]
+
+    for _ in range(60):
+        clock.advance(1)
+        sched.run_pending()
+    woke = 1_000_000 + 3 * 3600
+    assert fired == [("other", woke + 15), ("check", woke + 45)]
+
+
+def test_skip_if_late_events_are_dropped_after_resume():
+    clock = FakeClock()
+    sched = _scheduler(clock)
+    fired = []
+    sched.call_later(100, lambda: fired.append("flash"), skip_if_late=True)
+    clock.suspend(600)
+    sched.run_pending()
+    clock.advance(120)
+    sched.run_pending()
+    assert fired == []
+
+
+def test_skip_if_late_events_still_fire_when_merely_late():
+    clock = FakeClock()
+    sched = _scheduler(clock)
+    fired = []
+    sched.call_later(100, lambda: fired.append("flash"), skip_if_late=True)
+    clock.advance(130)
+    sched.run_pending()
+    assert fired == ["flash"]
+
+
+def test_failing_callback_does_not_stop_others():
+    clock = FakeClock()
+    sched = _scheduler(clock)
+    fired = []
+    sched.call_later(1, lambda: 1 / 0)
+    sched.call_later(1, lambda: fired.append("ok"))
+    clock.advance(1)
+    sched.run_pending()
+    assert fired == ["ok"]
+
+
+def test_seconds_until_next_is_capped():
+    clock = FakeClock()
+    sched = _scheduler(clock, max_sleep=30)
+    assert sched.seconds_until_next() == 30
+    sched.call_later(5, lambda: None)
+    assert sched.seconds_until_next() == 5
+    sched.call_later(-5, lambda: None)
+    assert sched.seconds_until_next() == 0
+
+
+def test_thread_runs_events():
+    sched = Scheduler()
+    done = threading.Event()
+    sched.start()
+    try:
+        sched.call_later(0.05, done.set)
+        assert done.wait(2)
+    finally:
+        sched.stop()
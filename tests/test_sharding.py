@@ -0,0 +1,124 @@
+import json
+import os
+
+import pytest
+
+from checker import repo_key
+from sharding import HashRing, Supervisor, assign, merge_results, run_shard, state_path
+from tests.stub_api import make_repos
+
+
+@pytest.fixture
+def stub_seed():
+    def seed(api):
+        for i in range(12):
+            api.set_release(f"org/r{i}", i, f"v{i}.0")
+    return seed
+
+
+class TestHashRing:
+    def test_assignment_is_stable(self):
+        ring = HashRing(["a", "b", "c"])
+        assert all(ring.node_for(f"k{i}") == HashRing(["a", "b", "c"]).node_for(f"k{i}") for i in range(100))
+
+    def test_load_is_spread(self):
+        slices = assign(make_repos(1000), ["a", "b", "c", "d"])
+        assert all(150 < len(repos) < 350 for repos in slices.values())
+
+    def test_adding_a_shard_moves_few_repos(self):
+        repos = make_repos(1000)
+        before = {repo_key(c): s for s, cs in assign(repos, ["a", "b", "c", "d"]).items() for c in cs}
+        after = {repo_key(c): s for s, cs in assign(repos, ["a", "b", "c", "d", "e"]).items() for c in cs}
+        moved = [k for k in before if before[k] != after[k]]
+        assert all(after[k] == "e" for k in moved)
+        assert len(moved) < 300  # ideal is 1000 / 5 = 200
+
+
+class TestShardWorkers:
+    def test_shards_own_disjoint_state(self, stub, tmp_path):
+        shards = ["a", "b", "c"]
+        for shard in shards:
+            run_shard(shard, shards, make_repos(12), str(tmp_path), "c1", base_url=stub.url)
+        keys = [set(json.loads(open(state_path(str(tmp_path), s)).read())) for s in shards]
+        assert sum(len(k) for k in keys) == 12
+        assert set().union(*keys) == {f"org/r{i}" for i in range(12)}
+
+    def test_merge_only_consumes_new_reports(self, stub, tmp_path):
+        run_shard("a", ["a"], make_repos(3), str(tmp_path), "c1", base_url=stub.url)
+        cycle, missing = merge_results(str(tmp_path), ["a", "b"])
+        assert len(cycle["updates"]) == 3
+        assert missing == ["b"]
+        cycle, missing = merge_results(str(tmp_path), ["a", "b"])
+        assert cycle["updates"] == []
+        assert missing == ["a", "b"]
+
+    def test_reports_from_cycles_between_merges_are_all_merged(self, stub, tmp_path):
+        repos = make_repos(3)
+        run_shard("a", ["a"], repos, str(tmp_path), "c1", base_url=stub.url)
+        merge_results(str(tmp_path), ["a"])
+        stub.set_release("org/r1", 50, "v50.0")
+        run_shard("a", ["a"], repos, str(tmp_path), "c2", base_url=stub.url)
+        run_shard("a", ["a"], repos, str(tmp_path), "c3", base_url=stub.url)  # supervisor asleep
+        cycle, _ = merge_results(str(tmp_path), ["a"])
+        assert [(n["key"], n["version"]) for n in cycle["notifications"]] == [("org/r1", "v50.0")]
+        assert len(cycle["updates"]) == 6
+
+    def test_rebalanced_repos_keep_state(self, stub, tmp_path):
+        repos = make_repos(12)
+        run_shard("a", ["a"], repos, str(tmp_path), "c1", base_url=stub.url)
+        before = stub.requests_for("/releases/latest")
+        paths = [run_shard(shard, ["a", "b"], repos, str(tmp_path), "c2", base_url=stub.url) for shard in "ab"]
+        # Every request was conditional and answered 304: nothing re-baselined
+        assert stub.requests_for("/releases/latest") - before == 12
+        results = [json.loads(open(path).read()) for path in paths]
+        assert all(u["status"] == "unchanged" for r in results for u in r["updates"])
+
+    def test_moved_away_state_is_dropped_and_moving_back_does_not_renotify(self, stub, tmp_path):
+        repos = make_repos(12)
+        run_shard("a", ["a"], repos, str(tmp_path), "c1", base_url=stub.url)
+        moved = [repo_key(c) for c in assign(repos, ["a", "b"])["b"]]
+        for cycle in ("c2", "c3"):
+            for shard in ("a", "b"):
+                run_shard(shard, ["a", "b"], repos, str(tmp_path), cycle, base_url=stub.url)
+        a_state = json.loads(open(state_path(str(tmp_path), "a")).read())
+        assert not set(moved) & set(a_state)
+
+        # A new release while the repos live in b, then they move back to a
+        key = moved[0]
+        stub.set_release(key, 99, "v99.0")
+        run_shard("b", ["a", "b"], repos, str(tmp_path), "c4", base_url=stub.url)
+        path = run_shard("a", ["a"], repos, str(tmp_path), "c5", base_url=stub.url)
+        results = json.loads(open(path).read())
+        assert results["notifications"] == []
+        assert all(u["status"] == "unchanged" for u in results["updates"])
+
+    def test_load_state_prefers_most_recent_copy(self, tmp_path):
+        newer = {"last_tag_name": "v2", "last_checked": "2024-05-02T00:00:00+00:00"}
+        older = {"last_tag_name": "v1", "last_checked": "2024-05-01T00:00:00+00:00"}
+        (tmp_path / "state.a.json").write_text(json.dumps({"org/r0": newer}))
+        (tmp_path / "state.b.json").write_text(json.dumps({"org/r0": older}))
+        config = {"repos": make_repos(1), "sharding": {"shards": ["a", "b"], "local_shards": []}}
+        sup = Supervisor(config, str(tmp_path), timeout=60)
+        try:
+            assert sup.load_state()["org/r0"]["last_tag_name"] == "v2"
+        finally:
+            sup.shutdown()
+
+
+def test_supervisor_runs_processes_and_merges(stub, tmp_path):
+    config = {"repos": make_repos(12), "sharding": {"shards": ["s0", "s1", "s2"], "local_shards": None}}
+    sup = Supervisor(config, str(tmp_path / "shards"), base_url=stub.url, timeout=60)
+    try:
+        first = sup.run_cycle()
+        assert not first["any_error"]
+        assert sorted(u["key"] for u in first["updates"]) == sorted(f"org/r{i}" for i in range(12))
+        assert all(u["status"] == "baseline" for u in first["updates"])
+
+        stub.set_release("org/r5", 99, "v5.1")
+        second = sup.run_cycle()
+        assert [n["key"] for n in second["notifications"]] == ["org/r5"]
+        assert sup.load_state()["org/r5"]["last_tag_name"] == "v5.1"
+        assert len(os.listdir(tmp_path / "shards")) == 6  # state + results per shard
+    finally:
+        sup.shutdown()
+
@@ -0,0 +1,29 @@
+from benchmarks.soak import check_budgets, run_soak
+
+
+def _sample(cycle, rss_mb=50.0, threads=3, fds=10):
+    return {"cycle": cycle, "rss_mb": rss_mb, "threads": threads, "fds": fds}
+
+
+def test_short_soak_stays_within_budgets():
+    result = run_soak(60, repos=6, sample_every=20, change_every=3)
+    assert result["errors"] == 0
+    assert [s["cycle"] for s in result["samples"]] == [1, 20, 40, 60]
+    assert check_budgets(result["samples"], warmup=20) == []
+
+
+def test_short_asyncio_soak_stays_within_budgets():
+    result = run_soak(60, repos=6, engine="asyncio", sample_every=20, change_every=3)
+    assert result["errors"] == 0
+    assert check_budgets(result["samples"], warmup=20) == []
+
+
+def test_growth_past_budget_is_reported():
+    samples = [_sample(0, rss_mb=10), _sample(100), _sample(200, threads=9), _sample(300, fds=11)]
+    violations = check_budgets(samples, warmup=100, budgets={"rss_mb": 5, "threads": 2, "fds": 2})
+    assert violations == ["threads grew by 6 (from 3 to 9 by cycle 200), budget 2"]
+
+
+def test_warmup_growth_is_ignored():
+    samples = [_sample(1, rss_mb=10, threads=1), _sample(50), _sample(100)]
+    assert check_budgets(samples, warmup=50, budgets={"rss_mb": 1, "threads": 0, "fds": 0}) == []
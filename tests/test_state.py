@@ -1,4 +1,7 @@
 import json
+import threading
+import time
+
 import pytest
 from state_store import StateStore
 
@@ -97,3 +100,94 @@ def test_no_corruption_warning_on_valid_state(tmp_path):
     store = StateStore(str(p))
     assert store.corruption_warning is None
     assert store.data["test/repo"]["version"] == "v1.0"
+
+
+def test_snapshots_are_not_mutated_by_updates(tmp_path):
+    store = StateStore(str(tmp_path / "state.json"))
+    store.update("a/b", {"last_tag_name": "v1.0"})
+    snapshot, entry = store.data, store.get("a/b")
+    store.update("a/b", {"last_tag_name": "v2.0"})
+    store.update("c/d", {"last_tag_name": "v1.0"})
+    assert entry["last_tag_name"] == "v1.0"
+    assert set(snapshot) == {"a/b"}
+    assert store.get("a/b")["last_tag_name"] == "v2.0"
+
+
+def test_concurrent_updates_are_not_lost_or_torn(tmp_path):
+    """Many writers on the same and on separate keys, while a reader keeps
+    loading state.json from disk."""
+    p = tmp_path / "state.json"
+    store = StateStore(str(p))
+    writers, rounds = 8, 50
+    stop = threading.Event()
+    torn = []
+
+    def write(n):
+        for i in range(rounds):
+            store.update(f"repo/{n}", {"count": i})
+            store.update("shared/repo", {f"writer{n}": i})
+
+    def read_disk():
+        while not stop.is_set():
+            try:
+                data = json.loads(p.read_text())
+            except FileNotFoundError:
+                continue
+            except ValueError as e:
+                torn.append(e)
+                return
+            # os.replace swaps whole files: every entry is complete
+            for key, entry in data.items():
+                if "last_checked" not in entry:
+                    torn.append(key)
+
+    reader = threading.Thread(target=read_disk)
+    reader.start()
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stop.set()
+    reader.join()
+
+    assert torn == []
+    expected_shared = {f"writer{n}": rounds - 1 for n in range(writers)}
+    for state in (store.data, json.loads(p.read_text()), StateStore(str(p)).data):
+        for n in range(writers):
+            assert state[f"repo/{n}"]["count"] == rounds - 1
+        assert {k: v for k, v in state["shared/repo"].items() if k != "last_checked"} == expected_shared
+    # Contention: every update was either saved or covered by another's save
+    stats = store.stats
+    assert stats["updates"] == 2 * writers * rounds
+    assert stats["saves"] + stats["coalesced"] == stats["updates"]
+
+
+def test_updates_during_a_save_share_the_next_one(tmp_path):
+    p = tmp_path / "state.json"
+    store = StateStore(str(p))
+    write = store._write
+
+    def slow_write(data):
+        time.sleep(0.05)
+        write(data)
+
+    store._write = slow_write
+    writers = 8
+    barrier = threading.Barrier(writers)
+
+    def update(n):
+        barrier.wait()
+        store.update(f"repo/{n}", {"count": n})
+
+    threads = [threading.Thread(target=update, args=(n,)) for n in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # One save in flight, then one that covers everyone who queued behind it
+    assert store.stats["saves"] < writers
+    assert store.stats["coalesced"] == writers - store.stats["saves"]
+    assert set(json.loads(p.read_text())) == {f"repo/{n}" for n in range(writers)}
+    assert list(tmp_path.glob("*.tmp")) == []
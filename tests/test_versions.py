@@ -0,0 +1,78 @@
+from versions import TagFilter, parse_version
+
+
+def _sorted(tags):
+    return sorted(tags, key=lambda t: parse_version(t).key)
+
+
+def test_numeric_not_lexical_order():
+    assert _sorted(["v1.10.0", "v1.9.3", "v1.2.0"]) == ["v1.2.0", "v1.9.3", "v1.10.0"]
+
+
+def test_backport_ranks_below_newer_major():
+    assert parse_version("v5.15.180").key < parse_version("v6.9").key
+
+
+def test_pep440_ordering():
+    tags = ["1.0.post1", "1.0", "1.0rc1", "1.0b2", "1.0a1", "1.0a1.dev1", "1.0.dev1"]
+    assert _sorted(tags) == [
+        "1.0.dev1", "1.0a1.dev1", "1.0a1", "1.0b2", "1.0rc1", "1.0", "1.0.post1",
+    ]
+
+
+def test_semver_prerelease_ordering():
+    assert _sorted(["v2.0.0", "v2.0.0-rc.2", "v2.0.0-beta.1", "v2.0.0-rc.10"]) == [
+        "v2.0.0-beta.1", "v2.0.0-rc.2", "v2.0.0-rc.10", "v2.0.0",
+    ]
+
+
+def test_prefixes_and_trailing_zeros():
+    assert parse_version("node-v18.0.0").key == parse_version("18").key
+    assert parse_version("release-1.2").key == parse_version("v1.2.0").key
+
+
+def test_epoch_wins():
+    assert parse_version("1!0.1").key > parse_version("2024.1").key
+
+
+def test_build_metadata_ignored():
+    assert parse_version("1.2.3+build.5").key == parse_version("1.2.3").key
+
+
+def test_prerelease_flag():
+    assert parse_version("v6.10-rc1").prerelease
+    assert parse_version("1.0.dev3").prerelease
+    assert not parse_version("1.0.post1").prerelease
+
+
+def test_unversioned_tag():
+    assert parse_version("latest") is None
+
+
+def test_parse_is_cached():
+    parse_version.cache_clear()
+    parse_version("v1.2.3")
+    parse_version("v1.2.3")
+    assert parse_version.cache_info().hits == 1
+
+
+class TestTagFilter:
+    def test_prereleases_excluded_by_default(self):
+        assert TagFilter().rank("v2.0.0-rc.1") is None
+        assert TagFilter(prereleases=True).rank("v2.0.0-rc.1") is not None
+
+    def test_include_patterns(self):
+        f = TagFilter(include=["v*"])
+        assert f.rank("v1.0") is not None
+        assert f.rank("sdk-1.0") is None
+
+    def test_exclude_patterns(self):
+        f = TagFilter(exclude=["*-lts"])
+        assert f.rank("v1.0-lts") is None
+
+    def test_unversioned_tags_are_skipped(self):
+        assert TagFilter().rank("nightly") is None
+
+    def test_fingerprint_tracks_settings(self):
+        assert TagFilter().fingerprint != TagFilter(include=["v*"]).fingerprint
+        assert TagFilter().fingerprint == TagFilter.from_config({}).fingerprint
@@ -0,0 +1,109 @@
+"""Parse and rank version tags (semver and PEP 440 style).
+
+Tags are ranked by version, never by listing order, so a backport such as
+"v5.15.180" published after "v6.9" does not count as the latest release.
+"""
+
+import fnmatch
+import functools
+import re
+from typing import NamedTuple
+
+
+_VERSION_RE = re.compile(
+    r"^\D*"                             # prefix: "v", "release-", "node-v", ...
+    r"(?:(?P<epoch>\d+)!)?"
+    r"(?P<release>\d+(?:\.\d+)*)"
+    r"(?P<suffix>.*)$"
+)
+_TOKEN_RE = re.compile(r"[a-z]+|\d+")
+_PRE_KINDS = {"a": 0, "alpha": 0, "b": 1, "beta": 1, "c": 2, "rc": 2, "pre": 2, "preview": 2}
+_POST_WORDS = {"post", "rev", "r"}
+_OTHER_PRE = -1  # unrecognised words ("canary", "next", "nightly") sort below alpha
+_FINAL = (3, 0)
+
+
+class Version(NamedTuple):
+    key: tuple
+    prerelease: bool
+
+
+@functools.lru_cache(maxsize=8192)
+def parse_version(tag: str) -> Version | None:
+    """Parse a tag name into a sortable Version, or None if it has no version."""
+    m = _VERSION_RE.match(tag.strip())
+    if not m:
+        return None
+
+    release = [int(n) for n in m.group("release").split(".")]
+    suffix = m.group("suffix").split("+", 1)[0].lower()  # ignore build metadata
+    tokens = _TOKEN_RE.findall(suffix)
+
+    # Bare numbers straight after the release extend it ("2024.01-05", "1.0.0-1")
+    while tokens and tokens[0].isdigit():
+        release.append(int(tokens.pop(0)))
+
+    pre = post = dev = None
+    while tokens:
+        word = tokens.pop(0)
+        num = int(tokens.pop(0)) if tokens and tokens[0].isdigit() else 0
+        if word.isdigit():
+            continue
+        if word == "dev":
+            dev = num
+        elif word in _POST_WORDS:
+            post = num
+        elif pre is None:
+            pre = (_PRE_KINDS.get(word, _OTHER_PRE), num)
+
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()  # 1.2 == 1.2.0
+
+    if pre is None:
+        pre = (-2, 0) if dev is not None and post is None else _FINAL
+    key = (
+        int(m.group("epoch") or 0),
+        tuple(release),
+        pre,
+        (-1,) if post is None else (post,),
+        (1, 0) if dev is None else (0, dev),
+    )
+    return Version(key, pre != _FINAL or dev is not None)
+
+
+class TagFilter:
+    """Per-repo include/exclude globs and prerelease policy for tag ranking."""
+
+    def __init__(
+        self,
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        prereleases: bool = False,
+    ):
+        self.include = list(include or [])
+        self.exclude = list(exclude or [])
+        self.prereleases = prereleases
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "TagFilter":
+        return cls(
+            include=cfg.get("tag_include"),
+            exclude=cfg.get("tag_exclude"),
+            prereleases=cfg.get("include_prereleases", False),
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable summary, stored with state so a config change forces a rescan."""
+        return f"{','.join(self.include)}|{','.join(self.exclude)}|{int(self.prereleases)}"
+
+    def rank(self, tag: str) -> tuple | None:
+        """Return the sort key for an allowed tag, or None if it is filtered out."""
+        if self.include and not any(fnmatch.fnmatchcase(tag, p) for p in self.include):
+            return None
+        if any(fnmatch.fnmatchcase(tag, p) for p in self.exclude):
+            return None
+        version = parse_version(tag)
+        if version is None or (version.prerelease and not self.prereleases):
+            return None
+        return version.key